@@ -0,0 +1,88 @@
+# This file contains the frame scheduler of the SIMgui, it limits how often the view is redrawn
+import math
+import threading
+import time
+
+from PyQt5 import QtCore
+
+
+class FrameScheduler(QtCore.QObject):
+    """Combines redraw requests into frames that are drawn at most at a fixed frame rate
+
+    `requestFrame()` can be called from any thread as often as new data arrives, the render
+    function always runs on the Qt thread of the scheduler. Requests that arrive while a frame is
+    already waiting are merged into that frame and counted as dropped frames, so a poll interval
+    shorter than the frame time or a slow redraw never queues up work for the Qt thread.
+
+    Attributes
+    ----------
+    `frameRate` : float
+        The maximum number of frames per second
+    `renderedFrames` : int
+        The number of frames that were drawn
+    `droppedFrames` : int
+        The number of requested frames that were merged into another frame or skipped because the view was hidden
+
+    Methods
+    -------
+    `requestFrame()` : None
+        Asks for the view to be redrawn, safe to call from any thread
+    `setFrameRate(frameRate)` : None
+        Sets the maximum number of frames per second
+    `resetCounters()` : None
+        Sets the rendered and dropped frame counters to 0
+    """
+
+    # queues the scheduling of a frame to the thread of the scheduler
+    frameRequested = QtCore.pyqtSignal()
+
+    def __init__(self, render, frameRate: float = 30.0, visible=None, parent: QtCore.QObject = None) -> None:
+        """
+        Arguments:  render {callable} -- Draws the view, called on the Qt thread
+                    frameRate {float} -- The maximum number of frames per second
+                    visible {callable} -- Returns if the view can be seen, frames are skipped when it returns False
+        """
+        super(FrameScheduler, self).__init__(parent)
+        self.render = render
+        self.visible = visible
+        self.setFrameRate(frameRate)
+        self.renderedFrames = 0
+        self.droppedFrames = 0
+        self._lock = threading.Lock()
+        self._pending = False
+        self._lastFrame = None # perf_counter time of the start of the last frame
+        self.frameRequested.connect(self._schedule)
+
+    def setFrameRate(self, frameRate: float) -> None:
+        if frameRate <= 0:
+            raise ValueError("frameRate must be greater than 0")
+        self.frameRate = frameRate
+
+    def resetCounters(self) -> None:
+        with self._lock:
+            self.renderedFrames = 0
+            self.droppedFrames = 0
+
+    def requestFrame(self) -> None:
+        with self._lock:
+            if self._pending:
+                self.droppedFrames += 1 # the waiting frame will show this data as well
+                return
+            self._pending = True
+        self.frameRequested.emit()
+
+    def _schedule(self) -> None:
+        # wait until one frame time after the start of the last frame
+        delay = 0 if self._lastFrame is None else self._lastFrame + 1 / self.frameRate - time.perf_counter()
+        QtCore.QTimer.singleShot(max(0, math.ceil(delay * 1000)), self._frame)
+
+    def _frame(self) -> None:
+        # requests that arrive while drawing ask for the next frame
+        with self._lock:
+            self._pending = False
+            if self.visible is not None and not self.visible():
+                self.droppedFrames += 1
+                return
+            self.renderedFrames += 1
+        self._lastFrame = time.perf_counter()
+        self.render()
@@ -0,0 +1,71 @@
+# This file contains the matplotlib graph of the SIMgui, the default plot backend
+import numpy as np
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure  # for plotting in qt
+
+from RingBuffer import RingBuffer
+
+
+class MatplotlibGraph(FigureCanvas):
+    """A matplotlib graph that only redraws its line on every update
+
+    The title, labels, grid and line are set up once. An update restores the saved background,
+    draws the line and blits it, the whole figure is only redrawn when the y axis has to change.
+
+    Attributes
+    ----------
+    `ax` : matplotlib.axes.Axes
+        The axes of the graph
+    `line` : matplotlib.lines.Line2D
+        The line that shows the values of the graph
+    `background` : BufferRegion
+        The saved graph without the line, None when the graph has to be redrawn
+
+    Methods
+    -------
+    `updateValues(values)` : None
+        Draws the values of a ring buffer, the newest value at the right of the graph
+    `reset()` : None
+        Fits the y axis to the data again on the next update
+    """
+
+    def __init__(self, title: str, ylabel: str, color: str, maxlen: int) -> None:
+        super(MatplotlibGraph, self).__init__(Figure(figsize=(3, 3), layout='tight'))
+        # x position of every value, the newest value is always at the right of the graph
+        self.graphX = np.arange(maxlen)
+
+        self.ax = self.figure.subplots()
+        self.ax.set_title(title)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid()
+        self.ax.set_xlim(0, maxlen)
+        # the line is left out of a normal draw so it can be blitted on top of the saved background
+        self.line, = self.ax.plot([], [], color, animated=True)
+        self.background = None
+        self.mpl_connect('draw_event', lambda event: setattr(self, 'background', self.copy_from_bbox(self.ax.bbox)))
+
+    def updateValues(self, values: RingBuffer) -> None:
+        """Draws the values of a ring buffer, the whole graph is only redrawn when the y axis has to change
+
+        Arguments:  values {RingBuffer} -- The values of the graph
+
+        Returns: None
+
+        """
+        if len(values) == 0:
+            return
+        self.line.set_data(self.graphX[len(self.graphX) - len(values):], values.values)
+
+        # limits the y axis to the min and max values of the data +- 3 when the data leaves the current range
+        bottom, top = self.ax.get_ylim()
+        if self.background is None or values.min() < bottom or values.max() > top:
+            self.ax.set_ylim(values.min() - 3, values.max() + 3)
+            self.draw() # saves the new background
+        else:
+            self.restore_region(self.background)
+        self.ax.draw_artist(self.line)
+        self.blit(self.ax.bbox)
+
+    def reset(self) -> None:
+        self.background = None
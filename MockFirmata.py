@@ -21,9 +21,19 @@ from typing import Union
 
 
 class MockFirmata:
-    def __init__(self,Port= 3, Room = Room) -> None:
+    def __init__(self,Port= 3, Room = Room, Manager: rs.BoardManager = None) -> None:
         self.port = Port
-        self.MockArduino = rs.mockArduino(3, Room) # COM3 port and room object
+        self.manager = Manager
+        if Manager is None:
+            self.MockArduino = rs.mockArduino(Port, Room) # port and room object
+        else:
+            # the board of the port in the manager, a new board in the room when the port has no board yet
+            if Port not in Manager:
+                self.MockArduino = Manager.addBoard(Port, Room)
+            else:
+                self.MockArduino = Manager.getBoard(Port)
+                if Room is not rs.Room and self.MockArduino.get_room() is not Room:
+                    raise ValueError(f"The board on port {Port} is connected to a different room")
         self.Connected = False
         self.pinTypes = { "d": 0, "a": 1 }
         self.pinModes = { "EMPTY": 0, "DHT22_1": 1, "DHT22_2": 2, "RELAY_HEATER": 3, "RELAY_COOLER": 4, "RELAY_SUNSCREEN": 5, "LDR": 6 }
@@ -56,6 +66,18 @@ class MockFirmata:
             The room object from the MockArduino class.
         """
         return self.MockArduino.get_room()
+    def getLDRCalibration(self) -> rs.LDRCalibration:
+        """
+        Returns the LDR calibration the MockArduino uses to convert the light level of the room to an LDR value.
+        
+        Args:
+            self: an instance of the object
+
+        Returns:
+            rs.LDRCalibration: The shared lookup table between LDR values and lux.
+        """
+        return self.MockArduino.get_ldr_calibration()
+
     # This function sets the pin mode for a given pin on the MockArduino object
     def setPinMode(self, pinDef:str) -> None:
         """Sets the pin mode for a given pin on the MockArduino object.
@@ -91,6 +113,29 @@ class MockFirmata:
             # print("pinType: {0}, pinNum: {1}, pinMode: {2}".format(pinType,pinNum,pinMode))
             self.MockArduino.set_pin_mode(pinType,pinNum,pinMode)
     
+    def setPinTemplate(self, name:str) -> None:
+        """Sets the pin modes of a pin template of the BoardManager, the template was parsed when it was added.
+        Args:
+            name (str): The name of a template added with `BoardManager.addTemplate`
+        Returns:
+            None
+        """
+        if self.manager is None:
+            raise Exception("pin templates need a MockFirmata that was created with a BoardManager")
+        self.manager.applyTemplate(self.port, name)
+
+    def get_pin(self, pinDef:str) -> rs.mockPin:
+        """Sets the pin mode and returns a pin object bound to the sensor or relay of the pin, like pyfirmata's `Board.get_pin`.
+
+        The pin definition is checked once, after that `read()` and `write()` on the pin skip all checks.
+        Args:
+            pinDef (str): A string in the format '(d)igital/(a)nalog:pinNum:pinMode', the pin mode is case insensitive. e.g. 'd:7:dht22_1'
+        Returns:
+            rs.mockPin: A DigitalPin or RelayPin with read() and write(), a DHT22Pin whose read() returns (temperature, humidity)
+                        or an AnalogPin whose read() returns the LDR value.
+        """
+        return self.MockArduino.get_pin(pinDef)
+
     def digitalWrite(self, pin:int, value:bool) -> None:
         """Set the digital pin of an Arduino. 
         
@@ -128,15 +173,27 @@ class MockFirmata:
         """
         return self.MockArduino.get_pin_data(1,pin)
 
+    def readAll(self) -> tuple:
+        """
+        Reads every configured sensor and relay of the Arduino in a single call.
+        
+        Args:
+            self: an instance of the object
+        
+        Returns:
+            tuple: ((inside_temp, inside_humid), (outside_temp, outside_humid), ldr_value, heater_state, cooler_state, sunscreen_state)
+                   sensors and relays without a configured pin are None
+        """
+        return self.MockArduino.read_all()
+
 
 # Testing
 # ===========================================================
 
-room = rs.Room(temperature=25.0, outside_temperature=30,
-                   humidity=20.0, room_dimensions=[10, 10, 2]) # breedte, lengte, hoogte
-
-
-if False == True:
+if __name__ == '__main__':
+    # the room is only built when the file is run, importing MockFirmata has no side effects
+    room = rs.Room(temperature=25.0, outside_temperature=30,
+                       humidity=20.0, room_dimensions=[10, 10, 2]) # breedte, lengte, hoogte
 
     mocky = MockFirmata(3, room)
     mocky.begin()
@@ -0,0 +1,145 @@
+# This file contains a replay source that feeds a recorded telemetry log into the control pipeline
+import time
+
+import numpy as np
+import reactivex as rx
+from reactivex.scheduler import CurrentThreadScheduler
+
+import control # heater, cooler and sunscreen controller
+from TelemetryLog import TelemetryLog
+
+
+# one row per replayed poll, the commands the controller gave for the recorded sensor values
+COMMAND_DTYPE = np.dtype([("time", "<f8"), ("heater", "?"), ("cooler", "?"), ("sunscreen", "?")])
+
+
+class ReplaySource:
+    """Replays the sensor values of a telemetry log instead of polling the MockFirmata
+
+    The samples have the format of the `SIMgui.temperature_light_subject` without relay states,
+    so the controller reads back the relays it switched itself during the replay. The recorded
+    commands are only used to compare with the commands of the replay.
+
+    Attributes
+    ----------
+    `records` : numpy.ndarray
+        The records of the telemetry log
+    `speed` : float
+        Replayed seconds per real second, None to replay as fast as possible
+    `position` : int
+        The index of the next record to replay
+
+    Methods
+    -------
+    `seek(time)` : int
+        Moves to the first record at or after a recorded time
+    `sample(index)` : list
+        The sample of a record in the format of the subject stream
+    `observable()` : reactivex.Observable
+        Emits the samples from the position to the end of the log at the replay speed
+    `commandStream(target_temperature, temp_threshold, lux_threshold, ActiveTempControlEnabled)` : numpy.ndarray
+        Runs the controller over the samples from the position to the end of the log without waiting
+    """
+
+    def __init__(self, records, speed: float = 1.0) -> None:
+        """
+        Arguments:  records {str or numpy.ndarray} -- A telemetry log file or its records
+                    speed {float} -- Replayed seconds per real second, None to replay as fast as possible
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be greater than 0, or None to replay as fast as possible")
+        self.records = TelemetryLog.read(records) if isinstance(records, str) else records
+        self.speed = speed
+        self.position = 0
+        self._times = np.asarray(self.records["time"])
+        # plain lists build a sample much faster than indexing the structured records
+        self._columns = [self.records[name].tolist() for name in
+                         ("inside_temperature", "inside_humidity", "outside_temperature", "outside_humidity", "lux")]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def seek(self, time: float) -> int:
+        """Moves to the first record at or after a recorded time
+
+        Arguments:  time {float} -- The recorded time in seconds
+
+        Returns: int -- The new position, the length of the log when the time is after the last record
+
+        """
+        self.position = int(np.searchsorted(self._times, time, side="left"))
+        return self.position
+
+    def sample(self, index: int) -> list:
+        inside_temp, inside_humid, outside_temp, outside_humid, lux = self._columns
+        return [[inside_temp[index], inside_humid[index]], [outside_temp[index], outside_humid[index]], lux[index]]
+
+    def observable(self) -> rx.Observable:
+        """Emits the samples from the position to the end of the log, then completes
+
+        With a speed the samples keep the recorded time between them divided by the speed, samples
+        that are already due are emitted right after each other. Without a speed all samples are
+        emitted in one go. The samples are emitted on the scheduler that is given to subscribe.
+
+        Returns: reactivex.Observable -- The samples in the format of the subject stream
+
+        """
+        def subscribe(observer, scheduler=None):
+            scheduler = scheduler or CurrentThreadScheduler.singleton()
+            index = self.position
+            start_time = self._times[index] if index < len(self) else 0.0
+            start_clock = time.perf_counter()
+            disposed = False
+
+            def emit(scheduler, state):
+                nonlocal index
+                while index < len(self) and not disposed:
+                    if self.speed is not None:
+                        due = (self._times[index] - start_time) / self.speed - (time.perf_counter() - start_clock)
+                        if due > 0:
+                            return scheduler.schedule_relative(due, emit)
+                    sample = self.sample(index)
+                    index += 1
+                    self.position = index
+                    observer.on_next(sample)
+                if not disposed:
+                    observer.on_completed()
+
+            scheduled = scheduler.schedule(emit)
+
+            def dispose():
+                nonlocal disposed
+                disposed = True
+                scheduled.dispose()
+            return dispose
+
+        return rx.create(subscribe)
+
+    def commandStream(self, target_temperature: float = 20, temp_threshold: float = 0.5, lux_threshold: float = 10000,
+                      ActiveTempControlEnabled: bool = False) -> np.ndarray:
+        """Runs the controller over the samples from the position to the end of the log without waiting
+
+        The relay states start off and follow the commands of the replay, like the relays of the SIMgui do.
+
+        Arguments:  target_temperature {float} -- The desired temperature inside the room
+                    temp_threshold {float} -- The acceptable range of temperatures around the target temperature
+                    lux_threshold {float} -- The light level at which the sunscreen is activated
+                    ActiveTempControlEnabled {bool} -- Whether active temperature control is enabled
+
+        Returns: numpy.ndarray -- The time and commands of every sample, compare with the recorded commands of the records
+
+        """
+        commands = np.zeros(len(self) - self.position, dtype=COMMAND_DTYPE)
+        commands["time"] = self._times[self.position:]
+        inside, _, outside, _, lux = self._columns
+        heater = cooler = sunscreen = False
+        states = []
+        for i in range(self.position, len(self)):
+            heater, cooler, sunscreen = control.generateCommands(inside[i], outside[i], target_temperature, temp_threshold,
+                                                                 heater, cooler, sunscreen, ActiveTempControlEnabled,
+                                                                 lux[i], lux_threshold)
+            states.append((heater, cooler, sunscreen))
+        if states:
+            commands["heater"], commands["cooler"], commands["sunscreen"] = np.array(states, dtype=bool).T
+        self.position = len(self)
+        return commands
@@ -0,0 +1,112 @@
+# This file contains a fixed size NumPy ring buffer for the graphs of the SIMgui
+from collections import deque
+
+import numpy as np
+
+
+class RingBuffer:
+    """A fixed size buffer of the newest values with a deque like interface
+
+    Every value is stored twice, at its position and one maxlen further, so the values from
+    oldest to newest are always one contiguous NumPy view that can be plotted without copying.
+    The minimum and maximum of the buffer are kept up to date in O(1) per appended value.
+
+    Attributes
+    ----------
+    `maxlen` : int
+        The maximum number of values in the buffer
+    `values` : numpy.ndarray
+        Read-only view on the values from oldest to newest
+
+    Methods
+    -------
+    `append(value)` : None
+        Adds a value, the oldest value is dropped when the buffer is full
+    `extend(values)` : None
+        Adds every value of an iterable
+    `clear()` : None
+        Removes all values
+    `copy()` : RingBuffer
+        An independent buffer with the same values
+    `min()` : float
+        The smallest value in the buffer
+    `max()` : float
+        The largest value in the buffer
+    """
+
+    def __init__(self, maxlen: int, dtype=np.float64) -> None:
+        if maxlen <= 0:
+            raise ValueError("maxlen must be greater than 0")
+        self.maxlen = maxlen
+        self._buffer = np.zeros(2 * maxlen, dtype=dtype)
+        self._count = 0  # number of values appended since the last clear
+        # monotonic queues of (count, value) of the values that can still become the minimum or maximum
+        self._minimum = deque()
+        self._maximum = deque()
+
+    def append(self, value) -> None:
+        position = self._count % self.maxlen
+        self._buffer[position] = value
+        self._buffer[position + self.maxlen] = value
+        value = self._buffer[position]
+
+        self._count += 1
+        oldest = self._count - self.maxlen
+        while self._minimum and self._minimum[-1][1] >= value:
+            self._minimum.pop()
+        self._minimum.append((self._count, value))
+        if self._minimum[0][0] <= oldest:
+            self._minimum.popleft()
+        while self._maximum and self._maximum[-1][1] <= value:
+            self._maximum.pop()
+        self._maximum.append((self._count, value))
+        if self._maximum[0][0] <= oldest:
+            self._maximum.popleft()
+
+    def extend(self, values) -> None:
+        for value in values:
+            self.append(value)
+
+    def clear(self) -> None:
+        self._count = 0
+        self._minimum.clear()
+        self._maximum.clear()
+
+    def copy(self) -> "RingBuffer":
+        duplicate = RingBuffer.__new__(RingBuffer)
+        duplicate.maxlen = self.maxlen
+        duplicate._buffer = self._buffer.copy()
+        duplicate._count = self._count
+        duplicate._minimum = self._minimum.copy()
+        duplicate._maximum = self._maximum.copy()
+        return duplicate
+
+    def min(self):
+        if not self._minimum:
+            raise ValueError("min() of an empty RingBuffer")
+        return self._minimum[0][1]
+
+    def max(self):
+        if not self._maximum:
+            raise ValueError("max() of an empty RingBuffer")
+        return self._maximum[0][1]
+
+    @property
+    def values(self) -> np.ndarray:
+        size = len(self)
+        start = (self._count - size) % self.maxlen
+        view = self._buffer[start:start + size]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return min(self._count, self.maxlen)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __repr__(self) -> str:
+        return f"RingBuffer({self.values.tolist()}, maxlen={self.maxlen})"
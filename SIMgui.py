@@ -5,25 +5,34 @@ import numpy as np
 import logging
 import time
 import sys
+import threading
 
 from typing import Union
-from collections import deque # for deque of temperature values
-# for plotting in qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure  # for plotting in qt
 
 from PyQt5 import QtCore, QtWidgets  # for gui widgets you might want to add
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget  # for gui window and app
-from PyQt5 import uic  # for loading ui files
+import importlib
+import os
 
 import reactivex as rx
-# from reactivex import scheduler
+from reactivex.scheduler import EventLoopScheduler
+from reactivex.internal.exceptions import DisposedException
 from reactivex import operators as ops
 from room_simulator import Room # New room class and temperature generator
 from MockFirmata import MockFirmata # mock arduino class
+import control # heater, cooler and sunscreen controller
+from RingBuffer import RingBuffer # graph values
+import uicache # ui class generated from gui.ui
+from FrameScheduler import FrameScheduler # limits how often the view is redrawn
+from TelemetryLog import TelemetryLog # optional log of every poll
+from ReplaySource import ReplaySource # recorded samples instead of polling
 
 from constants import * # pin definitions
 
+# graph widgets the SIMgui can plot with as (module, class), every backend has updateValues(values) and reset()
+# the module is imported when a SIMgui uses the backend, so the stripchart never loads matplotlib
+PLOT_BACKENDS = {"matplotlib": ("MatplotlibGraph", "MatplotlibGraph"), "stripchart": ("StripChart", "StripChart")}
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui.ui")
 
 
 class SIMgui(QMainWindow):
@@ -41,18 +50,28 @@ class SIMgui(QMainWindow):
         The subject stream for the temperature
     `observablePoll` : rx.disposable.Disposable 
         The disposable object for the observer
-    `temperatureValues` : collections.deque
-        The deque of temperature values for the graph
-    `humidityValues` : collections.deque
-        The deque of humidity values for the graph
-    `temp_ax` : matplotlib.axes.Axes
-        The axes for the temperature graph
-    `humid_ax` : matplotlib.axes.Axes
-        The axes for the humidity graph
-    `TempCanvas` : matplotlib.backends.backend_qt5agg.FigureCanvasQTAgg
-        The canvas for the temperature graph
-    `HumidCanvas` : matplotlib.backends.backend_qt5agg.FigureCanvasQTAgg
-        The canvas for the humidity graph
+    `pollScheduler` : reactivex.scheduler.EventLoopScheduler
+        The worker thread that reads the sensors and controls the relays, the widgets are only updated on the Qt thread
+    `pollThread` : threading.Thread
+        The thread of `pollScheduler`, None until the scheduler runs its first action
+    `activeTempControl` : bool
+        Copy of the ActiveTempControlCheckBox state that the worker thread can read
+    `plotLock` : threading.Lock
+        Guards the ring buffers, the worker thread appends to them while the Qt thread draws them
+    `relayStates` : tuple
+        The newest heater, cooler and sunscreen commands, shown in the checkboxes on the next frame
+    `telemetry` : TelemetryLog
+        Optional log that gets a record of every poll and the commands that followed it, None when nothing is logged
+    `frameScheduler` : FrameScheduler
+        Redraws the view on the Qt thread at most `frameRate` times per second, also counts the dropped frames
+    `temperatureValues` : RingBuffer
+        The ring buffer of temperature values for the graph
+    `humidityValues` : RingBuffer
+        The ring buffer of humidity values for the graph
+    `TempCanvas` : MatplotlibGraph or StripChart
+        The widget of the temperature graph, depends on the plot backend
+    `HumidCanvas` : MatplotlibGraph or StripChart
+        The widget of the humidity graph, depends on the plot backend
     `verticalLayout` : PyQt5.QtWidgets.QVBoxLayout
         The vertical layout for the temperature graph
     `verticalLayout_2` : PyQt5.QtWidgets.QVBoxLayout
@@ -90,28 +109,49 @@ class SIMgui(QMainWindow):
         Sets the `threshold`
     'generateCommands(temp)` : None
         Generates commands based on the temperature and outside temperature
+    `getRelayStates(data)` : tuple
+        Returns the heater, cooler and sunscreen states that belong to a sample of the sensor data
     `ExecuteCommands(temp)` : None
         Executes commands based on the temperature and outside temperature
+    `showRelayStates(heater, cooler, sunscreen)` : None
+        Sets the heater, cooler and sunscreen checkboxes
+    `renderFrame()` : None
+        Shows the newest relay states and values in the view, called by the `frameScheduler`
     `updatePlots(temp,humid)` : None
         Updates the plots with the new temperature and humidity values
+    `recordSample(temp,humid)` : None
+        Adds the values to the ring buffers and requests a new frame
+    `refreshPlots()` : None
+        Draws the current ring buffers, only called on the Qt thread
+    `pollSensors()` : None
+        Reads all sensors, runs the sample through the subject stream and logs it to the `telemetry`
     `updateObserver()` : None
         Updates the observer with the current poll rate
+    `stopPolling(timeout)` : None
+        Stops the observer and waits until the poll thread finished its current poll
+    `replay(source)` : None
+        Feeds the samples of a ReplaySource into the subject stream instead of polling the MockFirmata
     `setPollInterval(nPollInterval)` : None
         Sets the poll rate of the observer and updates the observer
     `purgeGraphData()` : None
-        Purges the graph data by clearing the deque
+        Purges the graph data by clearing the ring buffers
 
     """
 
     def __del__(self):
         
         # print("Disposed of Observer and subscribers")
-        self.observablePoll.dispose()
-        self.temperature_light_subject.dispose()
-
-    def __init__(self, MockFirmata: MockFirmata = None, graphLength: int = 10):
+        # the observer and subject don't exist yet when __init__ raised an exception
+        if getattr(self, "observablePoll", None) is not None:
+            self.observablePoll.dispose()
+        if getattr(self, "temperature_light_subject", None) is not None:
+            self.temperature_light_subject.dispose()
+        if getattr(self, "pollScheduler", None) is not None:
+            self.pollScheduler.dispose()
+
+    def __init__(self, MockFirmata: MockFirmata = None, graphLength: int = 10, plotBackend: str = "matplotlib", frameRate: float = 30.0, telemetry: TelemetryLog = None):
         super(SIMgui, self).__init__()
-        uic.loadUi("gui.ui", self)
+        uicache.setupUi(self, UI_FILE)
         self.setWindowTitle("Simulation Gui")
 
         # if no room is passed in, create a new ones
@@ -121,6 +161,7 @@ class SIMgui(QMainWindow):
 
         self.room = MockFirmata.getRoomObject() # get the room object from the MockFirmata object to alter values in the simulation
         self.firmata = MockFirmata # get the MockFirmata object to Read and Write to the MockArduino
+        self.telemetry = telemetry # the caller opens and closes the log
 
 
         # Default values for the gui
@@ -133,6 +174,9 @@ class SIMgui(QMainWindow):
         # set the default poll rate in the gui {Float}
         self.SensorPollIntervalBox.setValue(self.PollInterval)
         self.ActiveTempControlCheckBox.setChecked(False) #self.ActiveTempControlCheckBox.isChecked())
+        # the poll thread reads this copy of the checkbox, widgets may only be read on the Qt thread
+        self.activeTempControl = False
+        self.ActiveTempControlCheckBox.toggled.connect(lambda checked: setattr(self, "activeTempControl", checked))
         # self.ActiveTempControlCheckBox.clicked.connect(lambda: print("clicked")) #self.ActiveTempControlCheckBox.isChecked())
         
         
@@ -148,22 +192,24 @@ class SIMgui(QMainWindow):
         # create a subject stream for the temperature
         self.temperature_light_subject = rx.subject.Subject()
         self.observablePoll = None
-
-        # graph length for deque of values
-        self.temperatureValues = deque(maxlen=graphLength)
-        self.humidityValues = deque(maxlen=graphLength)
-
-        # canvas setup for temperature and humidity graphs
-        # And build graphs after canvas is added to layout
-        self.TempCanvas = FigureCanvas(Figure(figsize=(3, 3), layout='tight'))
+        # sensor sampling and control run on one worker thread, so a slow redraw never delays a control decision
+        self.pollThread = None
+        self.pollScheduler = EventLoopScheduler(thread_factory=self._createPollThread)
+
+        # graph length for ring buffer of values
+        self.temperatureValues = RingBuffer(maxlen=graphLength)
+        self.humidityValues = RingBuffer(maxlen=graphLength)
+        self.plotLock = threading.Lock()
+
+        # graph setup for temperature and humidity with the selected plot backend
+        if plotBackend not in PLOT_BACKENDS:
+            raise ValueError(f"Unknown plot backend: {plotBackend}. Expected one of {list(PLOT_BACKENDS)}")
+        module, name = PLOT_BACKENDS[plotBackend]
+        Graph = getattr(importlib.import_module(module), name)
+        self.TempCanvas = Graph("Temperature", "Temperature °C", 'r', graphLength)
         self.TempGraphLayout.addWidget(self.TempCanvas)
-        self.temp_ax = self.TempCanvas.figure.subplots()
-        self.temp_ax.set_xlim(0, self.temperatureValues.maxlen)
-
-        self.HumidCanvas = FigureCanvas(Figure(figsize=(3, 3), layout='tight'))
+        self.HumidCanvas = Graph("Humidity", "Humidity %", 'b', graphLength)
         self.HumidGraphLayout.addWidget(self.HumidCanvas)
-        self.humid_ax = self.HumidCanvas.figure.subplots()
-        self.humid_ax.set_xlim(0, self.humidityValues.maxlen)
 
         # set up the buttons and spin boxes for the gui
         self.PollIntervalConfirm.clicked.connect(lambda: self.setPollInterval(self.SensorPollIntervalBox.value()))
@@ -185,7 +231,10 @@ class SIMgui(QMainWindow):
         self.HeaterStateBox.setChecked(self.room.isHeaterActive())
         self.CoolerStateBox.setChecked(self.room.isCoolerActive())
         self.SunscreenStateBox.setChecked(self.room.isSunscreenActive())
+        self.relayStates = (self.room.isHeaterActive(), self.room.isCoolerActive(), self.room.isSunscreenActive())
 
+        # the view is redrawn on the Qt thread at most frameRate times per second, however fast the sensors are polled
+        self.frameScheduler = FrameScheduler(self.renderFrame, frameRate=frameRate, visible=self.isVisible, parent=self)
 
         # generate commands based on the measured temperature and Light level and execute them
         # add inside temp, outside temp and light level as pipe inputs to the subject stream
@@ -194,20 +243,22 @@ class SIMgui(QMainWindow):
             # # ops.map(lambda RawData: self.ConvertRawDataToCelciusAndLux(RawData[0], RawData[1], RawData[2])), 
             # Functie wordt meegegeven als argument om de commands te genereren op basis van de temperatuur
             # data object is als volgt opgebouwd: [[inside_temp, inside_humid], [outside_temp, outside_humid], light_level_lux]
-            ops.map(lambda data: self.generateCommands(inside_temp=data[0][0], outside_temp=data[1][0], 
+            # pair the data with the relay states, the poll loop already read them with the sensors
+            ops.map(lambda data: (data, self.getRelayStates(data))),
+            ops.map(lambda sample: self.generateCommands(inside_temp=sample[0][0][0], outside_temp=sample[0][1][0], 
                                                        target_temperature=self.target_temperature, temp_threshold=self.temp_threshold,
-                                                       heater_state=self.firmata.digitalRead(RELAY_HEATER), 
-                                                       cooler_state=self.firmata.digitalRead(RELAY_COOLER), 
-                                                       sunscreen_state=self.firmata.digitalRead(RELAY_SUNSCREEN), 
-                                                       ActiveTempControlEnabled=self.ActiveTempControlCheckBox.isChecked(),
-                                                       lux=data[2], lux_threshold=self.lux_threshold
+                                                       heater_state=sample[1][0], 
+                                                       cooler_state=sample[1][1], 
+                                                       sunscreen_state=sample[1][2], 
+                                                       ActiveTempControlEnabled=self.activeTempControl,
+                                                       lux=sample[0][2], lux_threshold=self.lux_threshold
                                                        )),
             ops.map(lambda commands: self.executeCommands(heaterCommand=commands[0], coolerCommand=commands[1], sunscreenCommand=commands[2]))
             ).subscribe() 
         
-        # update the plots when the temperature is updated
+        # update the plots when the temperature is updated, the graphs are redrawn on the next frame
         # Temperature is simulated, humidity is not so it stays at 50%
-        self.temperature_light_subject.subscribe(on_next=lambda data: self.updatePlots(data[0][0], data[0][1]))  
+        self.temperature_light_subject.subscribe(on_next=lambda data: self.recordSample(data[0][0], data[0][1]))  
 
         # create an observable that emits every 1/poll_rate seconds and updates the temperature_subject with the current temperature of the room
         self.updateObserver()
@@ -270,38 +321,9 @@ class SIMgui(QMainWindow):
         Returns:
             float or int: The lux value calculated from the given ADC mapped value.
         """
-        # Constants for your LDR setup (should match the constants used in the Arduino code)
-        R10lx = 15000.0  # Light resistance at 10 lux in ohms
-        gamma = 0.6      # Gamma value
-        R1 = 5000.0      # Resistor R1 in ohms from voltage divider
-        VCC = 5.0        # Supply voltage in volts
-
-        # Calculate voltage from mapped value
-        voltage = (mapped_value / 1024.0) * VCC
-
-        # Calculate LDR resistance LDR_R using voltage and R1
-        LDR_R = R1 * (VCC - voltage) / voltage
-
-        # get callibration values for conversion from lux to ldr resistance and back
-        # def calculateLDRResistance(self, lux,  R10lx, gamma): 
-        #     return (10 ** gamma) * R10lx / (lux ** gamma)
-        
-        # loglist = []
-        # luxList = []
-        # # fill a list with ldr_R values from the calculateLDRResistance function and calculate the logfit
-        # for i in [1,2,10,100,1000,10000,100000]:
-        #     luxList.append(i)
-        #     loglist.append(calculateLDRResistance(i, R10lx, gamma))
-        
-        # logFit = np.polyfit(np.log(luxList), np.log(loglist), 1)
-        # print(logFit) # [ -0.6 ,  10.99735654]
-        # print(f"Log(R10lx) = {math.log(R10lx)}")
-        
-        # Calculate lux using gamma formula
-        a = (math.log(LDR_R) - 11.02) / -gamma # max error% = -8.7% at 100000 lux, lower error at lower lux levels around -0.5 to 3%
-        lux = math.exp(a)
-        
-        return lux
+        # the table the MockArduino uses right now to convert the light level to an ADC value,
+        # read every time so a calibration that is set on the board later is used as well
+        return self.firmata.getLDRCalibration().adc_to_lux(mapped_value)
 
 
     def setPollInterval(self, nPollInterval: float) -> None:
@@ -343,46 +365,29 @@ class SIMgui(QMainWindow):
         Returns:
             list[bool]: A list of booleans representing the new states of the heater, cooler and sunscreen.
         """ 
-        OutStates = [heater_state, cooler_state, sunscreen_state] # default state of the heater and cooler and sunscreen
-        # print(f"Calculated Lux level: {lux}   from : {self.firmata.analogRead(LDR)}    Room lux: {self.room.getLightLevelLux()}   Error%: {  ((lux - self.room.getLightLevelLux())/ self.room.getLightLevelLux()) * 100 }%")
-        if lux > lux_threshold:
-            OutStates[2] = True
-        else:
-            OutStates[2] = False
-
-        # inside temperature is below the acceptable target temperature - threshold
-        if inside_temp < target_temperature - temp_threshold: 
-            # if the temperature is below the target temperature and the outside temperature is lower than the inside temperature or the active temp control is enabled: turn on the heater
-            if ((outside_temp < target_temperature) or ActiveTempControlEnabled): 
-                OutStates[0] = True # active temp control and in case otherwise unreachable target temperature
-            else:
-                OutStates[0] = False # passive temp control
-            
-            OutStates[1] = False # Always turn off the cooler in this case
-            return OutStates
-        # inside temperature is above the acceptable target temperature + threshold
-        elif inside_temp > target_temperature + temp_threshold: 
-            # if the temperature is above the target temperature and the outside temperature is higher than the inside temperature or the active temp control is enabled: turn on the cooler
-            if ((outside_temp > target_temperature) or ActiveTempControlEnabled): 
-                OutStates[1] = True # active temp control and in case otherwise unreachable target temperature
-            else:
-                OutStates[1] = False # passive temp control
-            
-            OutStates[0] = False # Always turn off the heater in this case
-            return OutStates
-        # if the temperature is within the acceptable range and the heater is on: turn it off
-        elif inside_temp >= target_temperature - (temp_threshold / 2) and heater_state:             
-            OutStates[0] = False
-            return OutStates
-        # if the temperature is within the acceptable range and the cooler is on: turn it off
-        elif inside_temp <= target_temperature + (temp_threshold / 2) and cooler_state: 
-            OutStates[1] = False
-            return OutStates
-        
-        return OutStates
+        return control.generateCommands(inside_temp, outside_temp, target_temperature, temp_threshold, 
+                                        heater_state, cooler_state, sunscreen_state, ActiveTempControlEnabled, lux, lux_threshold)
+
+    def getRelayStates(self, data: list) -> tuple:
+        """Returns the relay states that belong to a sample of the sensor data.
+
+        Args:
+            data (list): [[inside_temp, inside_humid], [outside_temp, outside_humid], light_level_lux] 
+                         optionally followed by the [heater, cooler, sunscreen] states that were read with the sensors
+
+        Returns:
+            tuple: The heater, cooler and sunscreen states, read from the firmata when the sample doesn't contain them.
+        """
+        if len(data) > 3:
+            return data[3]
+        return (self.firmata.digitalRead(RELAY_HEATER), 
+                self.firmata.digitalRead(RELAY_COOLER), 
+                self.firmata.digitalRead(RELAY_SUNSCREEN))
 
     def executeCommands(self, heaterCommand: bool, coolerCommand: bool, sunscreenCommand: bool) -> None:
-        """This function sets the state of the checkboxes in the GUI and writes the given commands to the firmata.
+        """This function writes the given commands to the firmata and sets the state of the checkboxes in the GUI.
+
+        The commands are written on the calling thread, the checkboxes are set on the next frame.
         
         Args:
             heaterCommand (bool): The state of the heater.
@@ -397,10 +402,38 @@ class SIMgui(QMainWindow):
         self.firmata.digitalWrite(RELAY_SUNSCREEN, sunscreenCommand)
         
         # sets the state of the checkboxes in the GUI
-        self.HeaterStateBox.setChecked(heaterCommand)
-        self.CoolerStateBox.setChecked(coolerCommand)
-        self.SunscreenStateBox.setChecked(sunscreenCommand)
+        self.relayStates = (bool(heaterCommand), bool(coolerCommand), bool(sunscreenCommand))
+        self.frameScheduler.requestFrame()
 
+    def showRelayStates(self, heater: bool, cooler: bool, sunscreen: bool) -> None:
+        """Sets the heater, cooler and sunscreen checkboxes, only called on the Qt thread.
+
+        Args:
+            heater (bool): The state of the heater.
+            cooler (bool): The state of the cooler.
+            sunscreen (bool): The state of the sunscreen.
+
+        Returns:
+            None
+        """
+        self.HeaterStateBox.setChecked(heater)
+        self.CoolerStateBox.setChecked(cooler)
+        self.SunscreenStateBox.setChecked(sunscreen)
+
+    def renderFrame(self) -> None:
+        """Shows the newest relay states and values in the view, called by the `frameScheduler` on the Qt thread.
+
+        Returns:
+            None
+        """
+        self.showRelayStates(*self.relayStates)
+        self.refreshPlots()
+        self.statusbar.showMessage(f"Frames: {self.frameScheduler.renderedFrames} drawn, {self.frameScheduler.droppedFrames} dropped")
+
+    def showEvent(self, event) -> None:
+        # frames are skipped while the window is hidden, show the newest data right away
+        super(SIMgui, self).showEvent(event)
+        self.frameScheduler.requestFrame()
 
     def updatePlots(self, temp: Union[float, int], humid: Union[float, int]) -> None:
         """Updates the plots with the new temperature and humidity values
@@ -411,55 +444,123 @@ class SIMgui(QMainWindow):
         Returns: None
 
         """
-        # add the new values to the deque
-        self.temperatureValues.append(temp)
-        self.humidityValues.append(humid)
-
-        # clear the axes
-        self.temp_ax.cla()
-        self.humid_ax.cla()
-
-        # set labels and titles
-        self.temp_ax.set_ylabel("Temperature °C")
-        self.temp_ax.set_title("Temperature")
-        self.humid_ax.set_ylabel("Humidity %")
-        self.humid_ax.set_title("Humidity")
-        # sets the grid
-        self.temp_ax.grid()
-        self.humid_ax.grid()
-
-        # limits the y axis to the min and max values of the data +- 3
-        self.temp_ax.set_ylim(min(self.temperatureValues)-3,
-                              max(self.temperatureValues)+3)
-        self.humid_ax.set_ylim(min(self.humidityValues)-3,
-                               max(self.humidityValues)+3)
-
-        # Set axis limit to the length of the deque so it shows towards the right of the graph
-        self.temp_ax.set_xlim(len(self.temperatureValues) -
-                              self.temperatureValues.maxlen, len(self.temperatureValues))
-        self.humid_ax.set_xlim(
-            len(self.humidityValues)-self.humidityValues.maxlen, len(self.humidityValues))
-
-        # # set the x axis to the length of the deque: 
-        # self.temp_ax.set_xlim(0,self.temperatureValues.maxlen)
-        # self.humid_ax.set_xlim(0,self.humidityValues.maxlen)
-
-        # color the lines
-        self.temp_ax.plot(self.temperatureValues, 'r')
-        self.humid_ax.plot(self.humidityValues, 'b')
-        self.TempCanvas.draw()
-        self.HumidCanvas.draw()
-        # plt.pause(0.001)
+        # add the new values to the ring buffers
+        with self.plotLock:
+            self.temperatureValues.append(temp)
+            self.humidityValues.append(humid)
+        self.refreshPlots()
+
+    def recordSample(self, temp: Union[float, int], humid: Union[float, int]) -> None:
+        """Adds the values to the ring buffers and requests a new frame, safe to call from the poll thread
+
+        Arguments:  temp {float} -- The current temperature of the room
+                    humid {float} -- The current humidity of the room
+
+        Returns: None
+
+        """
+        with self.plotLock:
+            self.temperatureValues.append(temp)
+            self.humidityValues.append(humid)
+        self.frameScheduler.requestFrame()
+
+    def refreshPlots(self) -> None:
+        """Draws the current values of the ring buffers, only called on the Qt thread
+
+        The buffers are copied so the poll thread can keep appending while the graphs are drawn.
+
+        Arguments: None
+
+        Returns: None
+
+        """
+        with self.plotLock:
+            temperatureValues = self.temperatureValues.copy()
+            humidityValues = self.humidityValues.copy()
+        self.TempCanvas.updateValues(temperatureValues)
+        self.HumidCanvas.updateValues(humidityValues)
 
     def purgeGraphData(self) -> None:
-        """Purges the graph data by clearing the deque 
+        """Purges the graph data by clearing the ring buffers 
 
         Arguments: None
 
         Returns: None
         """
-        self.temperatureValues.clear()
-        self.humidityValues.clear()
+        with self.plotLock:
+            self.temperatureValues.clear()
+            self.humidityValues.clear()
+        # the y axis fits the new data again
+        self.TempCanvas.reset()
+        self.HumidCanvas.reset()
+
+    def pollSensors(self) -> None:
+        """Reads all sensors and relays in one call to the MockArduino and runs the sample through the subject stream
+
+        The sample and the commands the controller wrote for it are appended to the `telemetry` log.
+        Sensors without a pin read NaN and a missing LDR reads -1, like `BoardManager.readAll`.
+
+        Arguments: None
+
+        Returns: None
+
+        """
+        # data object is: [[inside_temp, inside_humid], [outside_temp, outside_humid], light_level_lux, [heater, cooler, sunscreen]]
+        snapshot = self.firmata.readAll()
+        inside = (math.nan, math.nan) if snapshot[0] is None else snapshot[0]
+        outside = (math.nan, math.nan) if snapshot[1] is None else snapshot[1]
+        ldr_adc = -1 if snapshot[2] is None else snapshot[2]
+        lux = math.nan if snapshot[2] is None else self.calculateLuxFromADC(ldr_adc)
+        self.temperature_light_subject.on_next([inside, outside, lux, snapshot[3:]])
+        if self.telemetry is not None:
+            # executeCommands already stored the commands of this sample on this thread
+            self.telemetry.append(self.room.getClock().now(), inside, outside, ldr_adc, lux, self.relayStates)
+
+    def _createPollThread(self, target) -> threading.Thread:
+        # thread factory of the poll scheduler, keeps the thread so stopPolling can tell when it runs on it
+        self.pollThread = threading.Thread(target=target, daemon=True, name="SIMgui poll")
+        return self.pollThread
+
+    def stopPolling(self, timeout: float = 5.0) -> None:
+        """Stops the observer and waits until the poll thread finished its current poll, so the `telemetry` log can be closed
+
+        Called on the poll thread, e.g. by a subscriber of the subject stream, it doesn't wait because the current poll is the caller.
+
+        Arguments: `timeout` {float} -- The longest wait for the current poll in seconds
+
+        Returns: None
+
+        """
+        if self.observablePoll is not None:
+            self.observablePoll.dispose()
+            self.observablePoll = None
+        if threading.current_thread() is self.pollThread:
+            return
+        # the poll thread runs one action at a time, this one runs after the current poll
+        finished = threading.Event()
+        try:
+            self.pollScheduler.schedule(lambda scheduler, state: finished.set())
+        except DisposedException:
+            return # the poll thread is gone, nothing runs anymore
+        if not finished.wait(timeout):
+            logging.warning(f"The poll thread didn't finish its poll within {timeout} seconds")
+
+    def replay(self, source: ReplaySource) -> None:
+        """Feeds the samples of a ReplaySource into the subject stream instead of polling the MockFirmata
+
+        The replay runs on the poll thread at the speed of the source, `setPollInterval` or `updateObserver` go back to polling.
+
+        Arguments: `source` {ReplaySource} -- The recorded samples, replayed from its position
+
+        Returns: None
+
+        """
+        self.stopPolling()
+        self.purgeGraphData()
+        self.observablePoll = source.observable().subscribe(on_next=self.temperature_light_subject.on_next,
+                                                            on_completed=lambda: print("Replay finished"),
+                                                            scheduler=self.pollScheduler)
+        print(f"Replaying {len(source) - source.position} samples")
 
     def updateObserver(self) -> None:
         """Updates the observer with the current poll rate
@@ -474,12 +575,9 @@ class SIMgui(QMainWindow):
         if self.observablePoll != None:
             self.observablePoll.dispose() if self.observablePoll != None else None
 
-        self.observablePoll = rx.interval(self.PollInterval).pipe(
-            ops.map(lambda Data : self.temperature_light_subject.on_next(
-                [self.firmata.digitalRead(DHT22_1), 
-                 self.firmata.digitalRead(DHT22_2), 
-                 self.calculateLuxFromADC(self.firmata.analogRead(LDR))]
-                ))
+        # read all sensors and relays every tick on the poll thread
+        self.observablePoll = rx.interval(self.PollInterval, scheduler=self.pollScheduler).pipe(
+            ops.map(lambda tick : self.pollSensors())
         ).subscribe()
         
         print("Observer Created/Updated")
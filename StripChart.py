@@ -0,0 +1,146 @@
+# This file contains a lightweight scrolling strip chart for the SIMgui, drawn with QPainter
+import numpy as np
+
+from PyQt5 import QtCore
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QWidget
+
+from RingBuffer import RingBuffer
+
+
+class StripChart(QWidget):
+    """A scrolling line graph for long histories that draws straight from a NumPy buffer
+
+    When there are more values than pixel columns, every column shows the minimum and maximum of
+    its values, so a peak of a single value stays visible and the drawing cost depends on the
+    width of the widget instead of the number of values. Qt combines repaints that are requested
+    faster than the screen refreshes.
+
+    Attributes
+    ----------
+    `maxlen` : int
+        The number of values that fit in the graph
+    `ylim` : tuple
+        The bottom and top of the y axis, None before the first value
+
+    Methods
+    -------
+    `updateValues(values)` : None
+        Shows the values of a ring buffer, the newest value at the right of the graph
+    `reset()` : None
+        Removes the values and fits the y axis to the data again on the next update
+    `decimate(columns)` : tuple
+        The x and y data of the line with at most two points per pixel column
+    """
+
+    MARGINS = (45, 20, 10, 10) # left, top, right, bottom in pixels
+    GRID_LINES = 4
+
+    def __init__(self, title: str, ylabel: str, color: str, maxlen: int, parent: QWidget = None) -> None:
+        super(StripChart, self).__init__(parent)
+        self.title = title
+        self.ylabel = ylabel
+        self.pen = QPen(QColor({'r': 'red', 'b': 'blue', 'g': 'green', 'k': 'black'}.get(color, color)))
+        self.pen.setCosmetic(True)
+        self.maxlen = maxlen
+        self.values = np.zeros(0)
+        self.ylim = None
+        self.setMinimumSize(100, 100)
+
+    def updateValues(self, values: RingBuffer) -> None:
+        """Shows the values of a ring buffer, the y axis only changes when the data leaves the current range
+
+        Arguments:  values {RingBuffer} -- The values of the graph
+
+        Returns: None
+
+        """
+        if len(values) == 0:
+            return
+        self.values = values.values
+        if self.ylim is None or values.min() < self.ylim[0] or values.max() > self.ylim[1]:
+            self.ylim = (values.min() - 3, values.max() + 3)
+        self.update() # repaints on the next frame
+
+    def reset(self) -> None:
+        self.values = np.zeros(0)
+        self.ylim = None
+        self.update()
+
+    def plotArea(self) -> QtCore.QRectF:
+        left, top, right, bottom = self.MARGINS
+        return QtCore.QRectF(left, top, max(self.width() - left - right, 1), max(self.height() - top - bottom, 1))
+
+    def decimate(self, columns: int) -> tuple:
+        """Reduces the values to the minimum and maximum of every pixel column
+
+        Arguments:  columns {int} -- The number of pixel columns of the graph
+
+        Returns: tuple -- x and y data of the line, x is the position of the value in the graph
+
+        """
+        count = len(self.values)
+        offset = self.maxlen - count # the newest value is at the right of the graph
+        if count <= 2 * columns:
+            return np.arange(offset, self.maxlen, dtype=np.float64), self.values
+
+        per_column = -(-self.maxlen // columns) # values per pixel column, rounded up
+        starts = np.arange(0, count, per_column)
+        minimum = np.minimum.reduceat(self.values, starts)
+        maximum = np.maximum.reduceat(self.values, starts)
+        # every column is a vertical line from its minimum to its maximum in the middle of its values
+        ends = np.append(starts[1:], count)
+        x = np.repeat(offset + (starts + ends - 1) / 2, 2)
+        y = np.column_stack((minimum, maximum)).ravel()
+        return x, y
+
+    def polygon(self, area: QtCore.QRectF) -> QPolygonF:
+        """Converts the values to a polygon in pixel coordinates of the plot area
+
+        Arguments:  area {QRectF} -- The plot area of the widget
+
+        Returns: QPolygonF -- The line of the graph
+
+        """
+        x, y = self.decimate(int(area.width()))
+        bottom, top = self.ylim
+        polygon = QPolygonF(len(x))
+        # write the points straight into the memory of the polygon
+        pointer = polygon.data()
+        pointer.setsize(len(x) * 2 * np.dtype(np.float64).itemsize)
+        points = np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2)
+        points[:, 0] = area.left() + x * (area.width() / max(self.maxlen - 1, 1))
+        points[:, 1] = area.bottom() - (y - bottom) * (area.height() / (top - bottom))
+        return polygon
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+        area = self.plotArea()
+
+        painter.setPen(QtCore.Qt.black)
+        painter.drawText(QtCore.QRectF(0, 0, self.width(), self.MARGINS[1]), QtCore.Qt.AlignCenter, self.title)
+        painter.save()
+        painter.translate(10, area.center().y())
+        painter.rotate(-90)
+        painter.drawText(QtCore.QRectF(-area.height() / 2, -10, area.height(), 20), QtCore.Qt.AlignCenter, self.ylabel)
+        painter.restore()
+
+        if self.ylim is not None:
+            # horizontal grid lines with their value
+            bottom, top = self.ylim
+            for i in range(self.GRID_LINES + 1):
+                y = area.bottom() - i * area.height() / self.GRID_LINES
+                painter.setPen(QtCore.Qt.lightGray)
+                painter.drawLine(QtCore.QPointF(area.left(), y), QtCore.QPointF(area.right(), y))
+                painter.setPen(QtCore.Qt.black)
+                painter.drawText(QtCore.QRectF(15, y - 8, area.left() - 18, 16), QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter,
+                                 f"{bottom + i * (top - bottom) / self.GRID_LINES:.1f}")
+
+        painter.setPen(QtCore.Qt.gray)
+        painter.drawRect(area)
+        if len(self.values) > 0:
+            painter.setClipRect(area)
+            painter.setPen(self.pen)
+            painter.drawPolyline(self.polygon(area))
+        painter.end()
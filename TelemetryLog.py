@@ -0,0 +1,167 @@
+# This file contains an append-only, memory-mapped log of every poll sample and the commands that followed it
+import json
+import os
+
+import numpy as np
+
+
+# one record per poll, fixed width so the file can be read as a NumPy array
+RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),                  # simulated time of the poll in seconds
+    ("inside_temperature", "<f4"),
+    ("inside_humidity", "<f4"),
+    ("outside_temperature", "<f4"),
+    ("outside_humidity", "<f4"),
+    ("ldr_adc", "<i2"),               # raw LDR value of the MockArduino, -1 without an LDR
+    ("lux", "<f4"),                   # light level calculated from the LDR value
+    ("heater", "u1"),                 # commands written to the relays after the poll
+    ("cooler", "u1"),
+    ("sunscreen", "u1"),
+])
+
+MAGIC = b"SIMTLOG1"
+VERSION = 1
+HEADER_SIZE = 512
+# the number of records is updated in the header after every record, a reader never sees a half written record
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("header_size", "<u4"),
+    ("record_size", "<u4"),
+    ("padding", "<u4"),
+    ("count", "<u8"),
+    ("schema", f"S{HEADER_SIZE - 32}"), # JSON description of the record dtype
+])
+
+
+def _schemaDtype(schema: bytes) -> np.dtype:
+    return np.dtype([tuple(field) for field in json.loads(schema.decode())])
+
+
+class TelemetryLog:
+    """An append-only log file of fixed width binary records that is written through a memory map
+
+    The file starts with a header that holds the record schema and the number of records, followed by
+    the records. The file grows in large steps, so appending a record is a write into memory without a
+    system call. `TelemetryLog.read(path)` returns the records as a read-only NumPy memmap, also while
+    the log is still being written.
+
+    Attributes
+    ----------
+    `path` : str
+        The log file
+    `capacity` : int
+        The number of records that fit in the file before it has to grow
+
+    Methods
+    -------
+    `append(time, inside, outside, ldr_adc, lux, commands)` : None
+        Writes the record of one poll
+    `records` : numpy.ndarray
+        Read-only view on the records that were written
+    `flush()` : None
+        Writes the changed pages to disk
+    `close()` : None
+        Flushes the log and cuts the unused capacity off the file
+    `read(path)` : numpy.memmap
+        Opens the records of a log file for reading
+    """
+
+    def __init__(self, path: str, capacity: int = 65536) -> None:
+        """Creates a new log file, an existing file is overwritten
+
+        Arguments:  path {str} -- The log file
+                    capacity {int} -- The number of records the file has room for at the start
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        self.path = path
+        self._count = 0
+        with open(path, "wb") as log_file:
+            header = np.zeros((), dtype=HEADER_DTYPE)
+            header["magic"] = MAGIC
+            header["version"] = VERSION
+            header["header_size"] = HEADER_SIZE
+            header["record_size"] = RECORD_DTYPE.itemsize
+            header["schema"] = json.dumps(RECORD_DTYPE.descr).encode()
+            log_file.write(header.tobytes())
+        self._map(capacity)
+
+    def _map(self, capacity: int) -> None:
+        # grows the file and maps the header and the records
+        with open(self.path, "r+b") as log_file:
+            log_file.truncate(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize)
+        self.capacity = capacity
+        self._header = np.memmap(self.path, dtype=HEADER_DTYPE, mode="r+", shape=())
+        self._records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r+", offset=HEADER_SIZE, shape=(capacity,))
+
+    def append(self, time: float, inside: tuple, outside: tuple, ldr_adc: int, lux: float, commands: tuple) -> None:
+        """Writes the record of one poll
+
+        Arguments:  time {float} -- The simulated time of the poll
+                    inside {tuple} -- Temperature and humidity of the inside DHT22, NaN without the sensor
+                    outside {tuple} -- Temperature and humidity of the outside DHT22, NaN without the sensor
+                    ldr_adc {int} -- The raw LDR value, -1 without an LDR
+                    lux {float} -- The light level calculated from the LDR value
+                    commands {tuple} -- The heater, cooler and sunscreen commands
+
+        Returns: None
+
+        """
+        if self._count == self.capacity:
+            self._records.flush()
+            self._map(2 * self.capacity)
+        self._records[self._count] = (time, inside[0], inside[1], outside[0], outside[1], ldr_adc, lux,
+                                      commands[0], commands[1], commands[2])
+        self._count += 1
+        self._header["count"] = self._count
+
+    @property
+    def records(self) -> np.ndarray:
+        view = self._records[:self._count].view(np.ndarray)
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return self._count
+
+    def flush(self) -> None:
+        self._records.flush()
+        self._header.flush()
+
+    def close(self) -> None:
+        if self._records is None:
+            return
+        self.flush()
+        self._records = None
+        self._header = None
+        with open(self.path, "r+b") as log_file:
+            log_file.truncate(HEADER_SIZE + self._count * RECORD_DTYPE.itemsize)
+
+    def __enter__(self) -> "TelemetryLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def read(path: str) -> np.memmap:
+        """Opens the records of a log file for reading, the log may still be written
+
+        Arguments:  path {str} -- The log file
+
+        Returns: numpy.memmap -- The records that were written when the file was opened, with the dtype of the header schema
+
+        """
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{path} is not a telemetry log")
+        header = header[0]
+        if header["version"] != VERSION:
+            raise ValueError(f"{path} has telemetry log version {header['version']}, expected {VERSION}")
+        dtype = _schemaDtype(header["schema"])
+        # a copied or cut off file holds fewer records than the header says
+        count = min(int(header["count"]), (os.path.getsize(path) - int(header["header_size"])) // dtype.itemsize)
+        if count <= 0:
+            return np.zeros(0, dtype=dtype) # numpy can't map an empty array
+        return np.memmap(path, dtype=dtype, mode="r", offset=int(header["header_size"]), shape=(count,))
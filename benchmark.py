@@ -0,0 +1,324 @@
+# Measures the speed of the simulator and the poll pipeline and compares it with a stored baseline.
+# Usage: python benchmark.py [--output=results.json] [--baseline=benchmarks/baseline.json] [--tolerance=0.25]
+#                            [--filter=NAME] [--update-baseline]
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import room_simulator as rs
+from MockFirmata import MockFirmata # mock arduino class
+import control # heater, cooler and sunscreen controller
+
+from constants import * # pin definitions
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+# a benchmark fails when its median takes more than (1 + tolerance + NOISE_FACTOR * noise) times as long as its baseline,
+# the noise is the larger relative spread of the result and the baseline, see `measure` and `mergeRuns`, and at least
+# the median noise of all benchmarks of the baseline, the noise of the machine
+DEFAULT_TOLERANCE = 0.25
+NOISE_FACTOR = 2.0
+# the baseline is the median of several runs, a single run can be fast or slow as a whole
+BASELINE_RUNS = 3
+
+PIN_CONNECTIONS = [f"d:{DHT22_1}:DHT22_1", f"d:{DHT22_2}:DHT22_2", f"d:{RELAY_HEATER}:RELAY_HEATER",
+                   f"d:{RELAY_COOLER}:RELAY_COOLER", f"d:{RELAY_SUNSCREEN}:RELAY_SUNSCREEN", f"a:{LDR}:LDR"]
+EMPTY_PIN = 8 # digital pin without a sensor or relay
+
+
+def makeRoom() -> rs.Room:
+    # a room on a virtual clock, so the benchmarks don't depend on the wall clock
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    return rs.Room(temperature=25.0, outside_temperature=30, humidity=20.0, room_dimensions=[10, 10, 2], clock=clock)
+
+
+def makeFirmata() -> MockFirmata:
+    room = makeRoom()
+    firmata = MockFirmata(Port=3, Room=room)
+    firmata.begin()
+    for pin in PIN_CONNECTIONS:
+        firmata.setPinMode(pin)
+    firmata.room = room # the MockArduino only holds a pointer to the room, the firmata keeps it alive
+    return firmata
+
+
+def makeGui():
+    # the GUI benchmarks also run without a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from SIMgui import SIMgui
+    app = QApplication.instance() or QApplication([])
+    gui = SIMgui(MockFirmata=makeFirmata(), graphLength=100)
+    gui.stopPolling() # the benchmarks call the poll tick themselves
+    gui.app = app
+    return gui
+
+
+def benchRoomGetTemperature():
+    room = makeRoom()
+    clock = room.getClock()
+    def getTemperature():
+        clock.advance(2.0) # every reading passes the 2 second DHT22 interval and integrates the room
+        room.getTemperature()
+    return getTemperature
+
+
+def benchRoomCalculateTempDelta():
+    room = makeRoom()
+    return lambda: room.calculateTempDelta(1.0)
+
+
+def benchGetPinData(pin_type: int, pin_num: int):
+    def setup():
+        firmata = makeFirmata()
+        board = firmata.MockArduino
+        if pin_num == EMPTY_PIN:
+            firmata.setPinMode(f"d:{EMPTY_PIN}:EMPTY")
+        return lambda: board.get_pin_data(pin_type, pin_num)
+    return setup
+
+
+def benchDigitalRead():
+    firmata = makeFirmata()
+    return lambda: firmata.digitalRead(RELAY_HEATER)
+
+
+def benchAnalogRead():
+    firmata = makeFirmata()
+    return lambda: firmata.analogRead(LDR)
+
+
+def benchGenerateCommands():
+    return lambda: control.generateCommands(21.3, 15.0, 20.0, 0.5, True, False, False, False, 12000.0, 10000.0)
+
+
+def benchCalculateLuxFromADC():
+    gui = makeGui()
+    return lambda: gui.calculateLuxFromADC(512)
+
+
+def benchUpdatePlots():
+    gui = makeGui()
+    values = itertools.cycle(np.linspace(19.0, 21.0, 50).tolist())
+    return lambda: gui.updatePlots(next(values), 50.0)
+
+
+def benchPollTick():
+    gui = makeGui()
+    clock = gui.room.getClock()
+    def pollTick():
+        # one tick of the poll thread: read the board, convert the LDR value, control the relays and buffer the graph values
+        clock.advance(1.0)
+        gui.pollSensors()
+    return pollTick
+
+
+# name: setup function that returns the function to time, one call is one operation
+BENCHMARKS = {
+    "Room.getTemperature": benchRoomGetTemperature,
+    "Room.calculateTempDelta": benchRoomCalculateTempDelta,
+    "mockArduino.get_pin_data[DHT22_1]": benchGetPinData(0, DHT22_1),
+    "mockArduino.get_pin_data[DHT22_2]": benchGetPinData(0, DHT22_2),
+    "mockArduino.get_pin_data[RELAY_HEATER]": benchGetPinData(0, RELAY_HEATER),
+    "mockArduino.get_pin_data[RELAY_COOLER]": benchGetPinData(0, RELAY_COOLER),
+    "mockArduino.get_pin_data[RELAY_SUNSCREEN]": benchGetPinData(0, RELAY_SUNSCREEN),
+    "mockArduino.get_pin_data[EMPTY]": benchGetPinData(0, EMPTY_PIN),
+    "mockArduino.get_pin_data[LDR]": benchGetPinData(1, LDR),
+    "MockFirmata.digitalRead": benchDigitalRead,
+    "MockFirmata.analogRead": benchAnalogRead,
+    "control.generateCommands": benchGenerateCommands,
+    "SIMgui.calculateLuxFromADC": benchCalculateLuxFromADC,
+    "SIMgui.updatePlots": benchUpdatePlots,
+    "SIMgui.pollTick": benchPollTick,
+}
+
+
+def measure(func, min_time: float = 0.2, repeat: int = 15) -> dict:
+    """Times a function like timeit: the number of calls per round is doubled until a round takes long enough.
+
+    Args:
+        func (callable): The function to time, called without arguments.
+        min_time (float): The minimum duration of a round in seconds.
+        repeat (int): The number of rounds, the median round is compared with the baseline.
+
+    Returns:
+        dict: median_ns_per_call, ns_per_call (fastest round), noise (interquartile range of the rounds
+              relative to the median), calls (per round) and rounds.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            func()
+        if time.perf_counter_ns() - start >= min_time * 1e9 / 10 or calls >= 2**24:
+            break
+        calls *= 2
+    calls = max(1, int(calls * min_time * 1e9 / 10 / max(time.perf_counter_ns() - start, 1)))
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            func()
+        rounds.append((time.perf_counter_ns() - start) / calls)
+    median = float(np.median(rounds))
+    quartiles = np.percentile(rounds, [25, 75])
+    return {"median_ns_per_call": median, "ns_per_call": min(rounds), "noise": float(quartiles[1] - quartiles[0]) / median,
+            "calls": calls, "rounds": repeat}
+
+
+def machineInfo() -> dict:
+    """The machine and software versions the benchmarks ran on, results of different machines can't be compared."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "room_simulator": rs.__version__,
+        "commit": commit,
+    }
+
+
+def runBenchmarks(names: list = None, min_time: float = 0.2, repeat: int = 15) -> dict:
+    """Runs the benchmarks.
+
+    Args:
+        names (list): The benchmarks to run, every benchmark of `BENCHMARKS` when None.
+        min_time (float): The minimum duration of a round in seconds.
+        repeat (int): The number of rounds per benchmark.
+
+    Returns:
+        dict: machine (see `machineInfo`), time (when the benchmarks ran) and results by benchmark name (see `measure`).
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark: {name}. Expected one of {list(BENCHMARKS)}")
+        results[name] = measure(BENCHMARKS[name](), min_time=min_time, repeat=repeat)
+        print(f"{name:<45}{results[name]['median_ns_per_call'] / 1e3:>12.3f} us  +-{results[name]['noise'] / 2:.0%}")
+    return {"machine": machineInfo(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+
+
+def mergeRuns(runs: list) -> dict:
+    """Merges several runs of the same benchmarks into one baseline.
+
+    Args:
+        runs (list): Outputs of `runBenchmarks`.
+
+    Returns:
+        dict: Like `runBenchmarks`, with the median of the run medians, the fastest round and as noise the larger of
+              the noise of the rounds and the spread of the run medians (max - min) relative to their median.
+    """
+    results = {}
+    for name in runs[0]["results"]:
+        medians = [run["results"][name]["median_ns_per_call"] for run in runs]
+        median = float(np.median(medians))
+        results[name] = {
+            "median_ns_per_call": median,
+            "ns_per_call": min(run["results"][name]["ns_per_call"] for run in runs),
+            "noise": max(max(run["results"][name]["noise"] for run in runs), (max(medians) - min(medians)) / median),
+            "calls": runs[0]["results"][name]["calls"],
+            "rounds": sum(run["results"][name]["rounds"] for run in runs),
+        }
+    return {"machine": runs[-1]["machine"], "time": runs[-1]["time"], "runs": len(runs), "results": results}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Compares the medians of results with a baseline.
+
+    A benchmark that scatters a lot, in its rounds or between the runs of the baseline, needs a larger
+    slowdown to fail, see `NOISE_FACTOR`. The noise of a benchmark is at least the median noise of the baseline,
+    a few runs can make a single benchmark look quieter than the machine is.
+
+    Args:
+        results (dict): The output of `runBenchmarks`.
+        baseline (dict): Earlier output of `runBenchmarks`.
+        tolerance (float): The allowed slowdown, 0.25 allows a benchmark to take 25% longer than its baseline.
+
+    Returns:
+        list: (name, baseline ns, result ns, ratio) of every benchmark that is slower than the tolerance allows.
+              Benchmarks without a baseline are skipped.
+    """
+    machine_noise = float(np.median([reference["noise"] for reference in baseline["results"].values()]))
+    regressions = []
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        reference = baseline["results"][name]
+        ratio = result["median_ns_per_call"] / reference["median_ns_per_call"]
+        if ratio > 1 + tolerance + NOISE_FACTOR * max(result["noise"], reference["noise"], machine_noise):
+            regressions.append((name, reference["median_ns_per_call"], result["median_ns_per_call"], ratio))
+    return regressions
+
+
+def parse_arguments(argv: list) -> dict:
+    """Reads the `--output=`, `--baseline=`, `--tolerance=`, `--filter=` and `--update-baseline` command-line arguments
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        dict: output (str or None), baseline (str), tolerance (float), names (list or None) and update_baseline (bool)
+    """
+    arguments = {"output": None, "baseline": DEFAULT_BASELINE, "tolerance": DEFAULT_TOLERANCE, "names": None, "update_baseline": False}
+    for arg in argv:
+        if arg.startswith("--output="):
+            arguments["output"] = arg.split("=", 1)[1]
+        elif arg.startswith("--baseline="):
+            arguments["baseline"] = arg.split("=", 1)[1]
+        elif arg.startswith("--tolerance="):
+            arguments["tolerance"] = float(arg.split("=", 1)[1])
+            if arguments["tolerance"] < 0:
+                raise ValueError("--tolerance can not be negative")
+        elif arg.startswith("--filter="):
+            text = arg.split("=", 1)[1]
+            arguments["names"] = [name for name in BENCHMARKS if text in name]
+        elif arg == "--update-baseline":
+            arguments["update_baseline"] = True
+    return arguments
+
+
+def main(argv: list) -> int:
+    arguments = parse_arguments(argv)
+    results = runBenchmarks(arguments["names"])
+    if arguments["update_baseline"]:
+        results = mergeRuns([results] + [runBenchmarks(arguments["names"]) for _ in range(BASELINE_RUNS - 1)])
+    if arguments["output"] is not None:
+        with open(arguments["output"], "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+    if arguments["update_baseline"]:
+        with open(arguments["baseline"], "w") as baseline_file:
+            json.dump(results, baseline_file, indent=4)
+        print(f"Baseline written to {arguments['baseline']}")
+        return 0
+    if not os.path.exists(arguments["baseline"]):
+        print(f"No baseline at {arguments['baseline']}, run with --update-baseline to create it")
+        return 0
+
+    with open(arguments["baseline"]) as baseline_file:
+        baseline = json.load(baseline_file)
+    differences = {key: (baseline["machine"].get(key), value) for key, value in results["machine"].items()
+                   if key not in ("commit", "room_simulator") and baseline["machine"].get(key) != value}
+    if differences:
+        print(f"Warning: the baseline was measured on a different machine or software version: {differences}")
+    regressions = compare(results, baseline, arguments["tolerance"])
+    for name, reference, result, ratio in regressions:
+        print(f"REGRESSION {name}: {reference / 1e3:.3f} us -> {result / 1e3:.3f} us ({ratio:.2f}x)")
+    print(f"{len(regressions)} regressions beyond {arguments['tolerance']:.0%} and the noise of the benchmarks")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,104 @@
+# This file contains the controller of the simulation without any GUI dependencies,
+# so it can be used by the SIMgui as well as by the headless runner.
+import numpy as np
+
+
+def generateCommands(inside_temp: float, outside_temp: float, target_temperature: float, temp_threshold: float, heater_state: bool, cooler_state: bool, sunscreen_state: bool, ActiveTempControlEnabled: bool, lux:float, lux_threshold:float) -> list[bool]:
+    """Generate commands to control the heater, cooler and sunscreen based on temperature and light levels.
+
+    Args:
+        inside_temp (float): The current temperature inside the room.
+        outside_temp (float): The current temperature outside the room.
+        target_temperature (float): The desired temperature inside the room.
+        temp_threshold (float): The acceptable range of temperatures around the target temperature.
+        heater_state (bool): The current state of the heater.
+        cooler_state (bool): The current state of the cooler.
+        sunscreen_state (bool): The current state of the sunscreen.
+        ActiveTempControlEnabled (bool): Whether active temperature control is enabled.
+        lux (float): The current light level in the room.
+        lux_threshold (float): The threshold at which the sunscreen should be activated.
+
+    Returns:
+        list[bool]: A list of booleans representing the new states of the heater, cooler and sunscreen.
+    """ 
+    OutStates = [heater_state, cooler_state, sunscreen_state] # default state of the heater and cooler and sunscreen
+    if lux > lux_threshold:
+        OutStates[2] = True
+    else:
+        OutStates[2] = False
+
+    # inside temperature is below the acceptable target temperature - threshold
+    if inside_temp < target_temperature - temp_threshold: 
+        # if the temperature is below the target temperature and the outside temperature is lower than the inside temperature or the active temp control is enabled: turn on the heater
+        if ((outside_temp < target_temperature) or ActiveTempControlEnabled): 
+            OutStates[0] = True # active temp control and in case otherwise unreachable target temperature
+        else:
+            OutStates[0] = False # passive temp control
+        
+        OutStates[1] = False # Always turn off the cooler in this case
+        return OutStates
+    # inside temperature is above the acceptable target temperature + threshold
+    elif inside_temp > target_temperature + temp_threshold: 
+        # if the temperature is above the target temperature and the outside temperature is higher than the inside temperature or the active temp control is enabled: turn on the cooler
+        if ((outside_temp > target_temperature) or ActiveTempControlEnabled): 
+            OutStates[1] = True # active temp control and in case otherwise unreachable target temperature
+        else:
+            OutStates[1] = False # passive temp control
+        
+        OutStates[0] = False # Always turn off the heater in this case
+        return OutStates
+    # if the temperature is within the acceptable range and the heater is on: turn it off
+    elif inside_temp >= target_temperature - (temp_threshold / 2) and heater_state:             
+        OutStates[0] = False
+        return OutStates
+    # if the temperature is within the acceptable range and the cooler is on: turn it off
+    elif inside_temp <= target_temperature + (temp_threshold / 2) and cooler_state: 
+        OutStates[1] = False
+        return OutStates
+    
+    return OutStates
+
+
+def generateCommandsBatch(inside_temp, outside_temp, target_temperature, temp_threshold, heater_state, cooler_state, sunscreen_state, ActiveTempControlEnabled, lux, lux_threshold) -> tuple:
+    """Generate the commands of `generateCommands` for many samples or rooms at once.
+
+    Every argument is a NumPy array or a scalar, the arrays are broadcast against each other
+    so the settings can be the same for all samples or differ per sample.
+
+    Args:
+        inside_temp (array): The current temperatures inside the rooms.
+        outside_temp (array): The current temperatures outside the rooms.
+        target_temperature (array): The desired temperatures inside the rooms.
+        temp_threshold (array): The acceptable ranges of temperatures around the target temperatures.
+        heater_state (array): The current states of the heaters.
+        cooler_state (array): The current states of the coolers.
+        sunscreen_state (array): The current states of the sunscreens, unused like in `generateCommands`.
+        ActiveTempControlEnabled (array): Whether active temperature control is enabled.
+        lux (array): The current light levels in the rooms.
+        lux_threshold (array): The thresholds at which the sunscreens should be activated.
+
+    Returns:
+        tuple: Boolean arrays with the new states of the heaters, coolers and sunscreens.
+    """
+    # the scalar version compares Python floats, so compare in float64 to get the same results for float32 input
+    inside_temp = np.asarray(inside_temp, dtype=np.float64)
+    outside_temp = np.asarray(outside_temp, dtype=np.float64)
+    target_temperature = np.asarray(target_temperature, dtype=np.float64)
+    temp_threshold = np.asarray(temp_threshold, dtype=np.float64)
+    heater_state = np.asarray(heater_state, dtype=bool)
+    cooler_state = np.asarray(cooler_state, dtype=bool)
+    active = np.asarray(ActiveTempControlEnabled, dtype=bool)
+
+    # the branches of generateCommands, each sample takes the first branch that applies
+    too_cold = inside_temp < target_temperature - temp_threshold
+    too_warm = ~too_cold & (inside_temp > target_temperature + temp_threshold)
+    in_band = ~too_cold & ~too_warm
+    heater_off = in_band & (inside_temp >= target_temperature - (temp_threshold / 2)) & heater_state
+    cooler_off = in_band & ~heater_off & (inside_temp <= target_temperature + (temp_threshold / 2)) & cooler_state
+
+    heater = np.where(too_cold, (outside_temp < target_temperature) | active, heater_state & ~too_warm & ~heater_off)
+    cooler = np.where(too_warm, (outside_temp > target_temperature) | active, cooler_state & ~too_cold & ~cooler_off)
+    sunscreen = np.asarray(lux, dtype=np.float64) > np.asarray(lux_threshold, dtype=np.float64)
+
+    shape = np.broadcast_shapes(heater.shape, cooler.shape, sunscreen.shape, np.shape(sunscreen_state))
+    return np.broadcast_to(heater, shape).copy(), np.broadcast_to(cooler, shape).copy(), np.broadcast_to(sunscreen, shape).copy()
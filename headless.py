@@ -0,0 +1,156 @@
+# Runs the closed control loop of the SIMgui without Qt, as fast as the simulation allows.
+# Usage: python headless.py [--scenario=scenario.json] [--hours=24] [--output=summary.json]
+import json
+import sys
+import time
+
+import room_simulator as rs
+from MockFirmata import MockFirmata # mock arduino class
+import control # heater, cooler and sunscreen controller
+
+from constants import * # pin definitions
+
+
+# scenario settings, a scenario file only needs to contain the settings that differ from these
+DEFAULT_SCENARIO = {
+    "temperature": 25.0,            # starting inside temperature in °C
+    "outside_temperature": 30.0,    # outside temperature in °C
+    "humidity": 20.0,               # humidity in %
+    "room_dimensions": [10, 10, 2], # width, length, height in m
+    "heater_power": 1000.0,         # W
+    "cooler_power": 2000.0,         # W
+    "light_level_lux": 10000.0,     # outside light level
+    "target_temperature": 20.0,     # °C
+    "temp_threshold": 0.5,          # °C around the target temperature
+    "lux_threshold": 10000.0,       # light level at which the sunscreen closes
+    "active_temp_control": False,   # heat or cool even when the outside temperature works against it
+    "poll_interval": 1.0,           # simulated seconds between two polls, the same as the SIMgui default
+    "duration": 24 * 3600.0,        # simulated seconds
+    "integration_mode": "EULER",    # EULER like the GUI and Room, or EXACT, see rs.IntegrationMode
+    "seed": 1,                      # sensor noise seed and stream, see Room.seedSensorNoise
+    "stream": 0,
+}
+
+
+def runScenario(scenario: dict = None) -> dict:
+    """Runs one scenario on a virtual clock and returns a summary of the results.
+
+    Args:
+        scenario (dict): Settings that differ from `DEFAULT_SCENARIO`.
+
+    Returns:
+        dict: The scenario that was run and the metrics of the run:
+              time_in_band (fraction of the polls with the measured temperature within the threshold of the target),
+              switch_count (number of relay switches), energy_kwh (energy used by the heater and cooler),
+              max_overshoot (largest measured distance outside of the band in °C), final_temperature,
+              polls, simulated_hours, wall_time and speedup (simulated seconds per wall clock second).
+    """
+    settings = dict(DEFAULT_SCENARIO)
+    if scenario is not None:
+        unknown = set(scenario) - set(DEFAULT_SCENARIO)
+        if unknown:
+            raise ValueError(f"Unknown scenario settings: {sorted(unknown)}")
+        settings.update(scenario)
+    if settings["poll_interval"] <= 0 or settings["duration"] < 0:
+        raise ValueError("poll_interval must be greater than 0 and duration can not be negative")
+
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = rs.Room(temperature=settings["temperature"], outside_temperature=settings["outside_temperature"],
+                   humidity=settings["humidity"], room_dimensions=settings["room_dimensions"], clock=clock)
+    room.setHeaterPower(settings["heater_power"])
+    room.setCoolerPower(settings["cooler_power"])
+    room.setLightLevelLux(settings["light_level_lux"])
+    room.setIntegrationMode(getattr(rs.IntegrationMode, settings["integration_mode"]))
+    room.seedSensorNoise(settings["seed"], settings["stream"])
+
+    firmata = MockFirmata(Port=3, Room=room)
+    firmata.begin()
+    for pin in [f"d:{DHT22_1}:DHT22_1", f"d:{DHT22_2}:DHT22_2", f"d:{RELAY_HEATER}:RELAY_HEATER",
+                f"d:{RELAY_COOLER}:RELAY_COOLER", f"d:{RELAY_SUNSCREEN}:RELAY_SUNSCREEN", f"a:{LDR}:LDR"]:
+        firmata.setPinMode(pin)
+    calibration = firmata.getLDRCalibration()
+
+    target_temperature = settings["target_temperature"]
+    temp_threshold = settings["temp_threshold"]
+    poll_interval = settings["poll_interval"]
+    polls = int(settings["duration"] / poll_interval)
+
+    polls_in_band = 0
+    switch_count = 0
+    energy = 0.0 # J
+    max_overshoot = 0.0
+    inside_temp = settings["temperature"]
+
+    start_time = time.perf_counter()
+    for _ in range(polls):
+        clock.advance(poll_interval)
+        inside, outside, light_level, heater, cooler, sunscreen = firmata.readAll()
+        inside_temp = inside[0]
+
+        # the relays were in this state during the last poll interval
+        energy += (heater * settings["heater_power"] + cooler * settings["cooler_power"]) * poll_interval
+        distance = abs(inside_temp - target_temperature)
+        if distance <= temp_threshold:
+            polls_in_band += 1
+        else:
+            max_overshoot = max(max_overshoot, distance - temp_threshold)
+
+        commands = control.generateCommands(inside_temp, outside[0], target_temperature, temp_threshold,
+                                            heater, cooler, sunscreen, settings["active_temp_control"],
+                                            calibration.adc_to_lux(light_level), settings["lux_threshold"])
+        # only write the relays that change, like a real board this saves a round trip per relay
+        for pin, state, command in ((RELAY_HEATER, heater, commands[0]),
+                                    (RELAY_COOLER, cooler, commands[1]),
+                                    (RELAY_SUNSCREEN, sunscreen, commands[2])):
+            if state != command:
+                firmata.digitalWrite(pin, command)
+                switch_count += 1
+    wall_time = time.perf_counter() - start_time
+
+    simulated_time = polls * poll_interval
+    return {
+        "scenario": settings,
+        "time_in_band": polls_in_band / polls if polls else 0.0,
+        "switch_count": switch_count,
+        "energy_kwh": energy / 3.6e6,
+        "max_overshoot": max_overshoot,
+        "final_temperature": inside_temp,
+        "polls": polls,
+        "simulated_hours": simulated_time / 3600.0,
+        "wall_time": wall_time,
+        "speedup": simulated_time / wall_time if wall_time > 0 else float("inf"),
+    }
+
+
+def parse_arguments(argv: list) -> dict:
+    """Reads the `--scenario=file.json`, `--hours=N` and `--output=file.json` command-line arguments
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        dict: scenario (dict), output (str or None)
+    """
+    arguments = {"scenario": {}, "output": None}
+    for arg in argv:
+        if arg.startswith("--scenario="):
+            with open(arg.split("=", 1)[1]) as scenario_file:
+                arguments["scenario"].update(json.load(scenario_file))
+        elif arg.startswith("--hours="):
+            arguments["scenario"]["duration"] = float(arg.split("=", 1)[1]) * 3600.0
+        elif arg.startswith("--output="):
+            arguments["output"] = arg.split("=", 1)[1]
+    return arguments
+
+
+def main(argv: list) -> dict:
+    arguments = parse_arguments(argv)
+    summary = runScenario(arguments["scenario"])
+
+    print(json.dumps(summary, indent=4))
+    if arguments["output"] is not None:
+        with open(arguments["output"], "w") as output_file:
+            json.dump(summary, output_file, indent=4)
+    return summary
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
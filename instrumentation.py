@@ -0,0 +1,170 @@
+# Runtime instrumentation of the simulation: call counts and latency histograms of chosen functions.
+# The timing wrappers are only installed while the instrumentation is enabled, so it costs nothing when it is off.
+import inspect
+import json
+import threading
+import time
+from functools import wraps
+
+import numpy as np
+
+
+# bucket b of a histogram counts the calls that took from 2**(b - 1) up to 2**b nanoseconds
+HISTOGRAM_BUCKETS = 64
+
+_enabled = False
+_names = []    # name of every instrumented function by index
+_targets = []  # (owner, attribute, original) of every instrumented function by index
+# statistics by index, the lists only grow when a function is instrumented and are updated in place
+_calls = []
+_total_ns = []
+_max_ns = []
+_histogram = [] # HISTOGRAM_BUCKETS counts per function
+# the GUI calls instrumented functions from the poll thread and the Qt thread, the updates of the statistics
+# are read-modify-writes that would lose calls without the lock
+_lock = threading.Lock()
+
+
+def instrument(owner, names: list = None) -> list:
+    """Registers functions of a class or module for instrumentation.
+
+    Static methods, class methods, properties and names that start with an underscore are skipped.
+
+    Args:
+        owner (class or module): The class or module that holds the functions, e.g. SIMgui, rs.Room or control.
+        names (list): The names of the functions, when None every public function that is defined in the owner
+                      itself, so inherited Qt methods and functions a module imported are left alone.
+
+    Returns:
+        list: The names of the instrumented functions as they appear in the snapshot, e.g. "Room.getTemperature".
+    """
+    if names is None:
+        names = [name for name, value in vars(owner).items() if not name.startswith("_")
+                 and (not inspect.ismodule(owner) or getattr(value, "__module__", None) == owner.__name__)]
+    registered = []
+    for name in names:
+        original = inspect.getattr_static(owner, name)
+        if isinstance(original, (staticmethod, classmethod, property, type)) or not callable(original):
+            continue
+        if any(target[0] is owner and target[1] == name for target in _targets):
+            continue # already instrumented
+        with _lock:
+            _names.append(f"{getattr(owner, '__name__', owner)}.{name}")
+            _targets.append((owner, name, original))
+            _calls.append(0)
+            _total_ns.append(0)
+            _max_ns.append(0)
+            _histogram.extend([0] * HISTOGRAM_BUCKETS)
+        if _enabled:
+            setattr(owner, name, _timed(len(_targets) - 1, original))
+        registered.append(_names[-1])
+    return registered
+
+
+def _timed(index: int, func):
+    # everything the wrapper needs is a local variable, a call costs two clock reads, a lock and a few list updates
+    offset = index * HISTOGRAM_BUCKETS
+    calls, total_ns, max_ns, histogram, lock = _calls, _total_ns, _max_ns, _histogram, _lock
+    clock = time.perf_counter_ns
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            with lock:
+                calls[index] += 1
+                total_ns[index] += elapsed
+                if elapsed > max_ns[index]:
+                    max_ns[index] = elapsed
+                histogram[offset + elapsed.bit_length()] += 1
+    return wrapper
+
+
+def enable() -> None:
+    """Starts timing the instrumented functions."""
+    global _enabled
+    if not _enabled:
+        for index, (owner, name, original) in enumerate(_targets):
+            setattr(owner, name, _timed(index, original))
+        _enabled = True
+
+
+def disable() -> None:
+    """Stops timing, the instrumented functions are restored so they run at full speed. The statistics are kept."""
+    global _enabled
+    if _enabled:
+        for owner, name, original in _targets:
+            setattr(owner, name, original)
+        _enabled = False
+
+
+def isEnabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Sets the statistics of every instrumented function to 0."""
+    with _lock:
+        for values in (_calls, _total_ns, _max_ns, _histogram):
+            values[:] = [0] * len(values)
+
+
+def _percentile(histogram: np.ndarray, fraction: float) -> int:
+    # upper bound of the bucket that holds the percentile
+    bucket = int(np.searchsorted(np.cumsum(histogram), fraction * histogram.sum(), side="left"))
+    return 2 ** bucket
+
+
+def snapshot() -> dict:
+    """Copies the statistics of every instrumented function that was called.
+
+    Returns:
+        dict: By function name: calls, total_ns, mean_ns, max_ns, p50_ns and p99_ns (the upper bound of
+              their histogram bucket) and histogram, the counts of the HISTOGRAM_BUCKETS buckets.
+    """
+    with _lock:
+        histograms = np.array(_histogram, dtype=np.int64).reshape(-1, HISTOGRAM_BUCKETS)
+        calls_copy, total_copy, max_copy = list(_calls), list(_total_ns), list(_max_ns)
+    result = {}
+    for index, name in enumerate(_names):
+        calls = calls_copy[index]
+        if calls == 0:
+            continue
+        result[name] = {
+            "calls": calls,
+            "total_ns": total_copy[index],
+            "mean_ns": total_copy[index] / calls,
+            "max_ns": max_copy[index],
+            "p50_ns": _percentile(histograms[index], 0.5),
+            "p99_ns": _percentile(histograms[index], 0.99),
+            "histogram": histograms[index].tolist(),
+        }
+    return result
+
+
+def export(path: str) -> dict:
+    """Writes the snapshot to a JSON file.
+
+    Args:
+        path (str): The JSON file.
+
+    Returns:
+        dict: The snapshot that was written.
+    """
+    result = snapshot()
+    with open(path, "w") as export_file:
+        json.dump(result, export_file, indent=2)
+    return result
+
+
+def report() -> str:
+    """Formats the snapshot as a table, the functions with the most total time first."""
+    result = snapshot()
+    lines = [f"{'function':<45}{'calls':>10}{'total ms':>12}{'mean us':>10}{'p99 us':>10}{'max us':>10}"]
+    for name, stats in sorted(result.items(), key=lambda item: -item[1]["total_ns"]):
+        lines.append(f"{name:<45}{stats['calls']:>10}{stats['total_ns'] / 1e6:>12.3f}{stats['mean_ns'] / 1e3:>10.2f}"
+                     f"{stats['p99_ns'] / 1e3:>10.2f}{stats['max_ns'] / 1e3:>10.2f}")
+    return "\n".join(lines)
@@ -1,21 +1,15 @@
 # python --version: 3.10.9
 from functools import wraps
-import time
+import atexit
 import inspect
-from PyQt5 import QtCore #, QtWidgets  # for gui widgets
-from PyQt5.QtWidgets import QApplication #, QMainWindow, QWidget  # for gui window and app
-
 import sys  # for system operations
-import reactivex as rx
-
-# from room import Room  # Old room.py class and temperature generator
-from room_simulator import Room # New room class and temperature generator
-import room_simulator as rs # includes mockArduino and Room classes
-from SIMgui import SIMgui # gui class with controller
-from MockFirmata import MockFirmata # mock arduino class
 
 from constants import * # pin definitions
 
+# PyQt5, matplotlib, reactivex and the room simulator are imported where they are used, so the command-line
+# arguments are checked and the helpers can be imported by other scripts and tests without loading the gui
+
+
 @staticmethod
 def verbose_output_logger_decorator(verbose_enabled, log_output):
     """Decorator for logging verbose output and result of a function
@@ -39,39 +33,117 @@ def verbose_output_logger_decorator(verbose_enabled, log_output):
         return wrapper
     return decorator
 
-@staticmethod
-def log_time_enabled_decorator(log_time_enabled):
-    """Decorator for logging the execution time of a function
+def parse_time_scale(argv: list) -> float:
+    """Reads the simulation speed from a `--time-scale=N` command-line argument
     Args:
-        log_time_enabled (bool): Boolean value to enable/disable logging of execution time
+        argv (list): The command-line arguments
     Returns:
-        wrapper (function): Wrapper function with the decorator applied
+        float: The amount of simulated seconds per real second, 1.0 when the flag is not given
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            if log_time_enabled:
-                start_time = time.time()
-                result = func(*args, **kwargs)
-                end_time = time.time()
-                execution_time = end_time - start_time
-                print(f"Function {func.__name__} executed in {execution_time} seconds")
-                return result
-            else:
-                return func(*args, **kwargs)
-        return wrapper
-    return decorator
+    for arg in argv:
+        if arg.startswith("--time-scale="):
+            time_scale = float(arg.split("=", 1)[1])
+            if time_scale <= 0:
+                raise ValueError("--time-scale must be greater than 0")
+            return time_scale
+    return 1.0
+
+def parse_plot_backend(argv: list) -> str:
+    """Reads the plot backend from a `--plot=NAME` command-line argument
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        str: matplotlib or stripchart, matplotlib when the flag is not given
+    """
+    for arg in argv:
+        if arg.startswith("--plot="):
+            return arg.split("=", 1)[1]
+    return "matplotlib"
 
-def main() -> None:
+def parse_frame_rate(argv: list) -> float:
+    """Reads the maximum number of redraws per second from a `--fps=N` command-line argument
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        float: The maximum frame rate of the gui, 30.0 when the flag is not given
+    """
+    for arg in argv:
+        if arg.startswith("--fps="):
+            frame_rate = float(arg.split("=", 1)[1])
+            if frame_rate <= 0:
+                raise ValueError("--fps must be greater than 0")
+            return frame_rate
+    return 30.0
+
+def parse_telemetry_path(argv: list) -> str:
+    """Reads the telemetry log file from a `--telemetry=FILE` command-line argument
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        str: The log file, None when the flag is not given
+    """
+    for arg in argv:
+        if arg.startswith("--telemetry="):
+            return arg.split("=", 1)[1]
+    return None
+
+def parse_replay(argv: list) -> tuple:
+    """Reads the `--replay=FILE` and `--replay-speed=N|max` command-line arguments
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        tuple: The telemetry log to replay, None when the flag is not given, 
+               and the replayed seconds per real second, None for `max` and 1.0 when the flag is not given
+    """
+    path, speed = None, 1.0
+    for arg in argv:
+        if arg.startswith("--replay="):
+            path = arg.split("=", 1)[1]
+        elif arg.startswith("--replay-speed="):
+            value = arg.split("=", 1)[1]
+            speed = None if value == "max" else float(value)
+            if speed is not None and speed <= 0:
+                raise ValueError("--replay-speed must be greater than 0 or max")
+    return path, speed
+
+def parse_log_time(argv: list) -> tuple:
+    """Reads the `--log-time` or `--log-time=FILE` command-line argument
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        tuple: True when the flag is given, and the JSON file to export the timings to, None without a file
+    """
+    for arg in argv:
+        if arg == "--log-time":
+            return True, None
+        if arg.startswith("--log-time="):
+            return True, arg.split("=", 1)[1]
+    return False, None
+
+def main(time_scale: float = 1.0, plot_backend: str = "matplotlib", graph_length: int = 100, frame_rate: float = 30.0, telemetry_path: str = None, replay: tuple = (None, 1.0)) -> None:
     # main pyqt gui setup
+    from PyQt5 import QtCore #, QtWidgets  # for gui widgets
+    from PyQt5.QtWidgets import QApplication #, QMainWindow, QWidget  # for gui window and app
+    import reactivex as rx
+    # from room import Room  # Old room.py class and temperature generator
+    from room_simulator import Room # New room class and temperature generator
+    import room_simulator as rs # includes mockArduino and Room classes
+    from SIMgui import SIMgui # gui class with controller
+    from MockFirmata import MockFirmata # mock arduino class
+    from TelemetryLog import TelemetryLog # log of every poll
+    from ReplaySource import ReplaySource # replays a telemetry log
+
     print("Starting program")
     print(f"=====================\nLibrary Versions:\nPython Verion:\t\t{sys.version}\nPyQt5 Verion:\t\t{QtCore.PYQT_VERSION_STR}\nReactivex Verion:\t{rx.__version__}\nRoom_Simulator Version:\t{rs.__version__}\n=====================")
 
     app = QApplication(sys.argv)
 
+    # simulation clock, runs faster than real time when a time scale is given
+    clock = rs.SimClock(rs.ClockMode.SCALED, time_scale) if time_scale != 1.0 else rs.SimClock()
+
     # pybind11 C++ module room_simulator class
     SIMroom = Room(temperature=25.0, outside_temperature=30,
-                   humidity=20.0, room_dimensions=[10, 10, 2]) 
+                   humidity=20.0, room_dimensions=[10, 10, 2], clock=clock) 
                                 # breedte, lengte, hoogte
 
     mockFirmata = MockFirmata(Port=3, Room=SIMroom)
@@ -92,11 +164,20 @@ def main() -> None:
         print(f"Pin modes set:\n{pinConnections}\nTo Change pins alter Constants in constants.py\n=====================")
 
 
-        window = SIMgui(MockFirmata=mockFirmata, graphLength=100)
+        telemetry = TelemetryLog(telemetry_path) if telemetry_path is not None else None
+        window = SIMgui(MockFirmata=mockFirmata, graphLength=graph_length, plotBackend=plot_backend, frameRate=frame_rate, telemetry=telemetry)
         
+        if replay[0] is not None:
+            # recorded samples instead of the simulated room
+            window.replay(ReplaySource(replay[0], speed=replay[1]))
         window.show()
 
-        sys.exit(app.exec_())
+        exit_code = app.exec_()
+        if telemetry is not None:
+            window.stopPolling()
+            telemetry.close()
+            print(f"{len(telemetry)} polls written to {telemetry_path}")
+        sys.exit(exit_code)
     
 
 
@@ -104,38 +185,64 @@ if __name__ == '__main__':
     
     # Check if the verbose, log-output and log-time flags are provided as command-line arguments
     verbose_enabled = "--verbose" in sys.argv
-    log_time_enabled = "--log-time" in sys.argv
+    log_time_enabled, log_time_path = parse_log_time(sys.argv)
     output_logging_enabled = "--log-output" in sys.argv
+    time_scale = parse_time_scale(sys.argv)
+    plot_backend = parse_plot_backend(sys.argv)
+    frame_rate = parse_frame_rate(sys.argv)
+    telemetry_path = parse_telemetry_path(sys.argv)
+    replay = parse_replay(sys.argv)
     print(f"Verbose mode: {verbose_enabled}")
     print(f"Log time mode: {log_time_enabled}")
     print(f"Output logging mode: {output_logging_enabled}")
+    print(f"Time scale: {time_scale}x")
+    print(f"Plot backend: {plot_backend}")
+    print(f"Frame rate: {frame_rate} fps")
+    print(f"Telemetry log: {telemetry_path}")
+    print(f"Replay: {replay[0]} at {replay[1] or 'max'}x")
 
     # TODO: Add a decorator to the mockFirmata and MockArduino classes
 
     # Apply the decorators based on the command-line arguments
-    if verbose_enabled | log_time_enabled | output_logging_enabled:
+    if verbose_enabled | output_logging_enabled:
+        import room_simulator as rs
+        from SIMgui import SIMgui
+        from MockFirmata import MockFirmata
         print("Applying decorators")
         # Wrap functions within the SIMgui class
         for name, func in inspect.getmembers(SIMgui, inspect.isfunction):
-            setattr(SIMgui, name, verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(log_time_enabled_decorator(log_time_enabled)(func)))
+            setattr(SIMgui, name, verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(func))
 
         # Wrap functions within the MockFirmata class
         for name, func in inspect.getmembers(MockFirmata, inspect.isfunction):
-            setattr(MockFirmata, name, verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(log_time_enabled_decorator(log_time_enabled)(func)))
+            setattr(MockFirmata, name, verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(func))
         
         # Create wrapper functions and apply decorators for the Room class functions
         for attr_name, attr_value in inspect.getmembers(rs.Room):
             if callable(attr_value) and not inspect.isclass(attr_value) and attr_name != "__getattribute__":
-                wrapper_func = verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(log_time_enabled_decorator(log_time_enabled)(attr_value))
-                setattr(rs.Room, attr_name, wrapper_func)
+                setattr(rs.Room, attr_name, verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(attr_value))
 
         # Create wrapper functions and apply decorators for the MockArduino class functions
         for attr_name, attr_value in inspect.getmembers(rs.mockArduino):
             if callable(attr_value) and not inspect.isclass(attr_value) and attr_name != "__getattribute__":
-                wrapper_func = verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(log_time_enabled_decorator(log_time_enabled)(attr_value))
-                setattr(rs.mockArduino, attr_name, wrapper_func)
+                setattr(rs.mockArduino, attr_name, verbose_output_logger_decorator(verbose_enabled, output_logging_enabled)(attr_value))
+
+    # time every call with the instrumentation, the timings are printed when the program stops
+    if log_time_enabled:
+        import room_simulator as rs
+        from SIMgui import SIMgui
+        from MockFirmata import MockFirmata
+        import control # heater, cooler and sunscreen controller
+        import instrumentation # call counts and latency histograms for --log-time
+        for owner in (SIMgui, MockFirmata, rs.Room, rs.mockArduino, control):
+            instrumentation.instrument(owner)
+        instrumentation.enable()
+        atexit.register(lambda: print(instrumentation.report()))
+        if log_time_path is not None:
+            atexit.register(instrumentation.export, log_time_path)
         
     # setup the main program
-    main()
+    # the strip chart is light enough to show a long history
+    main(time_scale, plot_backend, graph_length=100000 if plot_backend == "stripchart" else 100, frame_rate=frame_rate, telemetry_path=telemetry_path, replay=replay)
 
     pass
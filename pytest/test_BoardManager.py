@@ -0,0 +1,162 @@
+import pytest
+import sys
+import gc
+import weakref
+import numpy as np
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+import room_simulator as rs
+from MockFirmata import MockFirmata
+import control # heater, cooler and sunscreen controller
+
+from constants import * # pin definitions
+
+
+PIN_CONNECTIONS = [f"d:{DHT22_1}:DHT22_1", f"d:{DHT22_2}:DHT22_2", f"d:{RELAY_HEATER}:RELAY_HEATER",
+                   f"d:{RELAY_COOLER}:RELAY_COOLER", f"d:{RELAY_SUNSCREEN}:RELAY_SUNSCREEN", f"a:{LDR}:LDR"]
+
+@pytest.fixture
+def manager():
+    manager = rs.BoardManager()
+    manager.addTemplate("zone", PIN_CONNECTIONS)
+    for port in range(10):
+        room = rs.Room(temperature=20.0 + port, outside_temperature=30.0, humidity=40.0)
+        room.setSensorNoise(max_offset=0.0)
+        manager.addBoard(100 + port, room, "zone")
+    yield manager
+
+def test_boards_are_addressed_by_port(manager):
+    assert len(manager) == 10
+    assert manager.getPorts() == list(range(100, 110))
+    assert 105 in manager and 3 not in manager
+    assert manager.getBoard(105).get_com_Port() == 105
+    assert manager.getBoard(105).get_room().getTemperature() == pytest.approx(25.0, abs=0.1)
+    with pytest.raises(IndexError):
+        manager.getBoard(3)
+    with pytest.raises(ValueError):
+        manager.addBoard(105, rs.Room())
+    with pytest.raises(IndexError):
+        manager.addBoard(3, rs.Room(), "unknown")
+
+def test_templates_are_checked_once(manager):
+    assert manager.getTemplateNames() == ["zone"]
+    with pytest.raises(ValueError):
+        manager.addTemplate("bad", ["d:7:DHT22_1", "d:99:RELAY_HEATER"])
+    with pytest.raises(ValueError):
+        manager.addTemplate("bad", ["d:7"])
+    assert manager.getTemplateNames() == ["zone"]
+
+    manager.addTemplate("sensor", [f"d:{DHT22_1}:dht22_1"])
+    manager.addBoard(3, rs.Room(), "sensor")
+    assert manager.getBoard(3).read_all()[1:] == (None, None, None, None, None)
+
+def test_bulk_reads_match_the_boards(manager):
+    manager.addBoard(3, rs.Room()) # without pins
+    boards = [manager.getBoard(port) for port in manager.getPorts()]
+
+    inside = manager.readDHT22_1()
+    assert inside.shape == (11, 2)
+    assert np.isnan(inside[-1]).all()
+    assert inside[:-1, 0] == pytest.approx(20.0 + np.arange(10), abs=0.1)
+    assert (inside[:-1, 1] == 40.0).all()
+    assert manager.readDHT22_2()[:-1, 0] == pytest.approx(np.full(10, 30.0), abs=0.1)
+    assert list(manager.readLDR()) == [board.read_LDR() for board in boards[:-1]] + [-1]
+
+    readings = manager.readAll()
+    assert list(readings["port"]) == manager.getPorts()
+    assert np.array_equal(readings["light_level"], manager.readLDR())
+    assert readings["inside_temperature"][:-1] == pytest.approx(inside[:-1, 0])
+
+def test_bulk_relay_writes(manager):
+    heater = np.arange(10) % 2 == 0
+    manager.writeRelays(heater, ~heater, np.zeros(10, dtype=bool))
+    heaters, coolers, sunscreens = manager.readRelays()
+    assert np.array_equal(heaters, heater) and np.array_equal(coolers, ~heater) and not sunscreens.any()
+    assert manager.getBoard(100).get_room().isHeaterActive()
+    assert manager.getBoard(101).get_room().isCoolerActive()
+    with pytest.raises(ValueError):
+        manager.writeRelays(heater[:5], heater[:5], heater[:5])
+
+def test_bulk_control_loop(manager):
+    # one control step for every board with the batch controller
+    inside, outside, lux = manager.readDHT22_1()[:, 0], manager.readDHT22_2()[:, 0], np.full(10, 12000.0)
+    heaters, coolers, sunscreens = manager.readRelays()
+    commands = control.generateCommandsBatch(inside, outside, 24.0, 0.5, heaters, coolers, sunscreens, True, lux, 10000.0)
+    manager.writeRelays(*commands)
+    assert np.array_equal(manager.readRelays(), np.array(commands, dtype=bool))
+    assert manager.readRelays()[0].sum() == 4 # the rooms below 23.5 degrees are heated
+
+def test_removed_boards_are_reused(manager):
+    manager.getBoard(100).get_room().activateHeater(True)
+    manager.removeBoard(100)
+    assert 100 not in manager and len(manager) == 9 and manager.getPoolSize() == 1
+    assert manager.getPorts()[0] == 109 # the last board takes the free place
+    room = rs.Room()
+    board = manager.addBoard(200, room)
+    assert manager.getPoolSize() == 0
+    assert board.get_com_Port() == 200
+    assert board.read_all() == (None, None, None, None, None, None) # the pins of the old board are reset
+    with pytest.raises(IndexError):
+        manager.removeBoard(100)
+
+def test_removed_boards_with_a_handle_are_not_reused(manager):
+    board = manager.getBoard(100)
+    room = board.get_room()
+    manager.removeBoard(100)
+    assert manager.getPoolSize() == 0 # the handle still holds the board
+    new = manager.addBoard(200, rs.Room())
+    assert new is not board
+    assert board.get_com_Port() == 100 and board.get_room() is room
+    assert board.read_all()[0] is not None # the pins of the kept board are untouched
+    del board
+    manager.removeBoard(200)
+    assert manager.getPoolSize() == 0 # new is still held
+    del new
+    manager.addBoard(200, rs.Room())
+    manager.removeBoard(200)
+    assert manager.getPoolSize() == 1
+
+def test_removed_boards_release_their_room():
+    manager = rs.BoardManager()
+    room = rs.Room()
+    released = weakref.ref(room)
+    manager.addBoard(3, room)
+    del room
+    gc.collect()
+    assert released() is not None # the manager holds the room of a connected board
+    manager.removeBoard(3)
+    gc.collect()
+    assert released() is None
+
+    room = rs.Room()
+    kept = weakref.ref(room)
+    board = manager.addBoard(4, room)
+    del room
+    manager.removeBoard(4)
+    gc.collect()
+    assert kept() is not None and board.get_room().getTemperature() == pytest.approx(25.0, abs=0.6) # the handle holds the room
+    del board
+    gc.collect()
+    assert kept() is None
+
+def test_MockFirmata_with_manager(manager):
+    firmata = MockFirmata(Port=105, Manager=manager)
+    assert firmata.begin()
+    assert firmata.getRoomObject().getTemperature() == pytest.approx(25.0, abs=0.1)
+    firmata.digitalWrite(RELAY_HEATER, True)
+    assert manager.readRelays()[0][5]
+
+    room = rs.Room()
+    new = MockFirmata(Port=7, Room=room, Manager=manager)
+    assert 7 in manager and new.MockArduino.get_com_Port() == 7
+    new.setPinTemplate("zone")
+    assert new.readAll()[2] == new.analogRead(LDR)
+    with pytest.raises(Exception):
+        MockFirmata(Port=7, Room=room).setPinTemplate("zone")
+    assert MockFirmata(Port=7, Room=room, Manager=manager).MockArduino is new.MockArduino
+    with pytest.raises(ValueError):
+        MockFirmata(Port=7, Room=rs.Room(), Manager=manager) # port 7 is connected to the other room
+
+def test_MockFirmata_uses_its_port():
+    firmata = MockFirmata(Port=5, Room=rs.Room())
+    assert firmata.MockArduino.get_com_Port() == 5
+    assert firmata.begin()
@@ -0,0 +1,79 @@
+import time
+import threading
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from FrameScheduler import FrameScheduler
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    # the frames are drawn by the Qt event loop, which needs an application also when this file runs alone
+    yield QApplication.instance() or QApplication([])
+
+
+def processEventsFor(seconds):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+
+
+def test_requests_are_merged_into_one_frame():
+    frames = []
+    scheduler = FrameScheduler(lambda: frames.append(time.perf_counter()), frameRate=20)
+    for _ in range(10):
+        scheduler.requestFrame()
+    assert frames == [] # frames are only drawn by the Qt event loop
+    processEventsFor(0.2)
+    assert len(frames) == 1
+    assert scheduler.renderedFrames == 1
+    assert scheduler.droppedFrames == 9
+
+
+def test_frames_are_limited_to_the_frame_rate():
+    frames = []
+    scheduler = FrameScheduler(lambda: frames.append(time.perf_counter()), frameRate=10)
+    deadline = time.time() + 0.5
+    while time.time() < deadline:
+        scheduler.requestFrame()
+        QApplication.processEvents()
+        time.sleep(0.005)
+    processEventsFor(0.15)
+    assert 3 <= len(frames) <= 7
+    assert min(b - a for a, b in zip(frames, frames[1:])) >= 0.09
+    assert scheduler.renderedFrames + scheduler.droppedFrames > 50
+
+
+def test_requests_from_other_threads_render_on_the_qt_thread():
+    threads = []
+    scheduler = FrameScheduler(lambda: threads.append(threading.current_thread()), frameRate=100)
+    worker = threading.Thread(target=lambda: [scheduler.requestFrame() for _ in range(100)])
+    worker.start()
+    worker.join()
+    processEventsFor(0.1)
+    assert threads == [threading.main_thread()]
+    assert scheduler.droppedFrames == 99
+
+
+def test_hidden_view_skips_frames():
+    frames = []
+    visible = False
+    scheduler = FrameScheduler(lambda: frames.append(1), visible=lambda: visible)
+    scheduler.requestFrame()
+    processEventsFor(0.1)
+    assert frames == []
+    assert scheduler.droppedFrames == 1
+
+    visible = True
+    scheduler.requestFrame()
+    processEventsFor(0.1)
+    assert frames == [1]
+    scheduler.resetCounters()
+    assert scheduler.renderedFrames == scheduler.droppedFrames == 0
+
+
+def test_frame_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        FrameScheduler(lambda: None, frameRate=0)
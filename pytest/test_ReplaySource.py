@@ -0,0 +1,98 @@
+import time
+import threading
+
+import numpy as np
+import pytest
+from reactivex.scheduler import EventLoopScheduler
+
+from ReplaySource import ReplaySource
+from TelemetryLog import TelemetryLog, RECORD_DTYPE
+
+
+def make_records(inside, poll_interval=1.0, lux=500):
+    records = np.zeros(len(inside), dtype=RECORD_DTYPE)
+    records["time"] = np.arange(len(inside)) * poll_interval
+    records["inside_temperature"] = inside
+    records["inside_humidity"] = 50
+    records["outside_temperature"] = 10
+    records["outside_humidity"] = 60
+    records["lux"] = lux
+    return records
+
+
+def test_seek_uses_the_recorded_time():
+    source = ReplaySource(make_records([20, 21, 22, 23], poll_interval=10))
+    assert source.seek(15) == 2
+    assert source.seek(20) == 2
+    assert source.seek(-1) == 0
+    assert source.seek(100) == 4
+    assert source.sample(1) == [[21, 50], [10, 60], 500]
+
+
+def test_replays_as_fast_as_possible_from_the_position():
+    source = ReplaySource(make_records([20, 21, 22, 23]), speed=None)
+    source.seek(1)
+    samples = []
+    completed = []
+    source.observable().subscribe(on_next=samples.append, on_completed=lambda: completed.append(True))
+    assert [sample[0][0] for sample in samples] == [21, 22, 23]
+    assert completed == [True]
+    assert source.position == 4
+
+
+def test_replays_with_scaled_timing():
+    # 5 samples one recorded second apart at 20x take 0.2 seconds
+    source = ReplaySource(make_records([20] * 5), speed=20)
+    scheduler = EventLoopScheduler()
+    times = []
+    finished = threading.Event()
+    start = time.perf_counter()
+    source.observable().subscribe(on_next=lambda sample: times.append(time.perf_counter() - start),
+                                  on_completed=finished.set, scheduler=scheduler)
+    assert finished.wait(2)
+    scheduler.dispose()
+    assert len(times) == 5
+    assert times[-1] == pytest.approx(0.2, abs=0.1)
+    assert all(b - a > 0.03 for a, b in zip(times, times[1:]))
+
+
+def test_dispose_stops_the_replay():
+    source = ReplaySource(make_records([20] * 100), speed=10)
+    scheduler = EventLoopScheduler()
+    samples = []
+    subscription = source.observable().subscribe(on_next=samples.append, scheduler=scheduler)
+    time.sleep(0.25)
+    subscription.dispose()
+    count = len(samples)
+    time.sleep(0.25)
+    scheduler.dispose()
+    assert 1 <= count <= 5
+    assert len(samples) == count
+
+
+def test_command_stream_follows_its_own_relay_states():
+    # the heater switches on below 19.5 and only switches off again from 19.75
+    source = ReplaySource(make_records([19.4, 19.6, 19.8, 19.6], lux=[500, 500, 20000, 500]))
+    commands = source.commandStream(target_temperature=20, temp_threshold=0.5, lux_threshold=10000)
+    assert list(commands["time"]) == [0, 1, 2, 3]
+    assert list(commands["heater"]) == [True, True, False, False]
+    assert list(commands["sunscreen"]) == [False, False, True, False]
+    assert not commands["cooler"].any()
+    assert source.position == 4
+
+
+def test_replays_a_telemetry_log_file(tmp_path):
+    path = str(tmp_path / "poll.log")
+    with TelemetryLog(path) as log:
+        for i in range(3):
+            log.append(i, (18 + i, 50), (10, 60), 100, 500, (True, False, False))
+    source = ReplaySource(path, speed=None)
+    assert len(source) == 3
+    # a week of one second polls replays in seconds
+    week = ReplaySource(make_records(np.tile([19.0, 20.0, 21.0], 201600)), speed=None)
+    start = time.perf_counter()
+    commands = week.commandStream()
+    assert len(commands) == 604800
+    assert time.perf_counter() - start < 10
+    with pytest.raises(ValueError):
+        ReplaySource(path, speed=0)
@@ -0,0 +1,44 @@
+import pytest
+import sys
+from collections import deque
+import numpy as np
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+from RingBuffer import RingBuffer
+
+
+def test_RingBuffer_behaves_like_deque():
+    buffer = RingBuffer(maxlen=5)
+    expected = deque(maxlen=5)
+    assert len(buffer) == 0 and buffer.maxlen == 5
+
+    for value in [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]:
+        buffer.append(value)
+        expected.append(value)
+        assert list(buffer) == list(expected)
+        assert buffer[-1] == expected[-1] and buffer[0] == expected[0]
+        assert buffer.min() == min(expected) and buffer.max() == max(expected)
+
+    buffer.extend([7, 8])
+    expected.extend([7, 8])
+    assert buffer.values.tolist() == list(expected)
+
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.values.size == 0
+    buffer.append(-1)
+    assert list(buffer) == [-1] and buffer.min() == buffer.max() == -1
+
+def test_RingBuffer_running_min_max():
+    values = np.random.default_rng(3).normal(20.0, 2.0, 1000)
+    buffer = RingBuffer(maxlen=37)
+    for i, value in enumerate(values):
+        buffer.append(value)
+        window = values[max(0, i - 36):i + 1]
+        assert buffer.min() == window.min() and buffer.max() == window.max()
+    # the values are a contiguous view that can't be changed from the outside
+    assert buffer.values.flags.c_contiguous and not buffer.values.flags.writeable
+
+def test_RingBuffer_invalid_input():
+    with pytest.raises(ValueError):
+        RingBuffer(maxlen=0)
+    with pytest.raises(ValueError):
+        RingBuffer(maxlen=3).min()
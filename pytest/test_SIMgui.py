@@ -1,11 +1,16 @@
 import pytest
 import sys
 import time
+import threading
 sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the SIMgui.py file to the Python path
 from PyQt5.QtWidgets import QApplication
 from SIMgui import SIMgui
 from room_simulator import Room # New room class and temperature generator
+import room_simulator as rs
 from MockFirmata import MockFirmata # mock arduino class
+from TelemetryLog import TelemetryLog, RECORD_DTYPE
+from ReplaySource import ReplaySource
+import numpy as np
 
 from constants import * # pin definitions
 
@@ -227,6 +232,16 @@ def test_lux_calculation(gui,expected_lux,max_error):
     assert gui.calculateLuxFromADC(gui.firmata.analogRead(LDR)) == pytest.approx(expected_lux, max_error)
 
 
+def test_lux_calculation_uses_the_current_calibration(gui):
+    # a calibration that is set on the board after the gui was created is used for the conversion too
+    calibration = rs.LDRCalibration(R10lx=20000.0, gamma=0.8)
+    gui.firmata.MockArduino.set_ldr_calibration(calibration)
+    gui.room.setLightLevelLux(500)
+    adc = gui.firmata.analogRead(LDR)
+    assert adc == calibration.lux_to_adc(500)
+    assert gui.calculateLuxFromADC(adc) == calibration.adc_to_lux(adc)
+
+
 def test_purge_graph_data(gui):
 
     # Add some data to the graph
@@ -240,6 +255,192 @@ def test_purge_graph_data(gui):
     assert len(gui.humidityValues) == 0
 
 
+def test_update_plots_only_rescales_when_needed(gui):
+    gui.purgeGraphData()
+    gui.updatePlots(22, 50)
+    assert gui.TempCanvas.ax.get_ylim() == (19, 25)
+    assert list(gui.TempCanvas.line.get_xdata()) == [9] # the newest value is at the right of the graph
+
+    # values within the range don't change the axis
+    gui.updatePlots(24, 50)
+    gui.updatePlots(20, 50)
+    assert gui.TempCanvas.ax.get_ylim() == (19, 25)
+    assert list(gui.TempCanvas.line.get_ydata()) == [22, 24, 20]
+
+    # a value outside of the range rescales the axis to the data
+    gui.updatePlots(30, 50)
+    assert gui.TempCanvas.ax.get_ylim() == (17, 33)
+    assert list(gui.TempCanvas.line.get_xdata()) == [6, 7, 8, 9]
+
+
+def test_stripchart_backend():
+    SIMroom = Room()
+    mockFirmata = MockFirmata(Port=3, Room=SIMroom)
+    gui = SIMgui(MockFirmata=mockFirmata, graphLength=1000, plotBackend="stripchart")
+    gui.updatePlots(22, 50)
+    gui.updatePlots(23, 51)
+    assert list(gui.TempCanvas.values) == [22, 23]
+    assert gui.HumidCanvas.ylim == (47, 53)
+    gui.purgeGraphData()
+    assert gui.TempCanvas.ylim is None
+    gui.__del__()
+
+    with pytest.raises(ValueError):
+        SIMgui(MockFirmata=mockFirmata, plotBackend="gnuplot")
+
+
+def test_poll_thread_only_updates_widgets_on_qt_thread(gui):
+    threads = {}
+    readAll = gui.firmata.readAll
+    def recordingReadAll():
+        threads["poll"] = threading.current_thread()
+        return readAll()
+    gui.firmata.readAll = recordingReadAll
+    updateValues = gui.TempCanvas.updateValues
+    def recordingUpdateValues(values):
+        threads["draw"] = threading.current_thread()
+        updateValues(values)
+    gui.TempCanvas.updateValues = recordingUpdateValues
+
+    gui.room.setTemperature(30)
+    gui.room.setOutsideTemperature(40)
+    gui.setPollInterval(0.05)
+    deadline = time.time() + 2
+    while "poll" not in threads and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    # the control decision is made on the poll thread without a running Qt event loop
+    assert threads["poll"] is not threading.main_thread()
+    assert gui.room.isCoolerActive()
+    assert len(gui.temperatureValues) > 0
+    assert "draw" not in threads
+    assert not gui.CoolerStateBox.isChecked()
+
+    # the view is updated on the next frame of the Qt thread, frames are skipped while the window is hidden
+    gui.show()
+    deadline = time.time() + 2
+    while "draw" not in threads and time.time() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    assert threads["draw"] is threading.main_thread()
+    assert gui.CoolerStateBox.isChecked()
+    gui.hide()
+
+
+def test_samples_are_merged_into_frames(gui):
+    gui.observablePoll.dispose()
+    gui.purgeGraphData()
+    gui.show()
+    QApplication.processEvents()
+    gui.frameScheduler.resetCounters()
+    for temp in range(20):
+        gui.temperature_light_subject.on_next([[temp, 50], [10, 50], 500, (False, False, False)])
+    # the controller and the graph buffers see every sample, the view only draws once
+    assert len(gui.temperatureValues) == 10
+    assert gui.room.isHeaterActive()
+    deadline = time.time() + 0.5
+    while gui.frameScheduler.renderedFrames == 0 and time.time() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    assert gui.frameScheduler.renderedFrames == 1
+    assert gui.frameScheduler.droppedFrames == 39 # every sample requests a frame for the relays and one for the graphs
+    assert gui.HeaterStateBox.isChecked()
+    assert "39 dropped" in gui.statusbar.currentMessage()
+    gui.hide()
+
+
+def test_polls_are_written_to_the_telemetry_log(gui, tmp_path):
+    path = str(tmp_path / "poll.log")
+    gui.telemetry = TelemetryLog(path)
+    gui.room.setTemperature(30)
+    gui.room.setOutsideTemperature(40)
+    gui.setPollInterval(0.02)
+    deadline = time.time() + 2
+    while len(gui.telemetry) < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    gui.stopPolling()
+    gui.telemetry.close()
+
+    records = TelemetryLog.read(path)
+    assert len(records) >= 3
+    assert records["time"][-1] > records["time"][0]
+    assert records["ldr_adc"][0] == gui.firmata.analogRead(LDR)
+    assert records["lux"][0] == pytest.approx(gui.calculateLuxFromADC(records["ldr_adc"][0]))
+    # the hot room turns the cooler on after the first poll
+    assert records["cooler"][-1] == 1 and records["heater"][-1] == 0
+
+
+def test_unconfigured_sensors_are_logged_as_missing(tmp_path):
+    room = Room(temperature=25.0, outside_temperature=30, humidity=20.0, room_dimensions=[10, 10, 2])
+    mockFirmata = MockFirmata(Port=3, Room=room)
+    # no outside DHT22 and no LDR
+    for pin in [f"d:{DHT22_1}:DHT22_1", f"d:{RELAY_HEATER}:RELAY_HEATER", f"d:{RELAY_COOLER}:RELAY_COOLER",
+                f"d:{RELAY_SUNSCREEN}:RELAY_SUNSCREEN"]:
+        mockFirmata.setPinMode(pin)
+    gui = SIMgui(MockFirmata=mockFirmata, graphLength=10)
+    try:
+        gui.stopPolling() # the test polls on its own thread
+        path = str(tmp_path / "poll.log")
+        gui.telemetry = TelemetryLog(path)
+        gui.pollSensors()
+        gui.telemetry.close()
+    finally:
+        gui.__del__()
+
+    records = TelemetryLog.read(path)
+    assert len(records) == 1
+    assert records["inside_temperature"][0] == pytest.approx(25.0, abs=0.6)
+    assert np.isnan(records["outside_temperature"][0]) and np.isnan(records["outside_humidity"][0])
+    assert records["ldr_adc"][0] == -1 and np.isnan(records["lux"][0])
+
+def test_replay_feeds_recorded_samples_to_the_controller(gui):
+    records = np.zeros(50, dtype=RECORD_DTYPE)
+    records["time"] = np.arange(50)
+    records["inside_temperature"] = 18.0
+    records["inside_temperature"][25:] = 25.0
+    records["outside_temperature"] = 10.0
+    records["lux"] = 500
+    samples = []
+    gui.temperature_light_subject.subscribe(on_next=samples.append)
+    gui.replay(ReplaySource(records, speed=None))
+    deadline = time.time() + 2
+    while len(samples) < 50 and time.time() < deadline:
+        time.sleep(0.01)
+    gui.stopPolling()
+    assert len(samples) == 50
+    # the last samples are too warm, the heater was switched off and the cooler stays off because it is cold outside
+    assert not gui.room.isHeaterActive()
+    assert not gui.room.isCoolerActive()
+    assert list(gui.temperatureValues) == [25.0] * 10
+
+
+def test_stopPolling_from_the_poll_thread(gui):
+    records = np.zeros(50, dtype=RECORD_DTYPE)
+    records["inside_temperature"] = 20.0
+    stopped = threading.Event()
+    def stopOnFirstSample(sample):
+        if not stopped.is_set():
+            gui.stopPolling() # a subscriber runs on the poll thread
+            stopped.set()
+    gui.temperature_light_subject.subscribe(on_next=stopOnFirstSample)
+    gui.replay(ReplaySource(records, speed=None))
+    assert stopped.wait(2)
+    assert gui.observablePoll is None
+
+def test_stopPolling_after_the_scheduler_was_disposed(gui):
+    gui.setPollInterval(0.02)
+    gui.pollScheduler.dispose()
+    start = time.time()
+    gui.stopPolling()
+    assert time.time() - start < 1
+
+def test_active_temp_control_is_copied_for_the_poll_thread(gui):
+    gui.ActiveTempControlCheckBox.setChecked(True)
+    assert gui.activeTempControl == True
+    gui.ActiveTempControlCheckBox.setChecked(False)
+    assert gui.activeTempControl == False
+
+
 def test_update_observer(gui):
     assert gui.observablePoll is not None
 
@@ -0,0 +1,58 @@
+import pytest
+import sys
+import numpy as np
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+from PyQt5.QtWidgets import QApplication
+from StripChart import StripChart
+from RingBuffer import RingBuffer
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    # the charts are widgets, which need an application also when this file runs alone
+    yield QApplication.instance() or QApplication([])
+
+@pytest.fixture()
+def chart():
+    chart = StripChart("Temperature", "Temperature °C", 'r', maxlen=100000)
+    chart.resize(400, 300)
+    yield chart
+
+def test_decimate_keeps_min_max(chart):
+    values = RingBuffer(maxlen=100000)
+    values.extend(np.sin(np.arange(100000) / 500.0) * 5 + 20)
+    values.append(40.0) # a single peak has to stay visible
+    chart.updateValues(values)
+    assert chart.ylim == (values.min() - 3, 43.0)
+
+    x, y = chart.decimate(300)
+    assert len(x) == len(y) <= 2 * 300 + 2
+    assert y.max() == 40.0 and y.min() == values.min()
+    assert x.max() < chart.maxlen and (np.diff(x) >= 0).all()
+
+    area = chart.plotArea()
+    polygon = chart.polygon(area)
+    assert polygon.size() == len(chart.decimate(int(area.width()))[0])
+    assert area.top() - 1e-9 <= polygon.boundingRect().top() and polygon.boundingRect().bottom() <= area.bottom() + 1e-9
+
+def test_short_history_is_not_decimated(chart):
+    values = RingBuffer(maxlen=100000)
+    values.extend([20.0, 21.0, 22.0])
+    chart.updateValues(values)
+    x, y = chart.decimate(300)
+    assert list(x) == [99997, 99998, 99999] and list(y) == [20.0, 21.0, 22.0]
+
+    # values within the range don't change the axis
+    values.append(19.0)
+    chart.updateValues(values)
+    assert chart.ylim == (17.0, 25.0)
+
+def test_paint(chart):
+    values = RingBuffer(maxlen=100000)
+    chart.grab() # painting without values
+    values.extend(np.linspace(20, 25, 50000))
+    chart.updateValues(values)
+    assert not chart.grab().isNull()
+
+    chart.reset()
+    assert chart.ylim is None and len(chart.values) == 0
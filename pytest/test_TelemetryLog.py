@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+from TelemetryLog import TelemetryLog, RECORD_DTYPE, HEADER_SIZE
+
+
+def write_records(log, count, start=0):
+    for i in range(start, start + count):
+        log.append(i * 0.5, (20 + i, 50), (10, 40 + i), 100 + i, 1000.5 + i, (i % 2 == 0, False, True))
+
+
+def test_records_can_be_read_back(tmp_path):
+    path = str(tmp_path / "poll.log")
+    with TelemetryLog(path) as log:
+        write_records(log, 3)
+        assert len(log) == 3
+        assert list(log.records["ldr_adc"]) == [100, 101, 102]
+
+    records = TelemetryLog.read(path)
+    assert records.dtype == RECORD_DTYPE
+    assert list(records["time"]) == [0, 0.5, 1.0]
+    assert list(records["inside_temperature"]) == [20, 21, 22]
+    assert list(records["outside_humidity"]) == [40, 41, 42]
+    assert records["lux"][1] == pytest.approx(1001.5)
+    assert list(records["heater"]) == [1, 0, 1]
+    assert list(records["sunscreen"]) == [1, 1, 1]
+    # close cuts the unused capacity off the file
+    assert os.path.getsize(path) == HEADER_SIZE + 3 * RECORD_DTYPE.itemsize
+
+
+def test_log_can_be_read_while_it_is_written(tmp_path):
+    path = str(tmp_path / "poll.log")
+    log = TelemetryLog(path, capacity=4)
+    assert len(TelemetryLog.read(path)) == 0
+    write_records(log, 3)
+    assert list(TelemetryLog.read(path)["ldr_adc"]) == [100, 101, 102]
+
+    # the file grows when the capacity is reached, the records stay in place
+    write_records(log, 7, start=3)
+    assert log.capacity == 16
+    records = TelemetryLog.read(path)
+    assert isinstance(records, np.memmap)
+    assert list(records["ldr_adc"]) == list(range(100, 110))
+    log.close()
+
+
+def test_records_are_read_only(tmp_path):
+    path = str(tmp_path / "poll.log")
+    with TelemetryLog(path) as log:
+        write_records(log, 2)
+        with pytest.raises(ValueError):
+            log.records["lux"][0] = 0
+    with pytest.raises(ValueError):
+        TelemetryLog.read(path)["lux"][0] = 0
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "other.log"
+    path.write_bytes(b"not a telemetry log" * 40)
+    with pytest.raises(ValueError):
+        TelemetryLog.read(str(path))
+    with pytest.raises(ValueError):
+        TelemetryLog(str(tmp_path / "poll.log"), capacity=0)
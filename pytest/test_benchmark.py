@@ -0,0 +1,64 @@
+import pytest
+import sys
+import json
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+import benchmark
+
+
+def makeResults(times: dict, noise: float = 0.0) -> dict:
+    return {"machine": {}, "time": "", "results": {name: {"median_ns_per_call": ns, "ns_per_call": ns * 0.9, "noise": noise,
+                                                          "calls": 10, "rounds": 15} for name, ns in times.items()}}
+
+def test_compare_reports_only_regressions_beyond_the_tolerance():
+    baseline = makeResults({"fast": 100.0, "slow": 100.0, "same": 100.0})
+    results = makeResults({"fast": 50.0, "slow": 130.0, "same": 120.0, "new": 1000.0})
+    assert benchmark.compare(results, baseline, tolerance=0.25) == [("slow", 100.0, 130.0, 1.3)]
+    assert benchmark.compare(results, baseline, tolerance=0.5) == []
+    # a noisy baseline needs a larger slowdown
+    assert benchmark.compare(results, makeResults({"slow": 100.0}, noise=0.05), tolerance=0.25) == []
+    assert benchmark.compare(makeResults({"slow": 150.0}), makeResults({"slow": 100.0}, noise=0.05), tolerance=0.25) != []
+    # and so does a quiet benchmark of a noisy machine
+    baseline["results"]["fast"]["noise"] = baseline["results"]["same"]["noise"] = 0.05
+    assert benchmark.compare(results, baseline, tolerance=0.25) == []
+
+def test_mergeRuns_uses_the_spread_of_the_runs_as_noise():
+    runs = [makeResults({"a": 100.0}, noise=0.01), makeResults({"a": 120.0}, noise=0.02), makeResults({"a": 90.0}, noise=0.03)]
+    merged = benchmark.mergeRuns(runs)
+    assert merged["runs"] == 3
+    assert merged["results"]["a"]["median_ns_per_call"] == 100.0
+    assert merged["results"]["a"]["ns_per_call"] == 81.0
+    assert merged["results"]["a"]["noise"] == pytest.approx(0.3)
+    assert merged["results"]["a"]["rounds"] == 45
+
+def test_parse_arguments():
+    arguments = benchmark.parse_arguments(["--filter=get_pin_data", "--tolerance=0.1", "--output=out.json"])
+    assert arguments["names"] == [name for name in benchmark.BENCHMARKS if name.startswith("mockArduino.get_pin_data")]
+    assert arguments["tolerance"] == 0.1
+    assert arguments["output"] == "out.json"
+    assert not arguments["update_baseline"]
+    with pytest.raises(ValueError):
+        benchmark.parse_arguments(["--tolerance=-1"])
+
+def test_main_fails_on_a_regression(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    output = str(tmp_path / "results.json")
+    assert benchmark.main(["--filter=calculateTempDelta", f"--baseline={baseline}", "--update-baseline"]) == 0
+    with open(baseline) as baseline_file:
+        stored = json.load(baseline_file)
+    assert list(stored["results"]) == ["Room.calculateTempDelta"]
+    assert stored["machine"]["cpu_count"] is not None
+
+    assert stored["runs"] == benchmark.BASELINE_RUNS
+    stored["results"]["Room.calculateTempDelta"]["median_ns_per_call"] /= 100 # a baseline that is far too fast
+    stored["results"]["Room.calculateTempDelta"]["noise"] = 0.1
+    with open(baseline, "w") as baseline_file:
+        json.dump(stored, baseline_file)
+    assert benchmark.main(["--filter=calculateTempDelta", f"--baseline={baseline}", f"--output={output}"]) == 1
+    with open(output) as output_file:
+        assert json.load(output_file)["results"]["Room.calculateTempDelta"]["median_ns_per_call"] > 0
+
+def test_benchmarks_run():
+    results = benchmark.runBenchmarks(["Room.getTemperature", "SIMgui.pollTick"], min_time=0.01, repeat=1)
+    assert set(results["results"]) == {"Room.getTemperature", "SIMgui.pollTick"}
+    with pytest.raises(ValueError):
+        benchmark.runBenchmarks(["unknown"])
@@ -0,0 +1,31 @@
+import pytest
+import sys
+import itertools
+import numpy as np
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+import control
+
+
+def test_generateCommandsBatch_matches_generateCommands():
+    target, threshold = 20.0, 0.5
+    # every branch of the controller including the values exactly on the thresholds
+    temperatures = [15.0, 19.5, 19.5001, 19.7, 19.75, 19.8, 20.0, 20.2, 20.25, 20.3, 20.5, 20.5001, 25.0, np.nan]
+    samples = list(itertools.product(temperatures, [15.0, 20.0, 25.0], [False, True], [False, True], [False, True], [False, True], [100.0, 10000.0, 20000.0]))
+    inside, outside, heater, cooler, sunscreen, active, lux = (np.array(column) for column in zip(*samples))
+
+    heater_commands, cooler_commands, sunscreen_commands = control.generateCommandsBatch(
+        inside, outside, target, threshold, heater, cooler, sunscreen, active, lux, 10000.0)
+    for i, sample in enumerate(samples):
+        expected = control.generateCommands(sample[0], sample[1], target, threshold, *sample[2:6], sample[6], 10000.0)
+        assert [heater_commands[i], cooler_commands[i], sunscreen_commands[i]] == expected
+
+def test_generateCommandsBatch_float32_and_broadcasting():
+    inside = np.linspace(18.0, 22.0, 401, dtype=np.float32)
+    heater_commands, cooler_commands, sunscreen_commands = control.generateCommandsBatch(
+        inside, 25.0, np.array([[20.0], [21.0]]), 0.3, True, False, False, False, 5000.0, 10000.0)
+    assert heater_commands.shape == cooler_commands.shape == sunscreen_commands.shape == (2, 401)
+    assert heater_commands.dtype == bool and not sunscreen_commands.any()
+    for row, target in enumerate([20.0, 21.0]):
+        for i, temperature in enumerate(inside):
+            expected = control.generateCommands(float(temperature), 25.0, target, 0.3, True, False, False, False, 5000.0, 10000.0)
+            assert [heater_commands[row, i], cooler_commands[row, i], sunscreen_commands[row, i]] == expected
@@ -0,0 +1,55 @@
+import pytest
+import sys
+import json
+import subprocess
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+import headless
+
+
+def test_runScenario_reaches_target():
+    summary = headless.runScenario({"duration": 6 * 3600.0})
+    assert summary["polls"] == 6 * 3600
+    assert summary["simulated_hours"] == 6.0
+    # the room starts 5 degrees above the target, after cooling down it stays within the threshold
+    assert summary["final_temperature"] == pytest.approx(20.0, abs=1.0)
+    assert 0.5 < summary["time_in_band"] < 1.0
+    assert summary["max_overshoot"] == pytest.approx(4.5, abs=0.6)
+    assert summary["switch_count"] > 0
+    assert summary["energy_kwh"] > 0
+
+def test_runScenario_is_reproducible():
+    scenario = {"duration": 3600.0, "seed": 7, "stream": 3}
+    first = headless.runScenario(scenario)
+    second = headless.runScenario(scenario)
+    for metric in ["time_in_band", "switch_count", "energy_kwh", "max_overshoot", "final_temperature"]:
+        assert first[metric] == second[metric]
+
+def test_runScenario_invalid_settings():
+    with pytest.raises(ValueError):
+        headless.runScenario({"poll_intervall": 1.0})
+    with pytest.raises(ValueError):
+        headless.runScenario({"poll_interval": 0.0})
+
+def test_main_writes_summary(tmp_path):
+    scenario_file = tmp_path / "scenario.json"
+    scenario_file.write_text(json.dumps({"target_temperature": 25.0, "outside_temperature": 25.0, "temp_threshold": 1.0, "lux_threshold": 20000.0}))
+    output_file = tmp_path / "summary.json"
+    summary = headless.main([f"--scenario={scenario_file}", "--hours=0.5", f"--output={output_file}"])
+
+    assert json.loads(output_file.read_text()) == summary
+    assert summary["scenario"]["target_temperature"] == 25.0
+    assert summary["polls"] == 1800
+    # nothing to control when the room is already at the target temperature
+    assert summary["switch_count"] == 0 and summary["energy_kwh"] == 0.0
+
+@pytest.mark.parametrize("module", ["headless", "MockFirmata", "main"])
+def test_headless_does_not_import_qt(module):
+    result = subprocess.run([sys.executable, "-c", 
+                             f"import sys, {module}; print([name for name in sys.modules if name.split('.')[0] in ('PyQt5', 'matplotlib', 'reactivex')])"],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+def test_MockFirmata_import_has_no_side_effects():
+    import MockFirmata
+    assert not hasattr(MockFirmata, "room")
@@ -0,0 +1,122 @@
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+import instrumentation
+import room_simulator as rs
+
+
+@pytest.fixture()
+def timing():
+    instrumentation.reset()
+    yield instrumentation
+    instrumentation.disable()
+
+
+def make_class():
+    class Sensor:
+        def read(self, value):
+            return value
+
+        def slow(self):
+            time.sleep(0.002)
+
+        def fail(self):
+            raise RuntimeError("broken sensor")
+
+        @staticmethod
+        def create():
+            return Sensor()
+
+        def _private(self):
+            pass
+    return Sensor
+
+
+def test_calls_are_only_timed_while_enabled(timing):
+    Sensor = make_class()
+    original = Sensor.read
+    assert timing.instrument(Sensor) == ["Sensor.read", "Sensor.slow", "Sensor.fail"]
+    assert Sensor.read is original # nothing is wrapped while the instrumentation is off
+
+    timing.enable()
+    assert timing.isEnabled()
+    sensor = Sensor()
+    assert sensor.read(5) == 5
+    sensor.read(6)
+    sensor.slow()
+    timing.disable()
+    assert Sensor.read is original
+    sensor.read(7)
+
+    stats = timing.snapshot()
+    assert stats["Sensor.read"]["calls"] == 2
+    assert stats["Sensor.slow"]["calls"] == 1
+    assert "Sensor.fail" not in stats # never called
+    # 2 ms lands in the bucket up to 2**21 ns or 2**22 ns
+    assert 2 * 10**6 <= stats["Sensor.slow"]["max_ns"] <= stats["Sensor.slow"]["p99_ns"] <= 2**22
+    assert sum(stats["Sensor.read"]["histogram"]) == 2
+    assert stats["Sensor.read"]["mean_ns"] == stats["Sensor.read"]["total_ns"] / 2
+
+
+def test_calls_from_many_threads_are_all_counted(timing):
+    Sensor = make_class()
+    timing.instrument(Sensor, ["read"])
+    timing.enable()
+    sensor = Sensor()
+    def poll():
+        for _ in range(20000):
+            sensor.read(1)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6) # switch threads as often as possible to provoke lost updates
+    try:
+        threads = [threading.Thread(target=poll) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    stats = timing.snapshot()["Sensor.read"]
+    assert stats["calls"] == 80000
+    assert sum(stats["histogram"]) == 80000
+
+
+def test_failing_calls_are_counted(timing):
+    Sensor = make_class()
+    timing.instrument(Sensor, ["fail", "create"])
+    timing.enable()
+    with pytest.raises(RuntimeError):
+        Sensor().fail()
+    assert Sensor.create() is not None # static methods are left alone
+    assert timing.snapshot()["Sensor.fail"]["calls"] == 1
+    assert "Sensor.create" not in timing.snapshot()
+
+
+def test_instrument_while_enabled_and_reset(timing):
+    timing.enable()
+    Sensor = make_class()
+    timing.instrument(Sensor, ["read"])
+    Sensor().read(1)
+    assert timing.snapshot()["Sensor.read"]["calls"] == 1
+    timing.reset()
+    assert "Sensor.read" not in timing.snapshot()
+
+
+def test_native_classes_can_be_instrumented(timing, tmp_path):
+    names = timing.instrument(rs.Room, ["getTemperature", "setTemperature"])
+    assert names == ["Room.getTemperature", "Room.setTemperature"]
+    room = rs.Room()
+    timing.enable()
+    room.setTemperature(21.0)
+    assert room.getTemperature() == pytest.approx(21.0, abs=1)
+    timing.disable()
+
+    exported = timing.export(str(tmp_path / "timing.json"))
+    with open(tmp_path / "timing.json") as timing_file:
+        assert json.load(timing_file) == exported
+    assert exported["Room.getTemperature"]["calls"] == 1
+    assert "Room.getTemperature" in timing.report()
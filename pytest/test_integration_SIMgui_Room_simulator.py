@@ -53,6 +53,18 @@ def test_pipeline_to_execute_commands(gui,input_data, output_states,additionalSe
     assert gui.room.isSunscreenActive() == output_states[2]
     
 
+def test_pipeline_uses_relay_states_from_sample(gui):
+    # the heater is on according to the sample, so it stays on until the half threshold is reached
+    gui.room.activateHeater(False)
+    gui.temperature_light_subject.on_next([[19.6, 50], [10, 50], 500, (True, False, False)])
+    assert gui.room.isHeaterActive() == True
+    # the sample says the heater is off, so it stays off inside the threshold band
+    gui.temperature_light_subject.on_next([[19.6, 50], [10, 50], 500, (False, False, False)])
+    assert gui.room.isHeaterActive() == False
+    gui.temperature_light_subject.on_next([[19.4, 50], [10, 50], 500, (False, False, False)])
+    assert gui.room.isHeaterActive() == True
+
+
 def test_connected_ui_functions(gui):
     assert gui.OutTempSelectBox.value() == pytest.approx(gui.room.getOutsideTemperature(),0.1) == pytest.approx(30,0.1)
     assert gui.RoomTempSelectBox.value() == pytest.approx(gui.room.getTemperature(),0.1) == pytest.approx(25,0.1)
@@ -1,5 +1,6 @@
 import pytest
 import sys
+import numpy as np
 sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
 from PyQt5.QtWidgets import QApplication
 from room_simulator import Room
@@ -24,6 +25,9 @@ def Firmata_with_pinModes():
     SIMroom = Room(temperature=25.0, outside_temperature=30,
                    humidity=20.0, room_dimensions=[10, 10, 2]) 
                                 # breedte, lengte, hoogte
+    # fixed sensor noise so the readings don't depend on the number of rooms created before,
+    # the offsets of this stream are -0.24 and 0.12 degrees
+    SIMroom.seedSensorNoise(seed=1, stream=3)
 
     Firmata = MockFirmata(Port=3, Room=SIMroom)
     Firmata.begin()
@@ -160,6 +164,88 @@ def test_read_DHT(Firmata_with_pinModes):
     assert Firmata_with_pinModes.digitalRead(DHT22_2)[0] == pytest.approx(30.0,0.01)
     assert Firmata_with_pinModes.digitalRead(DHT22_2)[1] == pytest.approx(20.0,0.01)
 
+def test_read_all(Firmata_with_pinModes):
+    Firmata_with_pinModes.digitalWrite(RELAY_COOLER, True)
+    inside, outside, light_level, heater, cooler, sunscreen = Firmata_with_pinModes.readAll()
+    assert list(inside) == Firmata_with_pinModes.digitalRead(DHT22_1)
+    assert list(outside) == Firmata_with_pinModes.digitalRead(DHT22_2)
+    assert light_level == Firmata_with_pinModes.analogRead(LDR)
+    assert (heater, cooler, sunscreen) == (False, True, False)
+
+def test_read_all_unconfigured_pins(Firmata):
+    assert Firmata.readAll() == (None, None, None, None, None, None)
+    Firmata.setPinMode(f"d:{DHT22_2}:DHT22_2")
+    snapshot = Firmata.readAll()
+    assert snapshot[0] is None
+    assert snapshot[1][0] == pytest.approx(30.0, 0.02)
+    # changing the pin mode removes the sensor from the snapshot
+    Firmata.setPinMode(f"d:{DHT22_2}:EMPTY")
+    assert Firmata.readAll()[1] is None
+
+def test_get_pin(Firmata):
+    inside = Firmata.get_pin(f"d:{DHT22_1}:dht22_1")
+    outside = Firmata.get_pin(f"d:{DHT22_2}:DHT22_2")
+    heater = Firmata.get_pin(f"d:{RELAY_HEATER}:relay_heater")
+    light = Firmata.get_pin(f"a:{LDR}:ldr")
+    empty = Firmata.get_pin("d:2:o")
+
+    assert isinstance(inside, rs.DHT22Pin) and isinstance(heater, rs.RelayPin)
+    assert isinstance(light, rs.AnalogPin) and isinstance(empty, rs.DigitalPin)
+    assert (inside.get_pin_type(), inside.get_pin_num(), inside.get_pin_mode()) == (0, DHT22_1, 1)
+
+    # the pins give the same values as the pin number based functions
+    assert list(inside.read()) == Firmata.digitalRead(DHT22_1)
+    assert list(outside.read()) == Firmata.digitalRead(DHT22_2)
+    assert light.read() == Firmata.analogRead(LDR)
+    heater.write(True)
+    assert heater.read() == Firmata.digitalRead(RELAY_HEATER) == Firmata.getRoomObject().isHeaterActive() == True
+    empty.write(True)
+    assert empty.read() == Firmata.digitalRead(2) == True
+
+def test_get_pin_invalid_input(Firmata):
+    with pytest.raises(ValueError, match="Invalid pin definition"):
+        Firmata.get_pin("d:7")
+    with pytest.raises(ValueError, match="Invalid pin type"):
+        Firmata.get_pin("s:7:dht22_1")
+    with pytest.raises(ValueError, match="Invalid pin mode"):
+        Firmata.get_pin("d:7:dht11")
+    with pytest.raises(ValueError, match="Invalid pin number"):
+        Firmata.get_pin("d:60:dht22_1")
+    with pytest.raises(ValueError, match="Invalid pin mode"):
+        Firmata.get_pin("a:0:dht22_1")
+
+def test_ldr_calibration_is_shared(Firmata):
+    calibration = Firmata.getLDRCalibration()
+    # every board and the gui use the same table for the same LDR setup
+    table = calibration.table
+    assert np.shares_memory(table, rs.LDRCalibration().table)
+    assert np.shares_memory(table, MockFirmata(Port=3, Room=Firmata.getRoomObject()).getLDRCalibration().table)
+    assert not np.shares_memory(table, rs.LDRCalibration(R1=10000).table)
+
+    assert len(table) == 1024 and table.flags.writeable == False
+    assert (table[1:] > table[:-1]).all()
+    assert calibration.adc_to_lux(977) == table[977]
+
+def test_ldr_calibration_conversion(Firmata):
+    calibration = Firmata.getLDRCalibration()
+    Firmata.setPinMode(f"a:{LDR}:LDR")
+    for lux in [1, 100, 1000, 10000, 100000]:
+        Firmata.getRoomObject().setLightLevelLux(lux)
+        assert Firmata.analogRead(LDR) == calibration.lux_to_adc(lux)
+    
+    # the NumPy versions give the same values as the single value versions
+    values = np.arange(1024)
+    assert np.array_equal(calibration.adc_to_lux(values), calibration.table)
+    assert np.array_equal(calibration.lux_to_adc(calibration.table), values)
+
+    with pytest.raises(ValueError):
+        calibration.adc_to_lux(1024)
+    with pytest.raises(ValueError):
+        rs.LDRCalibration(gamma=0)
+    with pytest.raises(ValueError):
+        Firmata.MockArduino.set_ldr_calibration(None)
+
+
 if __name__ == "__main__":
     
     print(f"Pybind11 Module Version: {rs.__version__}")
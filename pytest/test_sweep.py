@@ -0,0 +1,83 @@
+import pytest
+import sys
+import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+import headless
+import sweep
+
+
+GRID = {"heater_power": [500.0, 2000.0], "room_dimensions": [[5, 5, 2], [10, 10, 2]]}
+BASE = {"duration": 1800.0, "temperature": 18.0, "outside_temperature": 15.0}
+
+def test_expandGrid():
+    scenarios = sweep.expandGrid(GRID, BASE)
+    assert len(scenarios) == 4
+    stream = sweep.noiseStream({"heater_power": 500.0, "room_dimensions": [10, 10, 2]})
+    assert scenarios[1] == {"stream": stream, **BASE, "heater_power": 500.0, "room_dimensions": [10, 10, 2]}
+    streams = [scenario["stream"] for scenario in scenarios]
+    assert len(set(streams)) == 4
+    assert sweep.expandGrid({"stream": [5]})[0]["stream"] == 5
+    # a stream in the base doesn't give every run the same noise
+    assert [scenario["stream"] for scenario in sweep.expandGrid(GRID, {**BASE, "stream": 7})] == streams
+
+def test_expandGrid_streams_dont_depend_on_the_grid_size():
+    streams = {json.dumps([scenario["heater_power"], scenario["room_dimensions"]]): scenario["stream"]
+               for scenario in sweep.expandGrid(GRID, BASE)}
+    larger = sweep.expandGrid({"heater_power": [250.0] + GRID["heater_power"], "room_dimensions": GRID["room_dimensions"]}, BASE)
+    assert len(larger) == 6
+    for scenario in larger: # the runs of the smaller grid keep their noise
+        key = json.dumps([scenario["heater_power"], scenario["room_dimensions"]])
+        assert scenario["stream"] == streams.get(key, scenario["stream"])
+    assert len({scenario["stream"] for scenario in larger}) == 6
+
+def test_runSweep_matches_single_runs(tmp_path):
+    output = str(tmp_path / "sweep.npz")
+    columns = sweep.runSweep(GRID, output, base=BASE, workers=2)
+
+    results = np.load(output)
+    assert sorted(results.files) == sorted(["run", "heater_power", "room_dimensions"] + sweep.METRICS)
+    assert results["room_dimensions"].shape == (4, 3)
+    for run, scenario in enumerate(sweep.expandGrid(GRID, BASE)):
+        summary = headless.runScenario(scenario)
+        for metric in sweep.METRICS:
+            assert results[metric][run] == columns[metric][run] == summary[metric]
+    # more heater power heats the room faster
+    assert results["time_in_band"][2] > results["time_in_band"][0]
+
+def test_runSweep_resumes(tmp_path):
+    output = str(tmp_path / "sweep.npz")
+    checkpoint = tmp_path / "sweep.jsonl"
+    sweep.runSweep(GRID, output, base=BASE, workers=2)
+    lines = checkpoint.read_text().splitlines()
+    assert len(lines) == 4
+
+    # keep one finished run with a marker and a partly written run, as if the sweep crashed
+    finished = json.loads(lines[0])
+    finished["switch_count"] = -1
+    checkpoint.write_text(json.dumps(finished) + "\n" + lines[1][:20])
+    columns = sweep.runSweep(GRID, output, base=BASE, workers=2)
+    assert columns["switch_count"][finished["run"]] == -1
+    assert (columns["switch_count"] >= 0).sum() == 3
+    assert len(checkpoint.read_text().splitlines()) == 4
+
+    with pytest.raises(ValueError):
+        sweep.runSweep({"heater_power": [750.0]}, output, base=BASE)
+
+def test_runSweep_keeps_finished_runs_when_a_run_fails(tmp_path, monkeypatch):
+    output = str(tmp_path / "sweep.npz")
+    checkpoint = tmp_path / "sweep.jsonl"
+    sweep.runSweep(GRID, output, base=BASE, workers=2)
+    lines = checkpoint.read_text().splitlines()
+    checkpoint.write_text(lines[0] + "\n")
+
+    # the pending runs fail, the earlier run is still in the checkpoint afterwards
+    def fail(scenario):
+        raise RuntimeError("run failed")
+    monkeypatch.setattr(sweep, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(sweep.headless, "runScenario", fail)
+    with pytest.raises(RuntimeError):
+        sweep.runSweep(GRID, output, base=BASE, workers=2)
+    assert checkpoint.read_text().splitlines() == [lines[0]]
+    assert not (tmp_path / "sweep.jsonl.tmp").exists()
@@ -0,0 +1,49 @@
+import pytest
+import os
+import sys
+import shutil
+sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
+from PyQt5.QtWidgets import QApplication, QMainWindow
+from PyQt5 import uic
+import uicache
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    # setupUi builds widgets, which need an application also when this file runs alone
+    yield QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def ui_path(tmp_path):
+    path = str(tmp_path / "gui.ui")
+    shutil.copy(os.path.join(os.path.dirname(uicache.__file__), "gui.ui"), path)
+    return path
+
+def test_loadUiClass_caches_the_generated_module(ui_path):
+    Ui = uicache.loadUiClass(ui_path)
+    assert Ui.__name__ == "Ui_MainWindow"
+    path = uicache.cachePath(ui_path)
+    assert path == os.path.join(os.path.dirname(ui_path), "__pycache__", "gui_ui.py")
+    modified = os.stat(path).st_mtime_ns
+
+    uicache.loadUiClass(ui_path)
+    assert os.stat(path).st_mtime_ns == modified # the cache was used
+
+def test_loadUiClass_regenerates_after_a_change(ui_path):
+    uicache.loadUiClass(ui_path)
+    with open(ui_path, encoding="utf-8") as ui_file:
+        content = ui_file.read()
+    with open(ui_path, "w", encoding="utf-8") as ui_file:
+        ui_file.write(content.replace("Sensor Poll Interval", "Sample Interval"))
+    window = QMainWindow()
+    uicache.setupUi(window, ui_path)
+    with open(uicache.cachePath(ui_path), encoding="utf-8") as cache_file:
+        assert "Sample Interval" in cache_file.read()
+
+def test_setupUi_matches_loadUi(ui_path):
+    cached, loaded = QMainWindow(), QMainWindow()
+    uicache.setupUi(cached, ui_path)
+    uic.loadUi(ui_path, loaded)
+    names = [name for name in vars(loaded) if not name.startswith("_")]
+    assert names and all(type(getattr(cached, name)) is type(getattr(loaded, name)) for name in names)
+    assert cached.windowTitle() == loaded.windowTitle()
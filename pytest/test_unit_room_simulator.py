@@ -1,5 +1,7 @@
 import pytest
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0,"..\\ATP_Room_Sim") # Add the directory containing the module.py file to the Python path
 from PyQt5.QtWidgets import QApplication
 from room_simulator import Room
@@ -162,6 +164,350 @@ def test_is_sunscreen_and_activate_sunscreen():
     room.activateSunscreen(False)
     assert room.isSunscreenActive() == False
 
+def test_virtual_clock_advance():
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=clock)
+    assert room.getClock().getMode() == rs.ClockMode.VIRTUAL
+    # no simulated time passes without advancing the clock
+    assert clock.now() == 0.0
+    assert room.advance(0) == 25.0
+    # an hour of simulated time passes instantly and heats the room towards the outside temperature
+    temperature = room.advance(3600)
+    assert clock.now() == room.getSimulationTime() == 3600.0
+    assert 25.0 < temperature < 30.0 + 5.0
+    with pytest.raises(ValueError):
+        room.advance(-1)
+
+def test_DHT22_read_interval_on_simulated_time():
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=clock)
+    first_reading = room.getTemperature()
+    # less than 2 simulated seconds since the last reading, the sensor returns the previous value
+    clock.advance(1.9)
+    assert room.getTemperature() == first_reading
+    assert room.getSimulationTime() == 0.0
+    clock.advance(0.1)
+    assert room.getTemperature() > first_reading
+    assert room.getSimulationTime() == pytest.approx(2.0)
+
+def test_scaled_clock():
+    clock = rs.SimClock(rs.ClockMode.SCALED, 600)
+    assert clock.getTimeScale() == 600
+    time.sleep(0.05)
+    assert clock.now() >= 30.0 # 0.05 seconds at 600x
+    with pytest.raises(ValueError):
+        clock.setTimeScale(0)
+    with pytest.raises(ValueError):
+        rs.SimClock(rs.ClockMode.SCALED, -1)
+
+def test_shared_clock():
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room_a = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=clock)
+    room_b = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0])
+    room_b.setClock(clock)
+    room_a.advance(600)
+    # room b integrates the shared simulated time on its next step
+    assert room_b.advance(0) == pytest.approx(room_a.advance(0))
+
+def test_RoomArray_initialization():
+    rooms = rs.RoomArray(5, temperature=20.0, outside_temperature=10.0, room_dimensions=[5.0, 4.0, 3.0])
+    assert len(rooms) == 5
+    assert list(rooms.temperatures) == [20.0] * 5
+    assert list(rooms.outside_temperatures) == [10.0] * 5
+    assert list(rooms.volumes) == [60.0] * 5
+    assert list(rooms.surface_areas) == [54.0] * 5
+    assert not rooms.heaters_active.any()
+    with pytest.raises(ValueError):
+        rs.RoomArray(5, room_dimensions=[10.0, 10.0])
+
+def test_RoomArray_zero_copy_views():
+    rooms = rs.RoomArray(3)
+    temperatures = rooms.temperatures
+    temperatures[1] = 40.0
+    assert rooms.temperatures[1] == 40.0
+    rooms.step(1.0)
+    # the view follows the simulation without fetching it again
+    assert temperatures[1] == rooms.temperatures[1] < 40.0
+
+def test_RoomArray_matches_Room():
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=clock)
+    room.activateHeater(True)
+    rooms = rs.RoomArray(2, 25.0, 30.0, [10.0, 10.0, 2.0])
+    rooms.heaters_active[0] = True
+    rooms.setRoomDimensions(1, [4.0, 4.0, 2.0])
+    for _ in range(100):
+        room.advance(1.0)
+    rooms.step(1.0, 100)
+    assert rooms.temperatures[0] == pytest.approx(room.advance(0), abs=1e-3)
+    # the unheated room warms up towards the outside temperature
+    assert 25.0 < rooms.temperatures[1] < 30.0
+    with pytest.raises(IndexError):
+        rooms.setRoomDimensions(2, [4.0, 4.0, 2.0])
+
+def test_exact_integration_is_step_size_independent():
+    def simulate(step, steps):
+        room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+        room.setIntegrationMode(rs.IntegrationMode.EXACT)
+        room.activateHeater(True)
+        for _ in range(steps):
+            room.advance(step)
+        return room.advance(0)
+
+    assert simulate(3600, 1) == pytest.approx(simulate(1, 3600), abs=1e-3)
+
+def test_exact_integration_does_not_overshoot():
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0])
+    assert room.getIntegrationMode() == rs.IntegrationMode.EULER
+    # forward euler overshoots past the outside temperature for a long time step
+    assert 25.0 + room.calculateTempDelta(100000) > 30.0
+    room.setIntegrationMode(rs.IntegrationMode.EXACT)
+    assert 25.0 + room.calculateTempDelta(100000) == pytest.approx(30.0)
+    assert room.calculateTempDelta(1) == pytest.approx(Room(25.0, 30.0).calculateTempDelta(1), 1e-3)
+
+def test_RoomArray_exact_integration():
+    rooms = rs.RoomArray(2, 25.0, 30.0)
+    rooms.setIntegrationMode(rs.IntegrationMode.EXACT)
+    rooms.heaters_active[0] = True
+    rooms.step(3600)
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    room.setIntegrationMode(rs.IntegrationMode.EXACT)
+    room.activateHeater(True)
+    assert rooms.temperatures[0] == pytest.approx(room.advance(3600), abs=1e-3)
+
+def test_advance_multiple_steps():
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    single_steps = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    for _ in range(100):
+        single_steps.advance(1.0)
+    assert room.advance(1.0, steps=100) == single_steps.advance(0)
+    assert room.getSimulationTime() == 100.0
+    with pytest.raises(ValueError):
+        room.advance(1.0, steps=-1)
+
+def test_trajectory():
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    temperatures = room.trajectory(delta_time=10.0, steps=60)
+    assert temperatures.shape == (60,)
+    # the room warms up towards the outside temperature every step
+    assert all(temperatures[1:] > temperatures[:-1])
+    assert temperatures[-1] == room.advance(0)
+    assert room.getSimulationTime() == 600.0
+
+def test_advance_from_threads():
+    def simulate(heater_active):
+        room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+        room.activateHeater(heater_active)
+        return room.advance(1.0, steps=100000)
+
+    settings = [True, False, True, False]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded_results = list(executor.map(simulate, settings))
+    assert threaded_results == [simulate(heater_active) for heater_active in settings]
+
+def test_Building_without_walls_matches_RoomArray():
+    building = rs.Building(2, 25.0, 30.0)
+    rooms = rs.RoomArray(2, 25.0, 30.0)
+    building.zones.heaters_active[0] = True
+    rooms.heaters_active[0] = True
+    building.step(1.0, 600)
+    rooms.step(1.0, 600)
+    assert building.zones.temperatures == pytest.approx(rooms.temperatures, abs=1e-2)
+
+def test_Building_shared_walls():
+    building = rs.Building(3, 20.0, 20.0)
+    building.addWall(0, 1, area=20.0)
+    building.connect(1, 2, conductance=12.0)
+    assert building.getConnectionCount() == 2
+    building.zones.heaters_active[0] = True
+    building.step(1.0, 3600)
+    temperatures = building.zones.temperatures
+    # heat flows from the heated zone through its neighbour to the last zone
+    assert temperatures[0] > temperatures[1] > temperatures[2] > 20.0
+    # the implicit solver stays stable with a very large time step
+    building.step(86400.0)
+    assert all(20.0 <= temperature < 100.0 for temperature in building.zones.temperatures)
+
+def test_Building_step_waits_for_a_zones_step():
+    def stepBoth(building):
+        # Building.step and RoomArray.step both release the GIL
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(building.step, 1.0, 2000), executor.submit(building.zones.step, 1.0, 2000)]
+            for future in futures:
+                future.result()
+        return building.zones.temperatures
+
+    # enough zones that a building step takes longer than a time slice of the scheduler
+    for _ in range(5):
+        building = rs.Building(2000, 20.0, 30.0, room_dimensions=[100.0, 100.0, 100.0])
+        reference = rs.Building(2000, 20.0, 30.0, room_dimensions=[100.0, 100.0, 100.0])
+        reference.step(1.0, 2000)
+        reference.zones.step(1.0, 2000)
+        # neither step overwrites the temperatures the other one wrote
+        assert stepBoth(building) == pytest.approx(reference.zones.temperatures, abs=1e-2)
+
+def test_Building_invalid_connections():
+    building = rs.Building(2)
+    with pytest.raises(IndexError):
+        building.connect(0, 2, 10.0)
+    with pytest.raises(ValueError):
+        building.connect(1, 1, 10.0)
+    with pytest.raises(ValueError):
+        building.addWall(0, 1, area=-1.0)
+
+def test_recording():
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    assert not room.isRecording()
+    with pytest.raises(RuntimeError):
+        room.getRecording()
+    room.enableRecording(capacity=100)
+    room.activateHeater(True)
+    room.advance(1.0, steps=10)
+    samples = room.getRecording()
+    assert len(samples) == 10 == room.getRecordedCount()
+    assert list(samples["time"]) == [float(t) for t in range(1, 11)]
+    assert samples["temperature"][-1] == room.advance(0)
+    assert all(samples["heater_active"]) and not any(samples["cooler_active"])
+    assert all(samples["power"] == 1000.0)
+    # the recording is a view on the recorder and can not be changed
+    with pytest.raises(ValueError):
+        samples["temperature"][0] = 0.0
+
+def test_recording_keeps_newest_samples():
+    room = Room(25.0, 30.0, 50.0, [10.0, 10.0, 2.0], clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    room.enableRecording(capacity=5)
+    trajectory = room.trajectory(delta_time=2.0, steps=12)
+    samples = room.getRecording()
+    assert room.getRecordedCount() == 12
+    assert list(samples["time"]) == [16.0, 18.0, 20.0, 22.0, 24.0]
+    assert list(samples["temperature"]) == list(trajectory[-5:])
+    room.disableRecording()
+    assert not room.isRecording()
+    assert list(samples["time"]) == [16.0, 18.0, 20.0, 22.0, 24.0]
+
+
+def read_noisy_room(stream):
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(clock=clock)
+    room.setOutsideTemperature(25.0)
+    room.setSensorNoise(max_offset=0.5, jitter=0.2, resolution=rs.DHT22_RESOLUTION)
+    room.seedSensorNoise(seed=42, stream=stream)
+    readings = []
+    for _ in range(50):
+        clock.advance(2.0)
+        readings.append(room.getTemperature())
+    return readings
+
+def test_sensor_noise_streams():
+    # every room gets its own offset
+    offsets = [Room().getSensorOffsets() for _ in range(10)]
+    assert len(set(inside for inside, outside in offsets)) == 10
+    assert all(abs(inside) <= 0.5 and abs(outside) <= 0.5 for inside, outside in offsets)
+
+    # the readings only depend on the seed and stream, not on the thread or order the rooms run in
+    expected = [read_noisy_room(stream) for stream in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(read_noisy_room, reversed(range(8)))) == expected[::-1]
+    assert expected[0] != expected[1]
+
+def test_sensor_noise_jitter_and_resolution():
+    readings = read_noisy_room(0)
+    assert len(set(readings)) > 1
+    assert all(round(reading * 10) == pytest.approx(reading * 10, abs=1e-3) for reading in readings)
+
+    # the sensor keeps its reading until the next DHT22 interval
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(clock=clock)
+    room.setSensorNoise(max_offset=0.0, jitter=1.0)
+    assert room.getSensorOffsets() == [0.0, 0.0]
+    clock.advance(2.0)
+    assert room.getTemperature() == room.getTemperature()
+
+    with pytest.raises(ValueError):
+        room.setSensorNoise(jitter=-1.0)
+
+
+def test_Controller_matches_python_controller():
+    import control
+    controller = rs.Controller(Room(), target_temperature=20.0, temp_threshold=0.5, lux_threshold=10000.0)
+    for active in [False, True]:
+        controller.setActiveTempControl(active)
+        for inside in [18.0, 19.6, 19.8, 20.0, 20.2, 20.4, 22.0]:
+            for outside in [15.0, 25.0]:
+                for states in [(False, False, False), (True, False, True), (False, True, False)]:
+                    for lux in [5000.0, 20000.0]:
+                        assert list(controller.generateCommands(inside, outside, *states, lux)) == \
+                            control.generateCommands(inside, outside, 20.0, 0.5, *states, active, lux, 10000.0)
+
+def test_Controller_run():
+    import headless
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(temperature=25.0, outside_temperature=30.0, humidity=20.0, room_dimensions=[10, 10, 2], clock=clock)
+    room.setIntegrationMode(rs.IntegrationMode.EXACT)
+    room.seedSensorNoise(1, 0)
+    controller = rs.Controller(room)
+    log = controller.run(poll_interval=1.0, polls=3 * 3600)
+
+    # the same switches as the Python loop of the headless runner
+    summary = headless.runScenario({"duration": 3 * 3600.0})
+    assert len(log) == summary["switch_count"]
+    assert clock.now() == 3 * 3600.0
+    assert log.dtype.names == ("time", "relay", "state", "temperature")
+    assert log["time"][0] == 1.0 and log["relay"][0] == int(rs.Relay.COOLER) and log["state"][0] == 1
+    assert (log["time"][1:] >= log["time"][:-1]).all()
+    # the room is left in the state of the last switch of every relay
+    assert bool(log["state"][log["relay"] == int(rs.Relay.COOLER)][-1]) == room.isCoolerActive()
+
+    with pytest.raises(ValueError):
+        controller.run(poll_interval=0.0, polls=10)
+    with pytest.raises(ValueError):
+        controller.setTempThreshold(0.0)
+
+
+def test_stats_count_calls_and_events():
+    clock = rs.SimClock(rs.ClockMode.VIRTUAL)
+    room = Room(clock=clock)
+    board = rs.mockArduino(3, room)
+    board.set_pin_mode(0, 7, 1) # DHT22_1
+    rs.reset_stats()
+    room.getTemperature() # the first reading is within 2 seconds of the creation of the room
+    clock.advance(5.0)
+    board.get_pin_data(0, 7)
+    room.advance(1.0, 3)
+    board.write_Relay_Heater(True)
+    room.activateCooler(True)
+
+    stats = rs.stats()
+    assert stats["timing"] == False
+    assert stats["counters"] == {"integration_steps": 4, "dht_rejected_reads": 1, "relay_writes": 2}
+    assert stats["methods"]["Room.getTemperature"]["calls"] == 2
+    assert stats["methods"]["mockArduino.get_pin_data"]["calls"] == 1
+    assert stats["methods"]["mockArduino.read_DHT22_1"]["calls"] == 1
+    assert stats["methods"]["Room.advance"]["calls"] == 1
+    # without timing only the calls are counted
+    assert stats["methods"]["Room.getTemperature"]["timed_calls"] == 0
+    assert stats["methods"]["Room.getTemperature"]["total_ns"] == 0
+    assert stats["methods"]["Room.getTemperature"]["min_ns"] is None
+    assert stats["methods"]["Room.getTemperature"]["max_ns"] == 0
+
+    rs.reset_stats()
+    assert rs.stats()["counters"]["integration_steps"] == 0
+    assert rs.stats()["methods"]["Room.getTemperature"] == {"calls": 0, "timed_calls": 0, "total_ns": 0, "min_ns": None, "max_ns": 0}
+
+def test_stats_timing():
+    room = Room(clock=rs.SimClock(rs.ClockMode.VIRTUAL))
+    rs.reset_stats()
+    rs.set_stats_timing(True)
+    try:
+        room.trajectory(1.0, 1000)
+        room.trajectory(1.0, 10)
+    finally:
+        rs.set_stats_timing(False)
+    trajectory = rs.stats()["methods"]["Room.trajectory"]
+    assert trajectory["calls"] == trajectory["timed_calls"] == 2
+    assert 0 < trajectory["min_ns"] <= trajectory["max_ns"] <= trajectory["total_ns"]
+    assert rs.stats()["counters"]["integration_steps"] == 1010
+
 
 if __name__ == "__main__":
     
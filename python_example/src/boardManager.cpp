@@ -0,0 +1,265 @@
+// boardManager.cpp
+#include "boardManager.h"
+#include <cmath>
+#include <limits>
+
+// Function: indexOf
+// Arguments: port (int) - the port of a board
+// summary: expects the caller to hold the mutex
+// Return Type: size_t - the index of the board in boards and in the arrays of the bulk operations
+size_t BoardManager::indexOf(int port) {
+    auto index = this->indices.find(port);
+    if (index == this->indices.end()) {
+        throw std::out_of_range("Invalid port. No board is connected to port " + std::to_string(port) + ".");
+    }
+    return index->second;
+}
+
+// Function: findTemplate
+// Arguments: name (std::string) - the name of a pin template
+// summary: expects the caller to hold the mutex
+// Return Type: const std::vector<PinDefinition>& - the parsed pin definitions of the template
+const std::vector<PinDefinition>& BoardManager::findTemplate(const std::string& name) {
+    auto pins = this->templates.find(name);
+    if (pins == this->templates.end()) {
+        throw std::out_of_range("Invalid template. No pin template is called '" + name + "'.");
+    }
+    return pins->second;
+}
+
+// Function: addTemplate
+// Arguments: name (std::string) - the name of the template, an existing template with the name is replaced
+//            pin_defs (std::vector<std::string>) - pin definitions in the pyfirmata format, e.g. "d:7:DHT22_1"
+// summary: the definitions are parsed and checked on a board without a room, so applying the template
+//          to a board can't fail halfway
+// Return Type: void
+void BoardManager::addTemplate(const std::string& name, const std::vector<std::string>& pin_defs) {
+    std::vector<PinDefinition> pins;
+    pins.reserve(pin_defs.size());
+    for (const std::string& pin_def : pin_defs) {
+        pins.push_back(mockArduino::parse_pin_def(pin_def));
+    }
+    mockArduino check(0, nullptr);
+    check.apply_pins(pins);
+
+    std::lock_guard<std::mutex> lock(mutex);
+    this->templates[name] = std::move(pins);
+}
+
+// Function: getTemplateNames
+// Arguments: None
+// Return Type: std::vector<std::string> - the names of the pin templates in alphabetical order
+std::vector<std::string> BoardManager::getTemplateNames() {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::vector<std::string> names;
+    for (const auto& pins : this->templates) {
+        names.push_back(pins.first);
+    }
+    return names;
+}
+
+// Function: addBoard
+// Arguments: port (int) - the port of the new board
+//            room (Room*) - the room the sensors and relays of the board are connected to
+//            template_name (std::string) - the pin template of the board, no pins are configured when empty
+// summary: a board from the pool is reused when there is one, the board is added after the existing boards
+// Return Type: std::shared_ptr<mockArduino> - the new board
+std::shared_ptr<mockArduino> BoardManager::addBoard(int port, Room* room, const std::string& template_name) {
+    if (room == nullptr) {
+        throw std::invalid_argument("Invalid room. Expected a room object.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    if (this->indices.count(port) > 0) {
+        throw std::invalid_argument("Invalid port. A board is already connected to port " + std::to_string(port) + ".");
+    }
+    const std::vector<PinDefinition>* pins = template_name.empty() ? nullptr : &this->findTemplate(template_name);
+
+    std::shared_ptr<mockArduino> board;
+    if (this->pool.empty()) {
+        board = std::make_shared<mockArduino>(port, room);
+    } else {
+        board = std::move(this->pool.back());
+        this->pool.pop_back();
+        board->reset(port, room);
+    }
+    if (pins != nullptr) {
+        board->apply_pins(*pins);
+    }
+    this->indices[port] = this->boards.size();
+    this->boards.push_back(board);
+    return board;
+}
+
+// Function: removeBoard
+// Arguments: port (int) - the port of the board
+// summary: the last board takes the place of the removed board in the order of getPorts(),
+//          the removed board goes to the pool and is reset when it is reused, unless it is still held
+//          elsewhere, then it stays with its holder and keeps its port and room
+// Return Type: void
+void BoardManager::removeBoard(int port) {
+    std::lock_guard<std::mutex> lock(mutex);
+    size_t index = this->indexOf(port);
+    if (this->boards[index].use_count() == 1) {
+        this->pool.push_back(std::move(this->boards[index]));
+    }
+    if (index != this->boards.size() - 1) {
+        this->boards[index] = std::move(this->boards.back());
+        this->indices[this->boards[index]->get_com_Port()] = index;
+    }
+    this->boards.pop_back();
+    this->indices.erase(port);
+}
+
+// Function: applyTemplate
+// Arguments: port (int) - the port of the board
+//            template_name (std::string) - the pin template, its pins are set on top of the current pin modes
+// Return Type: void
+void BoardManager::applyTemplate(int port, const std::string& template_name) {
+    std::lock_guard<std::mutex> lock(mutex);
+    this->boards[this->indexOf(port)]->apply_pins(this->findTemplate(template_name));
+}
+
+// Function: getBoard
+// Arguments: port (int) - the port of the board
+// Return Type: std::shared_ptr<mockArduino> - the board
+std::shared_ptr<mockArduino> BoardManager::getBoard(int port) {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->boards[this->indexOf(port)];
+}
+
+// Function: hasBoard
+// Arguments: port (int) - a port
+// Return Type: bool - true when a board is connected to the port
+bool BoardManager::hasBoard(int port) {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->indices.count(port) > 0;
+}
+
+// Function: getBoardCount
+// Arguments: None
+// Return Type: size_t - the number of connected boards
+size_t BoardManager::getBoardCount() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->boards.size();
+}
+
+// Function: getPoolSize
+// Arguments: None
+// Return Type: size_t - the number of removed boards that wait to be reused
+size_t BoardManager::getPoolSize() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->pool.size();
+}
+
+// Function: getPorts
+// Arguments: None
+// Return Type: std::vector<int> - the port of every board in the order of the bulk operations
+std::vector<int> BoardManager::getPorts() {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::vector<int> ports;
+    ports.reserve(this->boards.size());
+    for (const auto& board : this->boards) {
+        ports.push_back(board->get_com_Port());
+    }
+    return ports;
+}
+
+// Function: readDHT22
+// Arguments: pin_mode (int) - DHT22_1 for the inside sensors or DHT22_2 for the outside sensors
+// summary: reads the sensor of every board like read_DHT22_1 and read_DHT22_2, boards without the sensor read NaN
+// Return Type: std::vector<double> - temperature and humidity of every board after each other
+std::vector<double> BoardManager::readDHT22(int pin_mode) {
+    if (pin_mode != DHT22_1 && pin_mode != DHT22_2) {
+        throw std::invalid_argument("Invalid pin mode. Expected 1 for DHT22_1 or 2 for DHT22_2.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    std::vector<double> values(2 * this->boards.size(), std::numeric_limits<double>::quiet_NaN());
+    for (size_t i = 0; i < this->boards.size(); i++) {
+        mockArduino& board = *this->boards[i];
+        if (board.has_pin_mode(pin_mode)) {
+            Room* room = board.get_room();
+            values[2 * i] = pin_mode == DHT22_1 ? room->getTemperature() : room->getOutsideTemperature();
+            values[2 * i + 1] = room->getHumidity();
+        }
+    }
+    return values;
+}
+
+// Function: readLDR
+// Arguments: None
+// summary: reads the LDR of every board with the LDR calibration of the board, boards without an LDR read -1
+// Return Type: std::vector<int32_t> - the LDR value of every board
+std::vector<int32_t> BoardManager::readLDR() {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::vector<int32_t> values(this->boards.size(), -1);
+    for (size_t i = 0; i < this->boards.size(); i++) {
+        if (this->boards[i]->has_pin_mode(LDR)) {
+            values[i] = this->boards[i]->read_LDR();
+        }
+    }
+    return values;
+}
+
+// Function: readRelays
+// Arguments: None
+// summary: relays without a configured pin read off
+// Return Type: std::vector<uint8_t> - heater, cooler and sunscreen state of every board after each other
+std::vector<uint8_t> BoardManager::readRelays() {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::vector<uint8_t> states(3 * this->boards.size(), 0);
+    for (size_t i = 0; i < this->boards.size(); i++) {
+        mockArduino& board = *this->boards[i];
+        states[3 * i] = board.has_pin_mode(RELAY_HEATER) && board.read_Relay_Heater();
+        states[3 * i + 1] = board.has_pin_mode(RELAY_COOLER) && board.read_Relay_Cooler();
+        states[3 * i + 2] = board.has_pin_mode(RELAY_SUNSCREEN) && board.read_Relay_Sunscreen();
+    }
+    return states;
+}
+
+// Function: writeRelays
+// Arguments: heaters, coolers, sunscreens (const uint8_t*) - the new relay state of every board
+//            size (size_t) - the number of states in each array
+// summary: relays without a configured pin are skipped, like a write to a pin that isn't connected
+// Return Type: void
+void BoardManager::writeRelays(const uint8_t* heaters, const uint8_t* coolers, const uint8_t* sunscreens, size_t size) {
+    std::lock_guard<std::mutex> lock(mutex);
+    if (size != this->boards.size()) {
+        throw std::invalid_argument("Invalid number of relay states. Expected one per board, " + std::to_string(this->boards.size()) + ".");
+    }
+    for (size_t i = 0; i < size; i++) {
+        mockArduino& board = *this->boards[i];
+        if (board.has_pin_mode(RELAY_HEATER)) {
+            board.write_Relay_Heater(heaters[i] != 0);
+        }
+        if (board.has_pin_mode(RELAY_COOLER)) {
+            board.write_Relay_Cooler(coolers[i] != 0);
+        }
+        if (board.has_pin_mode(RELAY_SUNSCREEN)) {
+            board.write_Relay_Sunscreen(sunscreens[i] != 0);
+        }
+    }
+}
+
+// Function: readAll
+// Arguments: None
+// summary: reads every configured sensor and relay of every board like mockArduino::read_all
+// Return Type: std::vector<BoardReading> - the values of every board
+std::vector<BoardReading> BoardManager::readAll() {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::vector<BoardReading> readings(this->boards.size());
+    for (size_t i = 0; i < this->boards.size(); i++) {
+        BoardSnapshot snapshot = this->boards[i]->read_all();
+        BoardReading& reading = readings[i];
+        double nan = std::numeric_limits<double>::quiet_NaN();
+        reading.port = this->boards[i]->get_com_Port();
+        reading.inside_temperature = snapshot.has_DHT22_1 ? snapshot.inside_temperature : nan;
+        reading.inside_humidity = snapshot.has_DHT22_1 ? snapshot.inside_humidity : nan;
+        reading.outside_temperature = snapshot.has_DHT22_2 ? snapshot.outside_temperature : nan;
+        reading.outside_humidity = snapshot.has_DHT22_2 ? snapshot.outside_humidity : nan;
+        reading.light_level = snapshot.has_LDR ? snapshot.light_level : -1;
+        reading.heater_active = snapshot.heater_active;
+        reading.cooler_active = snapshot.cooler_active;
+        reading.sunscreen_active = snapshot.sunscreen_active;
+    }
+    return readings;
+}
@@ -0,0 +1,67 @@
+// boardManager.h
+#pragma once
+
+#include <cstdint>
+#include <cstddef>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include <stdexcept>
+#include "mockArduino.h"
+
+// values of one board in a bulk read of a BoardManager, sensors without a configured pin read NaN
+// and the LDR reads -1, relays without a configured pin read off
+struct BoardReading {
+    int32_t port;
+    double inside_temperature;
+    double inside_humidity;
+    double outside_temperature;
+    double outside_humidity;
+    int32_t light_level;
+    uint8_t heater_active;
+    uint8_t cooler_active;
+    uint8_t sunscreen_active;
+};
+
+// Many mockArduino boards in one process, addressed by their port. Pin configurations are stored
+// as named templates that are parsed and checked once and then applied to any number of boards.
+// Removed boards that nothing else holds are kept in a pool and reused by the next board that is added,
+// so a building controller that reconnects its boards doesn't allocate them again. A board that is still
+// held, e.g. by a python handle, is left to its holder and never reused. The bulk reads and writes
+// handle every board in one call, the arrays follow the order of getPorts().
+class BoardManager {
+private:
+    // guards the boards and templates, the bulk operations hold it for the whole call
+    std::mutex mutex;
+    std::vector<std::shared_ptr<mockArduino>> boards;
+    std::unordered_map<int, size_t> indices; // port: index in boards
+    std::vector<std::shared_ptr<mockArduino>> pool; // boards only the pool holds
+    std::map<std::string, std::vector<PinDefinition>> templates;
+
+    size_t indexOf(int port);
+    const std::vector<PinDefinition>& findTemplate(const std::string& name);
+
+public:
+    BoardManager() {}
+
+    void addTemplate(const std::string& name, const std::vector<std::string>& pin_defs);
+    std::vector<std::string> getTemplateNames();
+
+    std::shared_ptr<mockArduino> addBoard(int port, Room* room, const std::string& template_name = "");
+    void removeBoard(int port);
+    void applyTemplate(int port, const std::string& template_name);
+    std::shared_ptr<mockArduino> getBoard(int port);
+    bool hasBoard(int port);
+    size_t getBoardCount();
+    size_t getPoolSize();
+    std::vector<int> getPorts();
+
+    std::vector<double> readDHT22(int pin_mode);
+    std::vector<int32_t> readLDR();
+    std::vector<uint8_t> readRelays();
+    void writeRelays(const uint8_t* heaters, const uint8_t* coolers, const uint8_t* sunscreens, size_t size);
+    std::vector<BoardReading> readAll();
+};
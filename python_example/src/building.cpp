@@ -0,0 +1,243 @@
+// building.cpp
+#include "building.h"
+#include <algorithm>
+#include <string>
+
+// Function: Building constructor
+// Arguments: zone_count (size_t) - the number of zones (rooms) in the building
+//            temperature (float) - the starting temperature of every zone
+//            outside_temperature (float) - the starting outside temperature of every zone
+//            room_dimensions (std::vector<float>) - width, length and height of every zone
+// Return Type: Building class object
+Building::Building(size_t zone_count, float temperature, float outside_temperature, std::vector<float> room_dimensions)
+    : zones(zone_count, temperature, outside_temperature, room_dimensions) {
+    this->network_changed = true;
+    this->tolerance = 1e-9;
+    this->max_iterations = 100;
+    this->last_iterations = 0;
+}
+
+// Function: connect
+// Arguments: zone_a (size_t) - index of the first zone
+//            zone_b (size_t) - index of the second zone
+//            conductance (double) - heat flow between the zones per degree of temperature difference (W/K)
+// summary: adds a shared wall, door or any other heat path between two zones,
+//          connecting the same zones twice adds the conductances together
+// Return Type: void
+void Building::connect(size_t zone_a, size_t zone_b, double conductance) {
+    if (zone_a >= this->getZoneCount() || zone_b >= this->getZoneCount()) {
+        throw std::out_of_range("Invalid zone index. Expected a value below " + std::to_string(this->getZoneCount()) + ".");
+    }
+    if (zone_a == zone_b) {
+        throw std::invalid_argument("Invalid connection. A zone can not be connected to itself.");
+    }
+    if (conductance < 0.0) {
+        throw std::invalid_argument("Invalid conductance value. Expected a non-negative value.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->connection_from.push_back(zone_a);
+    this->connection_to.push_back(zone_b);
+    this->connection_conductance.push_back(conductance);
+    this->network_changed = true;
+}
+
+// Function: addWall
+// Arguments: zone_a (size_t) - index of the first zone
+//            zone_b (size_t) - index of the second zone
+//            area (double) - surface of the shared wall (m^2)
+//            thermal_conductivity (double) - thermal conductivity of the wall material (W/m*K)
+//            thickness (double) - thickness of the wall (m)
+// summary: connects two zones with the same wall model as Room::calculateHeatExchange
+// Return Type: void
+void Building::addWall(size_t zone_a, size_t zone_b, double area, double thermal_conductivity, double thickness) {
+    if (area < 0.0 || thermal_conductivity < 0.0 || thickness <= 0.0) {
+        throw std::invalid_argument("Invalid wall. Expected a non-negative area and conductivity and a thickness above 0.");
+    }
+    this->connect(zone_a, zone_b, area * thermal_conductivity / thickness);
+}
+
+// Function: setTolerance
+// Arguments: tolerance (double) - relative residual at which the solver stops
+//            max_iterations (int) - the maximum number of solver iterations per step
+// Return Type: void
+void Building::setTolerance(double tolerance, int max_iterations) {
+    if (tolerance <= 0.0 || max_iterations <= 0) {
+        throw std::invalid_argument("Invalid solver settings. Expected a tolerance and number of iterations above 0.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->tolerance = tolerance;
+    this->max_iterations = max_iterations;
+}
+
+// Function: buildNetwork
+// Arguments: None
+// summary: converts the list of connections to CSR rows, every connection is stored in the row of both zones
+// Return Type: void
+void Building::buildNetwork() {
+    size_t zone_count = this->getZoneCount();
+    this->row_start.assign(zone_count + 1, 0);
+    for (size_t i = 0; i < this->connection_conductance.size(); i++) {
+        this->row_start[this->connection_from[i] + 1]++;
+        this->row_start[this->connection_to[i] + 1]++;
+    }
+    for (size_t zone = 0; zone < zone_count; zone++) {
+        this->row_start[zone + 1] += this->row_start[zone];
+    }
+
+    std::vector<size_t> next(this->row_start.begin(), this->row_start.end() - 1);
+    this->column_index.assign(this->row_start[zone_count], 0);
+    this->conductance.assign(this->row_start[zone_count], 0.0);
+    for (size_t i = 0; i < this->connection_conductance.size(); i++) {
+        size_t a = this->connection_from[i];
+        size_t b = this->connection_to[i];
+        this->column_index[next[a]] = b;
+        this->conductance[next[a]++] = this->connection_conductance[i];
+        this->column_index[next[b]] = a;
+        this->conductance[next[b]++] = this->connection_conductance[i];
+    }
+
+    this->diagonal.assign(zone_count, 0.0);
+    this->rhs.assign(zone_count, 0.0);
+    this->solution.assign(zone_count, 0.0);
+    this->residual.assign(zone_count, 0.0);
+    this->preconditioned.assign(zone_count, 0.0);
+    this->direction.assign(zone_count, 0.0);
+    this->matrix_direction.assign(zone_count, 0.0);
+    this->network_changed = false;
+}
+
+// Function: multiply
+// Arguments: vector (std::vector<double>) - the vector to multiply with the system matrix
+//            result (std::vector<double>) - receives the product
+// summary: the system matrix is the diagonal minus the conductances to the neighbouring zones
+// Return Type: void
+void Building::multiply(const std::vector<double>& vector, std::vector<double>& result) {
+    size_t zone_count = this->getZoneCount();
+    for (size_t zone = 0; zone < zone_count; zone++) {
+        double sum = this->diagonal[zone] * vector[zone];
+        for (size_t i = this->row_start[zone]; i < this->row_start[zone + 1]; i++) {
+            sum -= this->conductance[i] * vector[this->column_index[i]];
+        }
+        result[zone] = sum;
+    }
+}
+
+// Function: solve
+// Arguments: None
+// summary: solves the system matrix * solution = rhs with the Jacobi preconditioned conjugate gradient method,
+//          the matrix is symmetric and diagonally dominant so this converges in a few iterations
+//          the current value of solution is used as the starting point
+// Return Type: int - the number of iterations used
+int Building::solve() {
+    size_t zone_count = this->getZoneCount();
+
+    this->multiply(this->solution, this->residual);
+    double rhs_norm = 0.0;
+    double residual_norm = 0.0;
+    for (size_t zone = 0; zone < zone_count; zone++) {
+        this->residual[zone] = this->rhs[zone] - this->residual[zone];
+        rhs_norm += this->rhs[zone] * this->rhs[zone];
+        residual_norm += this->residual[zone] * this->residual[zone];
+    }
+    double stop_norm = this->tolerance * this->tolerance * rhs_norm;
+    if (residual_norm <= stop_norm) {
+        return 0;
+    }
+
+    double residual_dot = 0.0;
+    for (size_t zone = 0; zone < zone_count; zone++) {
+        this->direction[zone] = this->residual[zone] / this->diagonal[zone];
+        residual_dot += this->residual[zone] * this->direction[zone];
+    }
+
+    for (int iteration = 1; iteration <= this->max_iterations; iteration++) {
+        this->multiply(this->direction, this->matrix_direction);
+        double direction_dot = 0.0;
+        for (size_t zone = 0; zone < zone_count; zone++) {
+            direction_dot += this->direction[zone] * this->matrix_direction[zone];
+        }
+        double step_size = residual_dot / direction_dot;
+
+        residual_norm = 0.0;
+        for (size_t zone = 0; zone < zone_count; zone++) {
+            this->solution[zone] += step_size * this->direction[zone];
+            this->residual[zone] -= step_size * this->matrix_direction[zone];
+            residual_norm += this->residual[zone] * this->residual[zone];
+        }
+        if (residual_norm <= stop_norm) {
+            return iteration;
+        }
+
+        double new_residual_dot = 0.0;
+        for (size_t zone = 0; zone < zone_count; zone++) {
+            this->preconditioned[zone] = this->residual[zone] / this->diagonal[zone];
+            new_residual_dot += this->residual[zone] * this->preconditioned[zone];
+        }
+        double direction_scale = new_residual_dot / residual_dot;
+        residual_dot = new_residual_dot;
+        for (size_t zone = 0; zone < zone_count; zone++) {
+            this->direction[zone] = this->preconditioned[zone] + direction_scale * this->direction[zone];
+        }
+    }
+    return this->max_iterations;
+}
+
+// Function: step
+// Arguments: delta_time (double) - the time per step in seconds
+//            steps (int) - the number of steps to simulate
+// summary: integrates all zones together with an implicit (backward) Euler step, which is stable for any time step
+//          (C/dt + k + sum(g)) * T_new - sum(g * T_neighbour_new) = C/dt * T + P + k * T_outside
+// Return Type: void
+void Building::step(double delta_time, int steps) {
+    if (delta_time < 0.0 || steps < 0) {
+        throw std::invalid_argument("Invalid time step. Expected a non-negative time and number of steps.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    if (delta_time == 0.0 || steps == 0) {
+        return;
+    }
+    // the zones are also reachable through getZones(), a RoomArray::step on another thread waits for this step
+    std::lock_guard<std::mutex> zones_lock(this->zones.getMutex());
+    if (this->network_changed) {
+        this->buildNetwork();
+    }
+
+    size_t zone_count = this->getZoneCount();
+    float* temperatures = this->zones.temperatureData();
+    const float* outside_temperatures = this->zones.outsideTemperatureData();
+    const float* heater_powers = this->zones.heaterPowerData();
+    const float* cooler_powers = this->zones.coolerPowerData();
+    const float* volumes = this->zones.volumeData();
+    const float* surface_areas = this->zones.surfaceAreaData();
+    const uint8_t* heaters_active = this->zones.heaterActiveData();
+    const uint8_t* coolers_active = this->zones.coolerActiveData();
+
+    // the parts of the system that do not change between steps
+    std::vector<double> capacity_per_step(zone_count);
+    std::vector<double> constant_heat(zone_count);
+    for (size_t zone = 0; zone < zone_count; zone++) {
+        double outside_conductance = surface_areas[zone] * THERMAL_CONDUCTIVITY_BRICK / THICKNESS_BRICK;
+        double power = (heaters_active[zone] * heater_powers[zone]) - (coolers_active[zone] * cooler_powers[zone]);
+        capacity_per_step[zone] = volumes[zone] * AIR_DENSITY * SPECIFIC_HEAT_AIR / delta_time;
+        constant_heat[zone] = power + outside_conductance * outside_temperatures[zone];
+
+        double neighbour_conductance = 0.0;
+        for (size_t i = this->row_start[zone]; i < this->row_start[zone + 1]; i++) {
+            neighbour_conductance += this->conductance[i];
+        }
+        this->diagonal[zone] = capacity_per_step[zone] + outside_conductance + neighbour_conductance;
+        this->solution[zone] = temperatures[zone];
+    }
+
+    this->last_iterations = 0;
+    for (int step = 0; step < steps; step++) {
+        for (size_t zone = 0; zone < zone_count; zone++) {
+            this->rhs[zone] = capacity_per_step[zone] * this->solution[zone] + constant_heat[zone];
+        }
+        this->last_iterations = std::max(this->last_iterations, this->solve());
+    }
+
+    for (size_t zone = 0; zone < zone_count; zone++) {
+        temperatures[zone] = static_cast<float>(this->solution[zone]);
+    }
+}
@@ -0,0 +1,54 @@
+// building.h
+#pragma once
+
+#include <cstddef>
+#include <mutex>
+#include <vector>
+#include <stdexcept>
+#include "roomArray.h"
+
+// A thermal network of zones, every zone exchanges heat with its own outside temperature
+// like a Room and with the zones it shares a wall or door with
+class Building {
+private:
+    RoomArray zones;
+
+    // connections as they are added, converted to a CSR matrix on the next step
+    std::vector<size_t> connection_from;
+    std::vector<size_t> connection_to;
+    std::vector<double> connection_conductance;
+    bool network_changed;
+
+    // CSR storage of the conductances between zones (W/K), both directions are stored
+    std::vector<size_t> row_start;
+    std::vector<size_t> column_index;
+    std::vector<double> conductance;
+
+    // solver settings and work arrays
+    double tolerance;
+    int max_iterations;
+    int last_iterations;
+    std::vector<double> diagonal, rhs, solution, residual, preconditioned, direction, matrix_direction;
+
+    std::mutex mutex;
+
+    // the functions below expect the caller to hold the mutex
+    void buildNetwork();
+    void multiply(const std::vector<double>& vector, std::vector<double>& result);
+    int solve();
+
+public:
+    Building(size_t zone_count, float temperature = 25.0, float outside_temperature = 30.0, std::vector<float> room_dimensions = {10.0, 10.0, 2.0});
+
+    RoomArray& getZones() { return zones; }
+    size_t getZoneCount() { return zones.getSize(); }
+    size_t getConnectionCount() { std::lock_guard<std::mutex> lock(mutex); return connection_conductance.size(); }
+
+    void connect(size_t zone_a, size_t zone_b, double conductance);
+    void addWall(size_t zone_a, size_t zone_b, double area, double thermal_conductivity = THERMAL_CONDUCTIVITY_BRICK, double thickness = THICKNESS_BRICK);
+
+    void setTolerance(double tolerance, int max_iterations = 100);
+    int getLastIterations() { std::lock_guard<std::mutex> lock(mutex); return last_iterations; }
+
+    void step(double delta_time, int steps = 1);
+};
@@ -0,0 +1,113 @@
+// controller.cpp
+#include "controller.h"
+
+// Function: Controller constructor
+// Arguments: room (Room*) - the room to control
+//            target_temperature (double) - the desired temperature inside the room
+//            temp_threshold (double) - the acceptable range of temperatures around the target temperature
+//            lux_threshold (double) - the light level at which the sunscreen is closed
+//            active_temp_control (bool) - heat or cool even when the outside temperature works against it
+// Return Type: Controller class object
+Controller::Controller(Room* room, double target_temperature, double temp_threshold, double lux_threshold, bool active_temp_control) {
+    if (room == nullptr) {
+        throw std::invalid_argument("Invalid room. Expected a Room object.");
+    }
+    if (temp_threshold <= 0.0 || lux_threshold <= 0.0) {
+        throw std::invalid_argument("Invalid threshold. Expected a temperature and lux threshold above 0.");
+    }
+    this->room = room;
+    this->target_temperature = target_temperature;
+    this->temp_threshold = temp_threshold;
+    this->lux_threshold = lux_threshold;
+    this->active_temp_control = active_temp_control;
+    this->ldr_calibration = LDRCalibration::get();
+}
+
+void Controller::setTempThreshold(double temp_threshold) {
+    if (temp_threshold <= 0.0) {
+        throw std::invalid_argument("Invalid temperature threshold. Expected a value above 0.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->temp_threshold = temp_threshold;
+}
+
+void Controller::setLuxThreshold(double lux_threshold) {
+    if (lux_threshold <= 0.0) {
+        throw std::invalid_argument("Invalid lux threshold. Expected a value above 0.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->lux_threshold = lux_threshold;
+}
+
+void Controller::setLDRCalibration(std::shared_ptr<LDRCalibration> calibration) {
+    if (!calibration) {
+        throw std::invalid_argument("Invalid LDR calibration. Expected a calibration object.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->ldr_calibration = calibration;
+}
+
+// Function: generateCommands
+// Arguments: inside_temp (double) - the measured temperature inside the room
+//            outside_temp (double) - the measured temperature outside the room
+//            heater_state, cooler_state, sunscreen_state (bool) - the current relay states
+//            lux (double) - the measured light level
+// summary: same decisions as control.generateCommands with the settings of the controller
+// Return Type: std::array<bool, 3> - the new heater, cooler and sunscreen states
+std::array<bool, 3> Controller::generateCommands(double inside_temp, double outside_temp, bool heater_state, bool cooler_state, bool sunscreen_state, double lux) {
+    std::array<bool, 3> commands = {heater_state, cooler_state, sunscreen_state};
+    commands[2] = lux > this->lux_threshold;
+
+    if (inside_temp < this->target_temperature - this->temp_threshold) {
+        // heat when the outside helps or when active temperature control is enabled
+        commands[0] = outside_temp < this->target_temperature || this->active_temp_control;
+        commands[1] = false;
+    } else if (inside_temp > this->target_temperature + this->temp_threshold) {
+        // cool when the outside helps or when active temperature control is enabled
+        commands[1] = outside_temp > this->target_temperature || this->active_temp_control;
+        commands[0] = false;
+    } else if (inside_temp >= this->target_temperature - (this->temp_threshold / 2) && heater_state) {
+        commands[0] = false;
+    } else if (inside_temp <= this->target_temperature + (this->temp_threshold / 2) && cooler_state) {
+        commands[1] = false;
+    }
+    return commands;
+}
+
+// Function: run
+// Arguments: poll_interval (double) - simulated seconds between two polls
+//            polls (int) - the number of polls to run
+// summary: moves the clock of the room forward by poll_interval, reads the sensors, and switches the
+//          relays that change, the same loop as the headless runner but without any Python calls
+// Return Type: std::vector<SwitchEvent> - every relay switch of the run
+std::vector<SwitchEvent> Controller::run(double poll_interval, int polls) {
+    if (poll_interval <= 0.0 || polls < 0) {
+        throw std::invalid_argument("Invalid run. Expected a poll interval above 0 and a non-negative number of polls.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    std::shared_ptr<SimClock> clock = this->room->getClock();
+    std::vector<SwitchEvent> log;
+
+    std::array<bool, 3> states = {this->room->isHeaterActive(), this->room->isCoolerActive(), this->room->isSunscreenActive()};
+    for (int poll = 0; poll < polls; poll++) {
+        clock->advance(poll_interval);
+        float inside_temp = this->room->getTemperature();
+        float outside_temp = this->room->getOutsideTemperature();
+        double lux = this->ldr_calibration->adcToLux(this->ldr_calibration->luxToADC(this->room->getLightLevelLux()));
+
+        std::array<bool, 3> commands = this->generateCommands(inside_temp, outside_temp, states[0], states[1], states[2], lux);
+        for (uint8_t relay = 0; relay < 3; relay++) {
+            if (commands[relay] == states[relay]) {
+                continue;
+            }
+            switch (static_cast<Relay>(relay)) {
+                case Relay::HEATER: this->room->activateHeater(commands[relay]); break;
+                case Relay::COOLER: this->room->activateCooler(commands[relay]); break;
+                case Relay::SUNSCREEN: this->room->activateSunscreen(commands[relay]); break;
+            }
+            states[relay] = commands[relay];
+            log.push_back({clock->now(), relay, static_cast<uint8_t>(commands[relay]), inside_temp});
+        }
+    }
+    return log;
+}
@@ -0,0 +1,59 @@
+// controller.h
+#pragma once
+
+#include <array>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <vector>
+#include <stdexcept>
+#include "room.h"
+#include "ldrCalibration.h"
+
+// relays that are switched by the controller
+enum class Relay : uint8_t {
+    HEATER = 0,
+    COOLER = 1,
+    SUNSCREEN = 2
+};
+
+// one relay switch of a controller run
+struct SwitchEvent {
+    double time;       // simulated time of the room in seconds
+    uint8_t relay;     // Relay
+    uint8_t state;     // new state of the relay
+    float temperature; // measured inside temperature that caused the switch
+};
+
+// Closed loop controller with the same hysteresis logic as control.generateCommands,
+// runs the poll, decide and switch loop on a room without going through Python
+class Controller {
+private:
+    Room* room = nullptr;
+    double target_temperature;
+    double temp_threshold;
+    double lux_threshold;
+    bool active_temp_control;
+    // the light level is measured through the LDR like the MockArduino does
+    std::shared_ptr<LDRCalibration> ldr_calibration;
+    std::mutex mutex;
+
+public:
+    Controller(Room* room, double target_temperature = 20.0, double temp_threshold = 0.5, double lux_threshold = 10000.0, bool active_temp_control = false);
+
+    Room* getRoom() { return room; }
+
+    double getTargetTemperature() { std::lock_guard<std::mutex> lock(mutex); return target_temperature; }
+    void setTargetTemperature(double target_temperature) { std::lock_guard<std::mutex> lock(mutex); this->target_temperature = target_temperature; }
+    double getTempThreshold() { std::lock_guard<std::mutex> lock(mutex); return temp_threshold; }
+    void setTempThreshold(double temp_threshold);
+    double getLuxThreshold() { std::lock_guard<std::mutex> lock(mutex); return lux_threshold; }
+    void setLuxThreshold(double lux_threshold);
+    bool isActiveTempControl() { std::lock_guard<std::mutex> lock(mutex); return active_temp_control; }
+    void setActiveTempControl(bool enabled) { std::lock_guard<std::mutex> lock(mutex); this->active_temp_control = enabled; }
+    std::shared_ptr<LDRCalibration> getLDRCalibration() { std::lock_guard<std::mutex> lock(mutex); return ldr_calibration; }
+    void setLDRCalibration(std::shared_ptr<LDRCalibration> calibration);
+
+    std::array<bool, 3> generateCommands(double inside_temp, double outside_temp, bool heater_state, bool cooler_state, bool sunscreen_state, double lux);
+    std::vector<SwitchEvent> run(double poll_interval, int polls);
+};
@@ -0,0 +1,78 @@
+// ldrCalibration.cpp
+#include "ldrCalibration.h"
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <mutex>
+#include <string>
+#include <tuple>
+
+// Function: LDRCalibration constructor
+// Arguments: R10lx (double) - Light resistance at 10 lux in ohms
+//            gamma (double) - Gamma value found in the datasheet
+//            R1 (double) - Resistor R1 in ohms from the voltage divider
+//            VCC (double) - Supply voltage in volts
+//            adc_resolution (int) - number of ADC values
+// summary: the ADC reads n when (LDR voltage / VCC) * resolution >= n, which happens at
+//          LDR_R = R1 * (resolution / n - 1) and lux = 10 * (R10lx / LDR_R)^(1 / gamma),
+//          converting back uses n + 0.5 so the error is spread over both sides of the ADC step
+// Return Type: LDRCalibration class object
+LDRCalibration::LDRCalibration(double R10lx, double gamma, double R1, double VCC, int adc_resolution) {
+    if (R10lx <= 0.0 || gamma <= 0.0 || R1 <= 0.0 || VCC <= 0.0 || adc_resolution < 2) {
+        throw std::invalid_argument("Invalid LDR calibration. Expected resistances, gamma and VCC above 0 and an ADC resolution of at least 2.");
+    }
+    this->R10lx = R10lx;
+    this->gamma = gamma;
+    this->R1 = R1;
+    this->VCC = VCC;
+    this->adc_resolution = adc_resolution;
+
+    auto luxAt = [&](double adc_value) {
+        double LDR_R = R1 * (adc_resolution / adc_value - 1.0);
+        return 10.0 * std::pow(R10lx / LDR_R, 1.0 / gamma);
+    };
+    this->lux_thresholds.resize(adc_resolution);
+    this->lux_table.resize(adc_resolution);
+    this->lux_thresholds[0] = 0.0; // no light
+    for (int adc_value = 0; adc_value < adc_resolution; adc_value++) {
+        if (adc_value > 0) {
+            this->lux_thresholds[adc_value] = luxAt(adc_value);
+        }
+        this->lux_table[adc_value] = luxAt(adc_value + 0.5);
+    }
+}
+
+// Function: get
+// Arguments: see the constructor
+// Return Type: std::shared_ptr<LDRCalibration> - the calibration for the configuration, built once and shared afterwards
+std::shared_ptr<LDRCalibration> LDRCalibration::get(double R10lx, double gamma, double R1, double VCC, int adc_resolution) {
+    static std::mutex cache_mutex;
+    static std::map<std::tuple<double, double, double, double, int>, std::shared_ptr<LDRCalibration>> cache;
+
+    auto key = std::make_tuple(R10lx, gamma, R1, VCC, adc_resolution);
+    std::lock_guard<std::mutex> lock(cache_mutex);
+    auto calibration = cache.find(key);
+    if (calibration == cache.end()) {
+        calibration = cache.emplace(key, std::make_shared<LDRCalibration>(R10lx, gamma, R1, VCC, adc_resolution)).first;
+    }
+    return calibration->second;
+}
+
+// Function: luxToADC
+// Arguments: lux (double) - the light level in lux
+// Return Type: int - the ADC value of the LDR voltage divider at the light level
+int LDRCalibration::luxToADC(double lux) {
+    // the last table entry that is not above the light level
+    auto entry = std::upper_bound(this->lux_thresholds.begin() + 1, this->lux_thresholds.end(), lux);
+    return static_cast<int>(entry - this->lux_thresholds.begin()) - 1;
+}
+
+// Function: adcToLux
+// Arguments: adc_value (int) - the ADC value between 0 and the resolution - 1
+// Return Type: double - the light level in lux in the middle of the ADC value
+double LDRCalibration::adcToLux(int adc_value) {
+    if (adc_value < 0 || adc_value >= this->adc_resolution) {
+        throw std::invalid_argument("Invalid ADC value. Expected a value between 0 and " + std::to_string(this->adc_resolution - 1) + ". Got: " + std::to_string(adc_value));
+    }
+    return this->lux_table[adc_value];
+}
@@ -0,0 +1,35 @@
+// ldrCalibration.h
+#pragma once
+
+#include <memory>
+#include <vector>
+#include <stdexcept>
+
+// Lookup tables between the ADC value of the LDR voltage divider and the light level in lux,
+// built once per configuration so converting either way is an index or a binary search.
+class LDRCalibration {
+private:
+    double R10lx;       // Light resistance at 10 lux in ohms
+    double gamma;       // Gamma value found in the datasheet
+    double R1;          // Resistor R1 in ohms from the voltage divider
+    double VCC;         // Supply voltage in volts
+    int adc_resolution; // number of ADC values, 1024 for a 10-bit ADC
+    std::vector<double> lux_thresholds; // light level at which the ADC starts reading each value
+    std::vector<double> lux_table;      // light level in the middle of each ADC value
+
+public:
+    LDRCalibration(double R10lx = 15000.0, double gamma = 0.6, double R1 = 5000.0, double VCC = 5.0, int adc_resolution = 1024);
+
+    // shared table for a configuration, the table is only built the first time a configuration is used
+    static std::shared_ptr<LDRCalibration> get(double R10lx = 15000.0, double gamma = 0.6, double R1 = 5000.0, double VCC = 5.0, int adc_resolution = 1024);
+
+    double getR10lx() { return R10lx; }
+    double getGamma() { return gamma; }
+    double getR1() { return R1; }
+    double getVCC() { return VCC; }
+    int getADCResolution() { return adc_resolution; }
+    const double* tableData() { return lux_table.data(); }
+
+    int luxToADC(double lux);
+    double adcToLux(int adc_value);
+};
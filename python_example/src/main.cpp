@@ -2,8 +2,17 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
+#include <unordered_map>
+#include "simClock.h"
 #include "room.h"
+#include "roomArray.h"
+#include "building.h"
+#include "ldrCalibration.h"
+#include "controller.h"
 #include "mockArduino.h"
+#include "boardManager.h"
+#include "runtimeStats.h"
 
 #define STRINGIFY(x) #x
 #define MACRO_STRINGIFY(x) STRINGIFY(x)
@@ -11,14 +20,132 @@
 
 namespace py = pybind11;
 
+// Function: array_view
+// Arguments: owner (py::object) - the python object that owns the memory, kept alive by the view
+//            data (T*) - pointer to the first element
+//            size (size_t) - the number of elements
+// Return Type: py::array_t<T> - a writable NumPy view on the memory without copying
+template <typename T>
+py::array_t<T> array_view(py::object owner, T* data, size_t size) {
+    return py::array_t<T>({size}, {sizeof(T)}, data, owner);
+}
+
+// Function: bool_array_view
+// Arguments: owner (py::object) - the python object that owns the memory, kept alive by the view
+//            data (uint8_t*) - pointer to the first flag
+//            size (size_t) - the number of flags
+// Return Type: py::array - a writable NumPy bool view on the flags without copying
+py::array bool_array_view(py::object owner, uint8_t* data, size_t size) {
+    return py::array(py::dtype("bool"), {size}, {sizeof(uint8_t)}, data, owner);
+}
+
+// Function: to_array
+// Arguments: values (std::vector<T>&&) - the values to hand over to NumPy
+// summary: moves the vector into a capsule that owns the memory of the returned array, so nothing is copied
+// Return Type: py::array_t<T> - a NumPy array on the memory of the vector
+template <typename T>
+py::array_t<T> to_array(std::vector<T>&& values) {
+    auto owned = new std::vector<T>(std::move(values));
+    py::capsule owner(owned, [](void* data) { delete static_cast<std::vector<T>*>(data); });
+    return py::array_t<T>({owned->size()}, {sizeof(T)}, owned->data(), owner);
+}
+// Function: recording_view
+// Arguments: view (RecordingView) - the samples of a room recording
+// summary: the array shares the memory of the recorder and keeps the recorder alive, it can not be written to
+// Return Type: py::array_t<TrajectorySample> - read-only NumPy structured array from the oldest to the newest sample
+py::array_t<TrajectorySample> recording_view(RecordingView view) {
+    auto owned = new std::shared_ptr<TrajectoryRecorder>(view.recorder);
+    py::capsule owner(owned, [](void* recorder) { delete static_cast<std::shared_ptr<TrajectoryRecorder>*>(recorder); });
+    py::array_t<TrajectorySample> samples({view.size}, {sizeof(TrajectorySample)}, view.data, owner);
+    samples.attr("flags").attr("writeable") = false;
+    return samples;
+}
+
+// Function: snapshot_to_tuple
+// Arguments: snapshot (BoardSnapshot) - the values of a board read at once
+// summary: builds the python objects in one go so reading the values needs no further calls into the module,
+//          sensors and relays without a configured pin are None
+// Return Type: py::tuple - ([inside_temp, inside_humid], [outside_temp, outside_humid], ldr, heater, cooler, sunscreen)
+py::tuple snapshot_to_tuple(const BoardSnapshot& snapshot) {
+    py::object none = py::none();
+    return py::make_tuple(
+        snapshot.has_DHT22_1 ? py::object(py::make_tuple(snapshot.inside_temperature, snapshot.inside_humidity)) : none,
+        snapshot.has_DHT22_2 ? py::object(py::make_tuple(snapshot.outside_temperature, snapshot.outside_humidity)) : none,
+        snapshot.has_LDR ? py::object(py::int_(snapshot.light_level)) : none,
+        snapshot.has_relay_heater ? py::object(py::bool_(snapshot.heater_active)) : none,
+        snapshot.has_relay_cooler ? py::object(py::bool_(snapshot.cooler_active)) : none,
+        snapshot.has_relay_sunscreen ? py::object(py::bool_(snapshot.sunscreen_active)) : none);
+}
+
+// Function: keep_alive_with
+// Arguments: nurse (py::handle) - the python object that keeps the patient alive
+//            patient (py::object) - the python object that is kept alive
+// summary: like py::keep_alive for objects that aren't arguments of the call, the patient is released
+//          when the nurse is garbage collected
+// Return Type: void
+void keep_alive_with(py::handle nurse, py::object patient) {
+    py::cpp_function release([patient](py::handle weakref) { weakref.dec_ref(); });
+    py::weakref(nurse, release).release();
+}
+
+// The BoardManager as it is bound to python. A board only points to its room, so the room of every
+// connected board is held here until removeBoard releases it, and every board handle holds its room as well.
+struct PyBoardManager : BoardManager {
+    std::unordered_map<int, py::object> rooms; // port: room
+
+    // Function: wrap
+    // Arguments: board (std::shared_ptr<mockArduino>) - a connected board
+    //            room (py::object) - the room of the board
+    // summary: a board that already has a python handle gets the same handle, its room can't have changed
+    //          because a board with a handle is never reused
+    // Return Type: py::object - the python handle of the board
+    static py::object wrap(std::shared_ptr<mockArduino> board, py::object room) {
+        py::object handle = py::cast(board);
+        if (handle.ref_count() == 1) {
+            keep_alive_with(handle, room);
+        }
+        return handle;
+    }
+};
+
+
 PYBIND11_MODULE(room_simulator, m) {
     m.doc() = "pybind11 room simulator plugin"; // optional module docstring
+
+    m.attr("DHT22_RESOLUTION") = DHT22_RESOLUTION;
+
+    PYBIND11_NUMPY_DTYPE(TrajectorySample, time, temperature, outside_temperature, light_level_lux, power, heater_active, cooler_active, sunscreen_active);
+    PYBIND11_NUMPY_DTYPE(SwitchEvent, time, relay, state, temperature);
+    PYBIND11_NUMPY_DTYPE(BoardReading, port, inside_temperature, inside_humidity, outside_temperature, outside_humidity,
+                         light_level, heater_active, cooler_active, sunscreen_active);
+
+    py::enum_<ClockMode>(m, "ClockMode")
+        .value("REALTIME", ClockMode::REALTIME)
+        .value("SCALED", ClockMode::SCALED)
+        .value("VIRTUAL", ClockMode::VIRTUAL);
+
+    py::class_<SimClock, std::shared_ptr<SimClock>>(m, "SimClock")
+        .def(py::init<ClockMode, double>(),
+            py::arg("mode") = ClockMode::REALTIME,
+            py::arg("time_scale") = 1.0)
+        .def("now", &SimClock::now, py::doc("Simulated time in seconds since the clock was created"))
+        .def("advance", &SimClock::advance, py::arg("seconds"), py::doc("Move the simulated time forward by the given amount of seconds"))
+        .def("getMode", &SimClock::getMode)
+        .def("setMode", &SimClock::setMode, py::arg("mode"))
+        .def("getTimeScale", &SimClock::getTimeScale)
+        .def("setTimeScale", &SimClock::setTimeScale, py::arg("time_scale"));
+
+    py::enum_<IntegrationMode>(m, "IntegrationMode")
+        .value("EULER", IntegrationMode::EULER)
+        .value("EXACT", IntegrationMode::EXACT);
+
     py::class_<Room>(m, "Room")
-        .def(py::init<float, float, float, std::vector<float>>(), 
+        .def(py::init<float, float, float, std::vector<float>, std::shared_ptr<SimClock>>(), 
             py::arg("temperature") = 25.0f, 
             py::arg("outside_temperature") = 30.0f, 
             py::arg("humidity") = 50.0f, 
-            py::arg("room_dimensions") = std::vector<float>{10.0f, 10.0f, 2.0f})
+            py::arg("room_dimensions") = std::vector<float>{10.0f, 10.0f, 2.0f},
+            py::arg("clock") = nullptr)
         .def("getTemperature", &Room::getTemperature)
         .def("setTemperature", &Room::setTemperature, py::arg("temperature"))
         .def("getHumidity", &Room::getHumidity)
@@ -37,10 +164,190 @@ PYBIND11_MODULE(room_simulator, m) {
         .def("setCoolerPower", &Room::setCoolerPower, py::arg("power"))
         .def("getOutsideTemperature", &Room::getOutsideTemperature)
         .def("setOutsideTemperature", &Room::setOutsideTemperature, py::arg("temperature"))
+        .def("getClock", &Room::getClock)
+        .def("setClock", &Room::setClock, py::arg("clock"))
+        .def("getSimulationTime", &Room::getSimulationTime)
+        // long running calls release the GIL so independent rooms can be simulated on multiple threads
+        .def("advance", &Room::advance, py::arg("seconds"), py::arg("steps") = 1,
+            py::call_guard<py::gil_scoped_release>(),
+            py::doc("Advance the room clock by steps x seconds of simulated time and integrate the room temperature"))
+        .def("trajectory", [](Room& self, double delta_time, int steps) {
+                std::vector<float> temperatures;
+                {
+                    py::gil_scoped_release release;
+                    temperatures = self.trajectory(delta_time, steps);
+                }
+                return to_array(std::move(temperatures));
+            }, py::arg("delta_time"), py::arg("steps"),
+            py::doc("Advance the room by steps x delta_time seconds and return the temperature after every step"))
+        .def("enableRecording", &Room::enableRecording, py::arg("capacity"),
+            py::doc("Record every integration step in a ring buffer that keeps the last capacity samples"))
+        .def("disableRecording", &Room::disableRecording)
+        .def("isRecording", &Room::isRecording)
+        .def("getRecording", [](Room& self) { return recording_view(self.getRecording()); },
+            py::doc("Read-only NumPy structured array of the recorded samples from oldest to newest, shares memory with the recorder"))
+        .def("getRecordedCount", [](Room& self) { return self.getRecording().recorder->getRecordedCount(); },
+            py::doc("Number of samples recorded since recording was enabled, including overwritten samples"))
+        .def("getIntegrationMode", &Room::getIntegrationMode)
+        .def("setIntegrationMode", &Room::setIntegrationMode, py::arg("mode"), py::doc("Select forward Euler or the exact exponential solution for the temperature integration"))
+        .def("seedSensorNoise", &Room::seedSensorNoise, py::arg("seed"), py::arg("stream"),
+            py::doc("Seed the sensor noise, rooms with the same seed and stream read the same noise"))
+        .def("setSensorNoise", &Room::setSensorNoise, py::arg("max_offset") = 0.5, py::arg("jitter") = 0.0, py::arg("resolution") = 0.0,
+            py::doc("Set the fixed offset range, the Gaussian jitter per reading and the resolution of both temperature sensors"))
+        .def("getSensorNoiseSeed", &Room::getSensorNoiseSeed)
+        .def("getSensorNoiseStream", &Room::getSensorNoiseStream)
+        .def("getSensorOffsets", &Room::getSensorOffsets, py::doc("Fixed offsets of the inside and outside temperature sensor"))
         .def("calculateTempDelta", &Room::calculateTempDelta, py::arg("delta_time"))
         .def("calculateHeatExchange", &Room::calculateHeatExchange);
     
-    py::class_<mockArduino>(m, "mockArduino")
+    py::class_<RoomArray>(m, "RoomArray")
+        .def(py::init<size_t, float, float, std::vector<float>>(),
+            py::arg("size"),
+            py::arg("temperature") = 25.0f,
+            py::arg("outside_temperature") = 30.0f,
+            py::arg("room_dimensions") = std::vector<float>{10.0f, 10.0f, 2.0f})
+        .def("__len__", &RoomArray::getSize)
+        .def("getSize", &RoomArray::getSize)
+        .def("getIntegrationMode", &RoomArray::getIntegrationMode)
+        .def("setIntegrationMode", &RoomArray::setIntegrationMode, py::arg("mode"))
+        .def("setRoomDimensions", &RoomArray::setRoomDimensions, py::arg("index"), py::arg("room_dimensions"))
+        .def("step", &RoomArray::step, py::arg("delta_time"), py::arg("steps") = 1,
+            py::call_guard<py::gil_scoped_release>(),
+            py::doc("Integrate every room by steps x delta_time seconds with the same physics as Room.calculateTempDelta"))
+        // zero-copy NumPy views on the room state, writing to them changes the simulation
+        .def_property_readonly("temperatures", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return array_view(self, rooms.temperatureData(), rooms.getSize()); })
+        .def_property_readonly("outside_temperatures", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return array_view(self, rooms.outsideTemperatureData(), rooms.getSize()); })
+        .def_property_readonly("heater_powers", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return array_view(self, rooms.heaterPowerData(), rooms.getSize()); })
+        .def_property_readonly("cooler_powers", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return array_view(self, rooms.coolerPowerData(), rooms.getSize()); })
+        .def_property_readonly("volumes", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return array_view(self, rooms.volumeData(), rooms.getSize()); })
+        .def_property_readonly("surface_areas", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return array_view(self, rooms.surfaceAreaData(), rooms.getSize()); })
+        .def_property_readonly("heaters_active", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return bool_array_view(self, rooms.heaterActiveData(), rooms.getSize()); })
+        .def_property_readonly("coolers_active", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return bool_array_view(self, rooms.coolerActiveData(), rooms.getSize()); })
+        .def_property_readonly("sunscreens_active", [](py::object self) {
+            RoomArray& rooms = self.cast<RoomArray&>();
+            return bool_array_view(self, rooms.sunscreenActiveData(), rooms.getSize()); });
+
+    py::class_<Building>(m, "Building")
+        .def(py::init<size_t, float, float, std::vector<float>>(),
+            py::arg("zone_count"),
+            py::arg("temperature") = 25.0f,
+            py::arg("outside_temperature") = 30.0f,
+            py::arg("room_dimensions") = std::vector<float>{10.0f, 10.0f, 2.0f})
+        .def("__len__", &Building::getZoneCount)
+        .def_property_readonly("zones", &Building::getZones, py::return_value_policy::reference_internal,
+            py::doc("RoomArray with the state of every zone"))
+        .def("getZoneCount", &Building::getZoneCount)
+        .def("getConnectionCount", &Building::getConnectionCount)
+        .def("connect", &Building::connect, py::arg("zone_a"), py::arg("zone_b"), py::arg("conductance"),
+            py::doc("Connect two zones with a heat path of the given conductance in W/K"))
+        .def("addWall", &Building::addWall, py::arg("zone_a"), py::arg("zone_b"), py::arg("area"),
+            py::arg("thermal_conductivity") = THERMAL_CONDUCTIVITY_BRICK, py::arg("thickness") = THICKNESS_BRICK,
+            py::doc("Connect two zones with a shared wall of the given area in m^2"))
+        .def("setTolerance", &Building::setTolerance, py::arg("tolerance"), py::arg("max_iterations") = 100)
+        .def("getLastIterations", &Building::getLastIterations)
+        .def("step", &Building::step, py::arg("delta_time"), py::arg("steps") = 1,
+            py::call_guard<py::gil_scoped_release>(),
+            py::doc("Integrate all zones together by steps x delta_time seconds with an implicit Euler step"));
+
+    py::class_<LDRCalibration, std::shared_ptr<LDRCalibration>>(m, "LDRCalibration")
+        // constructing a calibration returns the shared table of that configuration
+        .def(py::init([](double R10lx, double gamma, double R1, double VCC, int adc_resolution) {
+                return LDRCalibration::get(R10lx, gamma, R1, VCC, adc_resolution); }),
+            py::arg("R10lx") = 15000.0,
+            py::arg("gamma") = 0.6,
+            py::arg("R1") = 5000.0,
+            py::arg("VCC") = 5.0,
+            py::arg("adc_resolution") = 1024)
+        .def("get_R10lx", &LDRCalibration::getR10lx)
+        .def("get_gamma", &LDRCalibration::getGamma)
+        .def("get_R1", &LDRCalibration::getR1)
+        .def("get_VCC", &LDRCalibration::getVCC)
+        .def("get_adc_resolution", &LDRCalibration::getADCResolution)
+        .def("lux_to_adc", py::vectorize(&LDRCalibration::luxToADC), py::arg("lux"),
+            py::doc("LDR value at the given light level, accepts a number or a NumPy array"))
+        .def("adc_to_lux", py::vectorize(&LDRCalibration::adcToLux), py::arg("adc_value"),
+            py::doc("Light level in the middle of the given LDR value, accepts a number or a NumPy array"))
+        .def_property_readonly("table", [](py::object self) {
+            LDRCalibration& calibration = self.cast<LDRCalibration&>();
+            py::array_t<double> table = array_view(self, const_cast<double*>(calibration.tableData()), calibration.getADCResolution());
+            table.attr("flags").attr("writeable") = false;
+            return table; },
+            py::doc("Read-only NumPy view on the lux value of every LDR value"));
+
+    py::enum_<Relay>(m, "Relay")
+        .value("HEATER", Relay::HEATER)
+        .value("COOLER", Relay::COOLER)
+        .value("SUNSCREEN", Relay::SUNSCREEN);
+
+    py::class_<Controller>(m, "Controller")
+        .def(py::init<Room*, double, double, double, bool>(),
+            py::arg("room"),
+            py::arg("target_temperature") = 20.0,
+            py::arg("temp_threshold") = 0.5,
+            py::arg("lux_threshold") = 10000.0,
+            py::arg("active_temp_control") = false,
+            py::keep_alive<1, 2>())
+        .def("getRoom", &Controller::getRoom, py::return_value_policy::reference)
+        .def("getTargetTemperature", &Controller::getTargetTemperature)
+        .def("setTargetTemperature", &Controller::setTargetTemperature, py::arg("target_temperature"))
+        .def("getTempThreshold", &Controller::getTempThreshold)
+        .def("setTempThreshold", &Controller::setTempThreshold, py::arg("temp_threshold"))
+        .def("getLuxThreshold", &Controller::getLuxThreshold)
+        .def("setLuxThreshold", &Controller::setLuxThreshold, py::arg("lux_threshold"))
+        .def("isActiveTempControl", &Controller::isActiveTempControl)
+        .def("setActiveTempControl", &Controller::setActiveTempControl, py::arg("enabled"))
+        .def("getLDRCalibration", &Controller::getLDRCalibration)
+        .def("setLDRCalibration", &Controller::setLDRCalibration, py::arg("calibration"))
+        .def("generateCommands", &Controller::generateCommands,
+            py::arg("inside_temp"), py::arg("outside_temp"), py::arg("heater_state"), py::arg("cooler_state"), py::arg("sunscreen_state"), py::arg("lux"),
+            py::doc("Returns the new heater, cooler and sunscreen states, the same as control.generateCommands"))
+        .def("run", [](Controller& self, double poll_interval, int polls) {
+                std::vector<SwitchEvent> log;
+                {
+                    py::gil_scoped_release release;
+                    log = self.run(poll_interval, polls);
+                }
+                return to_array(std::move(log)); },
+            py::arg("poll_interval"), py::arg("polls"),
+            py::doc("Poll, decide and switch the relays of the room polls times, moving the room clock forward by poll_interval every poll. "
+                    "Returns the switching log as a NumPy structured array with time, relay, state and temperature"));
+
+    py::class_<mockPin>(m, "mockPin")
+        .def("get_pin_type", &mockPin::get_pin_type)
+        .def("get_pin_num", &mockPin::get_pin_num)
+        .def("get_pin_mode", &mockPin::get_pin_mode);
+
+    py::class_<DigitalPin, mockPin>(m, "DigitalPin")
+        .def("read", &DigitalPin::read)
+        .def("write", &DigitalPin::write, py::arg("state"));
+
+    py::class_<RelayPin, mockPin>(m, "RelayPin")
+        .def("read", &RelayPin::read)
+        .def("write", &RelayPin::write, py::arg("state"));
+
+    py::class_<DHT22Pin, mockPin>(m, "DHT22Pin")
+        .def("read", &DHT22Pin::read, py::doc("Returns (temperature, humidity)"));
+
+    py::class_<AnalogPin, mockPin>(m, "AnalogPin")
+        .def("read", &AnalogPin::read, py::doc("Returns the LDR value between 0 and 1023"));
+
+    py::class_<mockArduino, std::shared_ptr<mockArduino>>(m, "mockArduino")
         .def(py::init<int, Room*>(), 
             py::arg("com_Port") = 3, 
             py::arg("room") = nullptr )
@@ -49,6 +356,8 @@ PYBIND11_MODULE(room_simulator, m) {
         .def("read_DHT22_1", &mockArduino::read_DHT22_1)
         .def("read_DHT22_2", &mockArduino::read_DHT22_2)
         .def("read_LDR", &mockArduino::read_LDR)
+        .def("get_ldr_calibration", &mockArduino::get_ldr_calibration)
+        .def("set_ldr_calibration", &mockArduino::set_ldr_calibration, py::arg("calibration"))
         .def("write_Relay_Heater", &mockArduino::write_Relay_Heater, py::arg("state"))
         .def("read_Relay_Heater", &mockArduino::read_Relay_Heater)
         .def("write_Relay_Cooler", &mockArduino::write_Relay_Cooler, py::arg("state"))
@@ -57,7 +366,140 @@ PYBIND11_MODULE(room_simulator, m) {
         .def("read_Relay_Sunscreen", &mockArduino::read_Relay_Sunscreen)
         .def("set_digital_pin", &mockArduino::set_digital_pin, py::arg("pin_num"), py::arg("state"))
         .def("set_pin_mode", &mockArduino::set_pin_mode, py::arg("pin_type"), py::arg("pin_num"), py::arg("pin_mode"))
-        .def("get_pin_data", &mockArduino::get_pin_data, py::arg("pin_type"), py::arg("pin_num"));
+        .def("get_pin_data", &mockArduino::get_pin_data, py::arg("pin_type"), py::arg("pin_num"))
+        .def("get_pin", &mockArduino::get_pin, py::arg("pin_def"), py::keep_alive<0, 1>(),
+            py::doc("Set the pin mode from a pyfirmata style definition like 'd:7:dht22_1' and return a pin object bound to its sensor or relay"))
+        .def("read_all", [](mockArduino& self) { return snapshot_to_tuple(self.read_all()); },
+            py::doc("Read every configured sensor and relay in one call. Returns ((inside_temp, inside_humid), (outside_temp, outside_humid), ldr, heater, cooler, sunscreen), None for sensors and relays without a pin"));
+    py::class_<PyBoardManager>(m, "BoardManager")
+        .def(py::init<>())
+        .def("__len__", &BoardManager::getBoardCount)
+        .def("__contains__", &BoardManager::hasBoard, py::arg("port"))
+        .def("addTemplate", &BoardManager::addTemplate, py::arg("name"), py::arg("pin_defs"),
+            py::doc("Parse and check pin definitions like ['d:7:DHT22_1', 'a:0:LDR'] once and store them under a name"))
+        .def("getTemplateNames", &BoardManager::getTemplateNames)
+        .def("addBoard", [](PyBoardManager& self, int port, py::object room, const std::string& template_name) {
+                std::shared_ptr<mockArduino> board = self.addBoard(port, room.cast<Room*>(), template_name);
+                self.rooms[port] = room;
+                return PyBoardManager::wrap(board, room); },
+            py::arg("port"), py::arg("room"), py::arg("template") = "",
+            py::doc("Connect a board to a port and a room with the pins of a template, a removed board is reused when there is one. "
+                    "The manager keeps the room alive until the board is removed"))
+        .def("removeBoard", [](PyBoardManager& self, int port) {
+                self.removeBoard(port);
+                self.rooms.erase(port); },
+            py::arg("port"),
+            py::doc("Disconnect the board of a port and release its room, the last board takes its place in the bulk arrays. "
+                    "A board that is still held keeps its port and room and is never reused"))
+        .def("applyTemplate", &BoardManager::applyTemplate, py::arg("port"), py::arg("template"))
+        .def("getBoard", [](PyBoardManager& self, int port) {
+                std::shared_ptr<mockArduino> board = self.getBoard(port);
+                return PyBoardManager::wrap(board, self.rooms.at(port)); },
+            py::arg("port"))
+        .def("hasBoard", &BoardManager::hasBoard, py::arg("port"))
+        .def("getBoardCount", &BoardManager::getBoardCount)
+        .def("getPoolSize", &BoardManager::getPoolSize)
+        .def("getPorts", &BoardManager::getPorts, py::doc("Port of every board in the order of the bulk arrays"))
+        .def("readDHT22_1", [](PyBoardManager& self) {
+                std::vector<double> values;
+                {
+                    py::gil_scoped_release release;
+                    values = self.readDHT22(DHT22_1);
+                }
+                size_t boards = values.size() / 2;
+                return to_array(std::move(values)).attr("reshape")(boards, 2);
+            },
+            py::doc("Inside temperature and humidity of every board as an (n, 2) array, NaN for boards without a DHT22_1 pin"))
+        .def("readDHT22_2", [](PyBoardManager& self) {
+                std::vector<double> values;
+                {
+                    py::gil_scoped_release release;
+                    values = self.readDHT22(DHT22_2);
+                }
+                size_t boards = values.size() / 2;
+                return to_array(std::move(values)).attr("reshape")(boards, 2);
+            },
+            py::doc("Outside temperature and humidity of every board as an (n, 2) array, NaN for boards without a DHT22_2 pin"))
+        .def("readLDR", [](PyBoardManager& self) {
+                std::vector<int32_t> values;
+                {
+                    py::gil_scoped_release release;
+                    values = self.readLDR();
+                }
+                return to_array(std::move(values));
+            },
+            py::doc("LDR value of every board, -1 for boards without an LDR pin"))
+        .def("readRelays", [](PyBoardManager& self) {
+                std::vector<uint8_t> states;
+                {
+                    py::gil_scoped_release release;
+                    states = self.readRelays();
+                }
+                size_t boards = states.size() / 3;
+                auto owned = new std::vector<uint8_t>(std::move(states));
+                py::capsule owner(owned, [](void* data) { delete static_cast<std::vector<uint8_t>*>(data); });
+                py::array relays(py::dtype("bool"), {boards, static_cast<size_t>(3)}, {3 * sizeof(uint8_t), sizeof(uint8_t)}, owned->data(), owner);
+                return py::object(relays.attr("T"));
+            },
+            py::doc("Heater, cooler and sunscreen states of every board as a (3, n) bool array, off for relays without a pin"))
+        .def("writeRelays", [](PyBoardManager& self, py::array_t<bool, py::array::c_style | py::array::forcecast> heaters,
+                               py::array_t<bool, py::array::c_style | py::array::forcecast> coolers,
+                               py::array_t<bool, py::array::c_style | py::array::forcecast> sunscreens) {
+                size_t size = static_cast<size_t>(heaters.size());
+                if (heaters.ndim() != 1 || coolers.ndim() != 1 || sunscreens.ndim() != 1
+                        || static_cast<size_t>(coolers.size()) != size || static_cast<size_t>(sunscreens.size()) != size) {
+                    throw std::invalid_argument("Invalid relay states. Expected three 1-dimensional arrays of the same length.");
+                }
+                const uint8_t* heater_data = reinterpret_cast<const uint8_t*>(heaters.data());
+                const uint8_t* cooler_data = reinterpret_cast<const uint8_t*>(coolers.data());
+                const uint8_t* sunscreen_data = reinterpret_cast<const uint8_t*>(sunscreens.data());
+                py::gil_scoped_release release;
+                self.writeRelays(heater_data, cooler_data, sunscreen_data, size);
+            }, py::arg("heaters"), py::arg("coolers"), py::arg("sunscreens"),
+            py::doc("Switch the relays of every board, e.g. with the commands of control.generateCommandsBatch. Relays without a pin are skipped"))
+        .def("readAll", [](PyBoardManager& self) {
+                std::vector<BoardReading> readings;
+                {
+                    py::gil_scoped_release release;
+                    readings = self.readAll();
+                }
+                return to_array(std::move(readings));
+            },
+            py::doc("Every sensor and relay of every board as a NumPy structured array with the fields port, inside_temperature, "
+                    "inside_humidity, outside_temperature, outside_humidity, light_level, heater_active, cooler_active and sunscreen_active"));
+
+    m.def("stats", []() {
+            py::dict methods;
+            for (int i = 0; i < static_cast<int>(StatMethod::COUNT); i++) {
+                const MethodStats& stats = RuntimeStats::getMethod(static_cast<StatMethod>(i));
+                uint64_t timed_calls = stats.timed_calls.load(std::memory_order_relaxed);
+                py::dict method;
+                method["calls"] = stats.calls.load(std::memory_order_relaxed);
+                method["timed_calls"] = timed_calls;
+                method["total_ns"] = stats.total_ns.load(std::memory_order_relaxed);
+                // without timed calls the minimum still holds its start value
+                method["min_ns"] = timed_calls > 0 ? py::object(py::int_(stats.min_ns.load(std::memory_order_relaxed))) : py::none();
+                method["max_ns"] = stats.max_ns.load(std::memory_order_relaxed);
+                methods[RuntimeStats::methodName(static_cast<StatMethod>(i))] = method;
+            }
+            py::dict counters;
+            for (int i = 0; i < static_cast<int>(StatCounter::COUNT); i++) {
+                counters[RuntimeStats::counterName(static_cast<StatCounter>(i))] = RuntimeStats::getCounter(static_cast<StatCounter>(i));
+            }
+            py::dict result;
+            result["timing"] = RuntimeStats::isTiming();
+            result["methods"] = methods;
+            result["counters"] = counters;
+            return result;
+        },
+        py::doc("Call counts and total, min and max nanoseconds of the timed Room and mockArduino methods, and the integration steps, "
+                "rejected DHT22 reads and relay writes since the module was loaded or reset_stats was called. The nanoseconds only "
+                "include the timed_calls, the calls made while set_stats_timing(True) was on, min_ns is None without timed calls. "
+                "Returns {'timing': bool, 'methods': {name: {'calls', 'timed_calls', 'total_ns', 'min_ns', 'max_ns'}}, 'counters': {name: count}}"));
+    m.def("reset_stats", &RuntimeStats::reset, py::doc("Sets every counter of stats() to 0"));
+    m.def("set_stats_timing", &RuntimeStats::setTiming, py::arg("enabled"),
+        py::doc("Switches measuring the duration of the timed methods on or off, calls and events are always counted"));
+
     // #ifdef VERSION_INFO;
     m.attr("__version__") = MACRO_STRINGIFY(VERSION_INFO);
     // #else
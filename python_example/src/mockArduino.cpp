@@ -6,6 +6,10 @@
 
 #include "mockArduino.h"
 #include <variant> // std::variant<>
+#include <algorithm> // std::transform
+#include <cctype> // std::tolower
+#include <map> // std::map<>
+#include <sstream> // std::stringstream
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
@@ -23,11 +27,26 @@ mockArduino::mockArduino(int com_Port, Room* room) {
     this->room = room;
     this->digitalPins.resize(54, std::make_pair(EMPTY, false)); // 0 - 53 digital pins initialized to empty and false
     this->analogPins.resize(17, EMPTY); // 0 - 16 analog pins initialized to empty 
+    this->ldr_calibration = LDRCalibration::get(); // shared table of the default LDR setup
 }
 
 mockArduino::~mockArduino() {
 }
 
+// Function: reset
+// Arguments: com_Port (int) - the new com port of the arduino
+//            room (Room*) - the new room object
+// summary: every pin is set back to empty and low and the default LDR calibration is used again
+// Return Type: void
+void mockArduino::reset(int com_Port, Room* room) {
+    this->com_Port = com_Port;
+    this->room = room;
+    std::fill(this->digitalPins.begin(), this->digitalPins.end(), std::make_pair(EMPTY, false));
+    std::fill(this->analogPins.begin(), this->analogPins.end(), EMPTY);
+    std::fill(std::begin(this->configuredPins), std::end(this->configuredPins), 0);
+    this->ldr_calibration = LDRCalibration::get();
+}
+
 
 // Function: set_pin_mode
 // Arguments: pin_type (int) - the type of pin (digital or analog)
@@ -40,6 +59,8 @@ void mockArduino::set_pin_mode(int pin_type, int pin_num , int pin_mode) {
         if (pin_num >= 0 && pin_num <= 53) { // digital
             if ( pin_mode >= 0 && pin_mode <= 5) {
                 // set the value of the pin
+                this->configuredPins[this->digitalPins[pin_num].first]--;
+                this->configuredPins[pin_mode]++;
                 this->digitalPins[pin_num].first = pin_mode;
             } else {
                 throw std::invalid_argument("Invalid pin mode. Expected a value between 0 and 5.");
@@ -51,6 +72,8 @@ void mockArduino::set_pin_mode(int pin_type, int pin_num , int pin_mode) {
         if (0 <= pin_num && pin_num <= 16) { // analog
             // check if pin is input or output
             if ( pin_mode == 6) {;
+                this->configuredPins[this->analogPins[pin_num]]--;
+                this->configuredPins[pin_mode]++;
                 this->analogPins[pin_num] = pin_mode;
             } else {
                 throw std::invalid_argument("Invalid pin mode. Expected 6. Got: " + std::to_string(pin_mode));
@@ -73,6 +96,7 @@ void mockArduino::set_pin_mode(int pin_type, int pin_num , int pin_mode) {
 // summary: sets the state of the pin. if the pin is a relay, it will set the state of the relay using the room object
 // Return Type: void
 void mockArduino::set_digital_pin(int pin_num, bool state){ // digital only
+    ScopedTimer timer(StatMethod::ARDUINO_SET_DIGITAL_PIN);
     // check if pin is digital or analog
     if (pin_num >= 0 && pin_num <= 53){
         // check for pin mode error
@@ -112,6 +136,7 @@ void mockArduino::set_digital_pin(int pin_num, bool state){ // digital only
 //            pin_num (int) - the number of the pin
 // Return Type: std::variant<bool, double, int> - depending on the pin type and mode
 std::variant<bool, double,std::vector<double>, int> mockArduino::get_pin_data(int pin_type, int pin_num) {
+    ScopedTimer timer(StatMethod::ARDUINO_GET_PIN_DATA);
 
     // check if pin is digital or analog
     if (pin_type == 0 && (pin_num >= 0 && pin_num <= 53) ){ // pin is digital
@@ -158,10 +183,127 @@ std::variant<bool, double,std::vector<double>, int> mockArduino::get_pin_data(in
     }
 }
 
+// Function: read_all
+// Arguments: None
+// summary: reads every configured sensor and relay once, for the poll loop that needs all of them every tick
+// Return Type: BoardSnapshot - the values of the sensors and relays that have a pin configured
+BoardSnapshot mockArduino::read_all() {
+    ScopedTimer timer(StatMethod::ARDUINO_READ_ALL);
+    BoardSnapshot snapshot;
+    if (this->configuredPins[DHT22_1] > 0) {
+        snapshot.has_DHT22_1 = true;
+        snapshot.inside_temperature = this->room->getTemperature();
+        snapshot.inside_humidity = this->room->getHumidity();
+    }
+    if (this->configuredPins[DHT22_2] > 0) {
+        snapshot.has_DHT22_2 = true;
+        snapshot.outside_temperature = this->room->getOutsideTemperature();
+        snapshot.outside_humidity = this->room->getHumidity();
+    }
+    if (this->configuredPins[LDR] > 0) {
+        snapshot.has_LDR = true;
+        snapshot.light_level = this->read_LDR();
+    }
+    if (this->configuredPins[RELAY_HEATER] > 0) {
+        snapshot.has_relay_heater = true;
+        snapshot.heater_active = this->read_Relay_Heater();
+    }
+    if (this->configuredPins[RELAY_COOLER] > 0) {
+        snapshot.has_relay_cooler = true;
+        snapshot.cooler_active = this->read_Relay_Cooler();
+    }
+    if (this->configuredPins[RELAY_SUNSCREEN] > 0) {
+        snapshot.has_relay_sunscreen = true;
+        snapshot.sunscreen_active = this->read_Relay_Sunscreen();
+    }
+    return snapshot;
+}
+
+// Function: parse_pin_def
+// Arguments: pin_def (std::string) - pin definition in the pyfirmata format '(d)igital/(a)nalog:pinNum:pinMode',
+//                                    the pin mode is one of the names of the pin modes or i/o for an empty digital pin,
+//                                    upper and lower case are both accepted. e.g. "d:7:dht22_1" or "a:0:LDR"
+// summary: only the format is checked, set_pin_mode checks the pin number and pin mode for the pin type
+// Return Type: PinDefinition - the pin type, pin number and pin mode
+PinDefinition mockArduino::parse_pin_def(const std::string& pin_def) {
+    static const std::map<std::string, int> pin_modes = {
+        {"empty", EMPTY}, {"i", EMPTY}, {"o", EMPTY},
+        {"dht22_1", DHT22_1}, {"dht22_2", DHT22_2},
+        {"relay_heater", RELAY_HEATER}, {"relay_cooler", RELAY_COOLER}, {"relay_sunscreen", RELAY_SUNSCREEN},
+        {"ldr", LDR}
+    };
+
+    // Split string like "d:7:DHT22_1" into ["d", "7", "dht22_1"]
+    std::vector<std::string> parts;
+    std::stringstream pin_stream(pin_def);
+    std::string part;
+    while (std::getline(pin_stream, part, ':')) {
+        std::transform(part.begin(), part.end(), part.begin(), [](unsigned char c) { return std::tolower(c); });
+        parts.push_back(part);
+    }
+    if (parts.size() != 3) {
+        throw std::invalid_argument("Invalid pin definition. Expected '(d)igital/(a)nalog:pinNum:pinMode'. Got: " + pin_def);
+    }
+
+    PinDefinition pin;
+    if (parts[0] == "d") {
+        pin.pin_type = 0;
+    } else if (parts[0] == "a") {
+        pin.pin_type = 1;
+    } else {
+        throw std::invalid_argument("Invalid pin type. Expected 'd' or 'a'. Got: " + parts[0]);
+    }
+
+    pin.pin_num = std::stoi(parts[1]);
+
+    auto pin_mode = pin_modes.find(parts[2]);
+    if (pin_mode == pin_modes.end()) {
+        throw std::invalid_argument("Invalid pin mode. Got: " + parts[2]);
+    }
+    pin.pin_mode = pin_mode->second;
+    return pin;
+}
+
+// Function: apply_pins
+// Arguments: pins (std::vector<PinDefinition>) - parsed pin definitions, e.g. a pin template of a BoardManager
+// Return Type: void
+void mockArduino::apply_pins(const std::vector<PinDefinition>& pins) {
+    for (const PinDefinition& pin : pins) {
+        this->set_pin_mode(pin.pin_type, pin.pin_num, pin.pin_mode);
+    }
+}
+
+// Function: get_pin
+// Arguments: pin_def (std::string) - pin definition in the pyfirmata format, see parse_pin_def
+// summary: sets the pin mode and returns a pin object that is bound to the sensor or relay of the pin,
+//          the pin definition is parsed and checked once so reading and writing the pin skips all checks
+// Return Type: std::unique_ptr<mockPin> - DigitalPin, RelayPin, DHT22Pin or AnalogPin depending on the pin mode
+std::unique_ptr<mockPin> mockArduino::get_pin(std::string pin_def) {
+    PinDefinition pin = parse_pin_def(pin_def);
+
+    // checks the pin number and pin mode for the pin type
+    this->set_pin_mode(pin.pin_type, pin.pin_num, pin.pin_mode);
+
+    switch (pin.pin_mode) {
+        case EMPTY:
+            return std::make_unique<DigitalPin>(pin.pin_num, &this->digitalPins[pin.pin_num]);
+        case DHT22_1:
+        case DHT22_2:
+            return std::make_unique<DHT22Pin>(pin.pin_num, pin.pin_mode, this->room);
+        case RELAY_HEATER:
+        case RELAY_COOLER:
+        case RELAY_SUNSCREEN:
+            return std::make_unique<RelayPin>(pin.pin_num, pin.pin_mode, this->room);
+        default: // LDR
+            return std::make_unique<AnalogPin>(pin.pin_num, this);
+    }
+}
+
 // Function: read_DHT22_1
 // Arguments: None
 // Return Type: std::vector<double> - the temperature of the room and the humidity of the room	
 std::vector<double> mockArduino::read_DHT22_1() {
+    ScopedTimer timer(StatMethod::ARDUINO_READ_DHT22_1);
     std::vector<double> roomTemp = {this->room->getTemperature(), this->room->getHumidity()};
     return roomTemp;
 }
@@ -170,46 +312,28 @@ std::vector<double> mockArduino::read_DHT22_1() {
 // Arguments: None
 // Return Type: std::vector<double> - the temperature outside the room and the humidity outside the room wich is the same as the room
 std::vector<double> mockArduino::read_DHT22_2() { 
+    ScopedTimer timer(StatMethod::ARDUINO_READ_DHT22_2);
     std::vector<double> outsideTemp = {this->room->getOutsideTemperature(), this->room->getHumidity()};
     return outsideTemp;
 }
 
-// Function: calculateLDRResistance
-// Arguments: lux (double) - the light level in the room between 0 and 1024 
-//            R10lx (double) - Light resistance at 10 lux in ohms 
-//            gamma (double) - Gamma value found in the datasheet
-// Return Type: double - the resistance of the LDR in ohms
-double calculateLDRResistance(double lux, double R10lx, double gamma) {
-    return pow(10, gamma) * R10lx / pow(lux, gamma);
-}
-
 // Function: read_LDR
 // Arguments: None
+// summary: looks the light level of the room up in the LDR calibration table of the board
 // Return Type: int - the light level in the room between 0 and 1024
 int mockArduino::read_LDR() {
-    // Get lux value from the sensor (replace this with your actual sensor reading)
-    double lux = this->room->getLightLevelLux();
-
-    // Constants for your LDR setup
-    const double R10lx = 15000; // Light resistance at 10 lux in ohms
-    const double gamma = 0.6;   // Gamma value
-    const double R1 = 5000;     // Resistor R1 in ohms
-    const double VCC = 5.0;     // Supply voltage in volts
-    const int ADC_RESOLUTION = 1024; // ADC resolution (10-bit)
-
-    // Calculate LDR resistance LDR_R using gamma formula
-    double LDR_R = calculateLDRResistance(lux, R10lx, gamma);
-
-    // Calculate voltage across photo-resistor
-    double voltage = (VCC * R1) / (LDR_R + R1);
-
-    // Map voltage to the range [0, 1024] (assuming a 10-bit ADC)
-    int mappedValue = static_cast<int>((voltage / VCC) * ADC_RESOLUTION);
-
-    // Ensure the mapped value is within the valid range [0, 1023]
-    mappedValue = std::min(std::max(mappedValue, 0), ADC_RESOLUTION - 1);
+    ScopedTimer timer(StatMethod::ARDUINO_READ_LDR);
+    return this->ldr_calibration->luxToADC(this->room->getLightLevelLux());
+}
 
-    return mappedValue;
+// Function: set_ldr_calibration
+// Arguments: calibration (std::shared_ptr<LDRCalibration>) - the calibration of the LDR voltage divider
+// Return Type: void
+void mockArduino::set_ldr_calibration(std::shared_ptr<LDRCalibration> calibration) {
+    if (!calibration) {
+        throw std::invalid_argument("Invalid LDR calibration. Expected a calibration object.");
+    }
+    this->ldr_calibration = calibration;
 }
 
 // Function: write_Relay_Heater
@@ -1,8 +1,11 @@
 
 #pragma once
 #include "room.h"
+#include "ldrCalibration.h"
 // #include <iostream>
 
+#include <memory> // std::unique_ptr<>
+#include <string> // std::string
 #include <vector> // std::vector<>
 #include <utility> // std::pair<>
 #include <variant> // std::variant<>
@@ -18,7 +21,35 @@
 #define RELAY_SUNSCREEN 5
 // analog only
 #define LDR 6
+#define PIN_MODE_COUNT 7
 
+#include "mockPin.h"
+
+// a pin definition like "d:7:DHT22_1" after parsing
+struct PinDefinition {
+    int pin_type; // 0 digital, 1 analog
+    int pin_num;
+    int pin_mode;
+};
+
+// values of every configured sensor and relay of a board read at once,
+// has_* is false when no pin is configured for that sensor or relay
+struct BoardSnapshot {
+    bool has_DHT22_1 = false;
+    double inside_temperature = 0.0;
+    double inside_humidity = 0.0;
+    bool has_DHT22_2 = false;
+    double outside_temperature = 0.0;
+    double outside_humidity = 0.0;
+    bool has_LDR = false;
+    int light_level = 0;
+    bool has_relay_heater = false;
+    bool heater_active = false;
+    bool has_relay_cooler = false;
+    bool cooler_active = false;
+    bool has_relay_sunscreen = false;
+    bool sunscreen_active = false;
+};
 
 
 
@@ -32,8 +63,12 @@ private:
     std::vector<std::pair<int, bool>> digitalPins;
     // analog pin mode
     std::vector<int> analogPins;
+    // number of pins configured for every pin mode, used by read_all
+    int configuredPins[PIN_MODE_COUNT] = {0};
     // room object
     Room* room = nullptr;
+    // conversion between the light level of the room and the LDR value
+    std::shared_ptr<LDRCalibration> ldr_calibration;
 
 
 public:
@@ -41,12 +76,17 @@ public:
     mockArduino(int com_Port,Room* room);
     ~mockArduino();
 
+    // returns the board to the state of a new board on another port and room, for boards that are reused
+    void reset(int com_Port, Room* room);
+
     int get_com_Port() { return com_Port; }
     Room* get_room() { return room; }
 
     std::vector<double> read_DHT22_1();
     std::vector<double> read_DHT22_2();
     int read_LDR();
+    std::shared_ptr<LDRCalibration> get_ldr_calibration() { return ldr_calibration; }
+    void set_ldr_calibration(std::shared_ptr<LDRCalibration> calibration);
 
     void write_Relay_Heater(bool state);
     bool read_Relay_Heater();
@@ -59,6 +99,13 @@ public:
     void set_digital_pin(int pin_num, bool state);
 
     void set_pin_mode(int pin_type, int pin_num, int pin_mode);
+    void apply_pins(const std::vector<PinDefinition>& pins);
+    bool has_pin_mode(int pin_mode) { return pin_mode >= 0 && pin_mode < PIN_MODE_COUNT && configuredPins[pin_mode] > 0; }
+    static PinDefinition parse_pin_def(const std::string& pin_def);
+
+    BoardSnapshot read_all();
+
+    std::unique_ptr<mockPin> get_pin(std::string pin_def);
     
     std::variant<bool, double, std::vector<double>, int> get_pin_data(int pin_type, int pin_num); // check if pin is digital or analog an the mode of the pin, input or output 
     
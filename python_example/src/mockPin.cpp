@@ -0,0 +1,53 @@
+// mockPin.cpp
+#include "mockPin.h"
+#include "mockArduino.h"
+
+// Function: RelayPin constructor
+// Arguments: pin_num (int) - the number of the pin
+//            pin_mode (int) - RELAY_HEATER, RELAY_COOLER or RELAY_SUNSCREEN
+//            room (Room*) - the room with the relay
+// summary: selects the room functions of the relay once so read and write call them directly
+// Return Type: RelayPin class object
+RelayPin::RelayPin(int pin_num, int pin_mode, Room* room) : mockPin(0, pin_num, pin_mode), room(room) {
+    switch (pin_mode) {
+        case RELAY_HEATER:
+            this->read_state = &Room::isHeaterActive;
+            this->write_state = &Room::activateHeater;
+            break;
+        case RELAY_COOLER:
+            this->read_state = &Room::isCoolerActive;
+            this->write_state = &Room::activateCooler;
+            break;
+        case RELAY_SUNSCREEN:
+            this->read_state = &Room::isSunscreenActive;
+            this->write_state = &Room::activateSunscreen;
+            break;
+        default:
+            throw std::invalid_argument("Invalid pin mode. Expected one of the following values 3, 4, 5.");
+    }
+}
+
+// Function: DHT22Pin constructor
+// Arguments: pin_num (int) - the number of the pin
+//            pin_mode (int) - DHT22_1 or DHT22_2
+//            room (Room*) - the room with the sensor
+// Return Type: DHT22Pin class object
+DHT22Pin::DHT22Pin(int pin_num, int pin_mode, Room* room) : mockPin(0, pin_num, pin_mode), room(room) {
+    switch (pin_mode) {
+        case DHT22_1:
+            this->read_temperature = &Room::getTemperature;
+            break;
+        case DHT22_2:
+            this->read_temperature = &Room::getOutsideTemperature;
+            break;
+        default:
+            throw std::invalid_argument("Invalid pin mode. Expected one of the following values 1, 2.");
+    }
+}
+
+// Function: read
+// Arguments: None
+// Return Type: int - the light level in the room between 0 and 1024
+int AnalogPin::read() {
+    return this->board->read_LDR();
+}
@@ -0,0 +1,75 @@
+// mockPin.h
+#pragma once
+#include "room.h"
+
+#include <utility> // std::pair<>
+
+class mockArduino;
+
+// A pin of a mockArduino that is bound to its sensor or relay when it is created,
+// reading and writing skips the pin number and pin mode checks of get_pin_data and set_digital_pin.
+// The handle is not updated when the mode of the pin is changed afterwards.
+class mockPin {
+protected:
+    int pin_type;
+    int pin_num;
+    int pin_mode;
+
+public:
+    mockPin(int pin_type, int pin_num, int pin_mode) : pin_type(pin_type), pin_num(pin_num), pin_mode(pin_mode) {}
+    virtual ~mockPin() {}
+
+    int get_pin_type() { return pin_type; }
+    int get_pin_num() { return pin_num; }
+    int get_pin_mode() { return pin_mode; }
+};
+
+// digital pin without a sensor or relay (EMPTY)
+class DigitalPin : public mockPin {
+private:
+    std::pair<int, bool>* pin;
+
+public:
+    DigitalPin(int pin_num, std::pair<int, bool>* pin) : mockPin(0, pin_num, 0), pin(pin) {}
+
+    bool read() { return pin->second; }
+    void write(bool state) { pin->second = state; }
+};
+
+// digital pin connected to the heater, cooler or sunscreen relay
+class RelayPin : public mockPin {
+private:
+    Room* room;
+    bool (Room::*read_state)();
+    void (Room::*write_state)(bool);
+
+public:
+    RelayPin(int pin_num, int pin_mode, Room* room);
+
+    bool read() { return (room->*read_state)(); }
+    void write(bool state) { (room->*write_state)(state); }
+};
+
+// digital pin connected to the inside (DHT22_1) or outside (DHT22_2) temperature sensor
+class DHT22Pin : public mockPin {
+private:
+    Room* room;
+    float (Room::*read_temperature)();
+
+public:
+    DHT22Pin(int pin_num, int pin_mode, Room* room);
+
+    // temperature and humidity
+    std::pair<double, double> read() { return std::make_pair((room->*read_temperature)(), room->getHumidity()); }
+};
+
+// analog pin connected to the LDR
+class AnalogPin : public mockPin {
+private:
+    mockArduino* board;
+
+public:
+    AnalogPin(int pin_num, mockArduino* board) : mockPin(1, pin_num, 6), board(board) {}
+
+    int read();
+};
@@ -5,57 +5,198 @@
 #pragma once
 #include "room.h"
 #include <algorithm>
+#include <atomic>
+#include <cmath>
 #include <iostream>
 
 
 float Room::getTemperature() {
-    // Simulate time passing
-    auto current_time = std::chrono::high_resolution_clock::now();
-    double delta_time = std::chrono::duration_cast<std::chrono::microseconds>(current_time - last_update_time).count() / 1000000.0;
+    ScopedTimer timer(StatMethod::ROOM_GET_TEMPERATURE);
+    std::lock_guard<std::mutex> lock(mutex);
+    // Simulate time passing on the simulation clock
+    double current_time = this->clock->now();
+    double delta_time = current_time - last_update_time;
     
-    // Check if enough time has passed since the last reading (minimum interval: 2 seconds)
-    if (delta_time < 2.0) {
-        // If not enough time has passed, return the previous temperature
-        return std::clamp(temperature, -40.0f, 80.0f) + this->sensor_accuracy_offset;
+    // Check if enough simulated time has passed since the last reading (minimum interval: 2 seconds)
+    if (delta_time < DHT22_READ_INTERVAL) {
+        RuntimeStats::count(StatCounter::DHT_REJECTED_READS);
+        // If not enough time has passed, return the previous temperature with the noise of the previous reading
+        return this->inside_sensor.apply(std::clamp(temperature, -40.0f, 80.0f));
     }
-    last_update_time = current_time;
 
     // Only simulate Inside temperature
-    temperature += this->calculateTempDelta(delta_time);
+    this->integrate(delta_time);
     
     // Ensure temperature stays within a valid range
     auto ret_temperature = std::clamp(temperature, -40.0f, 80.0f); // return value based on datasheet of sensor DHT 22 (-40 - +80)
-    return ret_temperature + this->sensor_accuracy_offset;
+    this->inside_sensor.nextReading();
+    return this->inside_sensor.apply(ret_temperature);
     
 }
 
+void Room::integrate(double delta_time) {
+    RuntimeStats::count(StatCounter::INTEGRATION_STEPS);
+    temperature += this->temperatureDelta(delta_time);
+    last_update_time += delta_time;
+
+    if (this->recorder) {
+        TrajectorySample sample;
+        sample.time = last_update_time;
+        sample.temperature = temperature;
+        sample.outside_temperature = outside_temperature;
+        sample.light_level_lux = light_level_lux;
+        sample.power = (heater_active * heater_power) + (cooler_active * cooler_power);
+        sample.heater_active = heater_active;
+        sample.cooler_active = cooler_active;
+        sample.sunscreen_active = sunscreen_active;
+        this->recorder->record(sample);
+    }
+}
+
+void Room::enableRecording(size_t capacity) {
+    // a new recorder is created so views on a previous recording keep their data
+    auto new_recorder = std::make_shared<TrajectoryRecorder>(capacity);
+    std::lock_guard<std::mutex> lock(mutex);
+    this->recorder = new_recorder;
+}
+
+RecordingView Room::getRecording() {
+    std::lock_guard<std::mutex> lock(mutex);
+    if (!this->recorder) {
+        throw std::runtime_error("Room is not recording. Call enableRecording first.");
+    }
+    return RecordingView{this->recorder, this->recorder->data(), this->recorder->size()};
+}
+
+float Room::advance(double seconds, int steps) {
+    if (steps < 0) {
+        throw std::invalid_argument("Invalid number of steps. Expected a non-negative value.");
+    }
+    ScopedTimer timer(StatMethod::ROOM_ADVANCE);
+    std::lock_guard<std::mutex> lock(mutex);
+    // Move the clock forward and integrate everything that happened since the last step,
+    // this is a simulation step and not a sensor reading so the DHT22 interval does not apply
+    for (int step = 0; step < steps; step++) {
+        this->clock->advance(seconds);
+        double delta_time = this->clock->now() - last_update_time;
+        if (delta_time > 0.0) {
+            this->integrate(delta_time);
+        }
+    }
+    return temperature;
+}
+
+std::vector<float> Room::trajectory(double delta_time, int steps) {
+    if (delta_time < 0.0 || steps < 0) {
+        throw std::invalid_argument("Invalid time step. Expected a non-negative time and number of steps.");
+    }
+    ScopedTimer timer(StatMethod::ROOM_TRAJECTORY);
+    std::lock_guard<std::mutex> lock(mutex);
+    // advance the room step by step and keep the temperature after every step
+    std::vector<float> temperatures(steps);
+    for (int step = 0; step < steps; step++) {
+        this->clock->advance(delta_time);
+        double elapsed_time = this->clock->now() - last_update_time;
+        if (elapsed_time > 0.0) {
+            this->integrate(elapsed_time);
+        }
+        temperatures[step] = temperature;
+    }
+    return temperatures;
+}
+
+void Room::setClock(std::shared_ptr<SimClock> clock) {
+    if (!clock) {
+        throw std::invalid_argument("Invalid clock. Expected a SimClock object.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    // the room continues from the current time of the new clock
+    this->clock = clock;
+    this->last_update_time = clock->now();
+}
+
+uint64_t Room::nextNoiseStream() {
+    static std::atomic<uint64_t> next_stream{0};
+    return next_stream++;
+}
+
+// Function: seedSensorNoise
+// Arguments: seed (uint64_t) - the seed of the run
+//            stream (uint64_t) - the stream of the room, give every room of a run its own stream
+// summary: the noise of the room only depends on the seed and stream, so a run gives the same
+//          readings for any number of threads and any order in which the rooms are created
+// Return Type: void
+void Room::seedSensorNoise(uint64_t seed, uint64_t stream) {
+    std::lock_guard<std::mutex> lock(mutex);
+    this->inside_sensor.reseed(seed, stream);
+    this->outside_sensor.reseed(seed, stream);
+}
+
+// Function: setSensorNoise
+// Arguments: max_offset (double) - the fixed offset of each sensor is uniform between -max_offset and max_offset
+//            jitter (double) - standard deviation of the noise per reading in degrees Celsius
+//            resolution (double) - readings are rounded to a multiple of this value, DHT22_RESOLUTION for a DHT22, 0 disables rounding
+// Return Type: void
+void Room::setSensorNoise(double max_offset, double jitter, double resolution) {
+    std::lock_guard<std::mutex> lock(mutex);
+    this->inside_sensor.configure(max_offset, jitter, resolution);
+    this->outside_sensor.configure(max_offset, jitter, resolution);
+}
+
 float Room::getOutsideTemperature() {
+    ScopedTimer timer(StatMethod::ROOM_GET_OUTSIDE_TEMPERATURE);
+    std::lock_guard<std::mutex> lock(mutex);
     auto ret_outside_temperature = std::clamp(outside_temperature, -40.0f, 80.0f); // return value based on datasheet of sensor DHT 22 (-40 - +80)
     
     // No simulation of outside temperature, just a set value. so waiting 2 seconds doesn't do anything
     // if (delta_time < 2.0) { return previous temperature }
 
     // imaginary 2 seconds have passed since last reading returning new outside temp reading
-    return ret_outside_temperature + this->sensor_accuracy_offset;
+    this->outside_sensor.nextReading();
+    return this->outside_sensor.apply(ret_outside_temperature);
 }
  
-float Room::calculateTempDelta(float delta_time) { 
+float Room::calculateTempDelta(float delta_time) {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->temperatureDelta(delta_time);
+}
+
+float Room::calculateHeatExchange() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->heatExchange();
+}
+
+float Room::temperatureDelta(float delta_time) { 
+    if (this->integration_mode == IntegrationMode::EXACT) {
+        // The room is a linear first order system: C * dT/dt = P - k * (T - T_outside)
+        // with the solution T(t) = T_eq + (T - T_eq) * e^(-k*t/C) and T_eq = T_outside + P/k
+        double heat_capacity = this->room_volume * this->air_density * this->specific_heat;
+        double conductance = (this->surface_area * THERMAL_CONDUCTIVITY_BRICK) / THICKNESS_BRICK;
+        double power = (this->heater_active * this->heater_power) - (this->cooler_active * this->cooler_power);
+        if (conductance <= 0.0) {
+            // no heat exchange with the outside, the temperature changes linearly
+            return static_cast<float>(power * delta_time / heat_capacity);
+        }
+        double equilibrium_temperature = this->outside_temperature + power / conductance;
+        return static_cast<float>((equilibrium_temperature - this->temperature) * -std::expm1(-conductance * delta_time / heat_capacity));
+    }
+
     // Calculate the change in temperature based on heater and cooler activity
     float internal_temp_change = (delta_time * ((this->heater_active * this->heater_power) - (this->cooler_active * this->cooler_power))) / (
             this->room_volume * this->air_density * this->specific_heat);
 
     // change the calculation below to lose heat to the outside
-    float external_temp_change = this->calculateHeatExchange() * delta_time / (this->room_volume * this->air_density * this->specific_heat);
+    float external_temp_change = this->heatExchange() * delta_time / (this->room_volume * this->air_density * this->specific_heat);
 
     float delta_temp = internal_temp_change + external_temp_change;
 
     return delta_temp;
 }
 
-float Room::calculateHeatExchange() { 
+float Room::heatExchange() { 
     // Calculate the heat exchange between the room and the outside based on the surface area and temperature difference
-    float thermal_conductivity_brick = 0.18;  // Thermal conductivity of insulatedbrick (W/m*K)
-    float thickness_brick = 0.3;  // Thickness of brick wall (m)
+    float thermal_conductivity_brick = THERMAL_CONDUCTIVITY_BRICK;  // Thermal conductivity of insulatedbrick (W/m*K)
+    float thickness_brick = THICKNESS_BRICK;  // Thickness of brick wall (m)
     float temperature_diff = this->temperature - this->outside_temperature;
 
     // Qw = As*Uc*ΔTemp heat loss via walls heat loss via conduction through brick wall
@@ -2,9 +2,37 @@
 #pragma once
 
 #include <numeric>
-#include <chrono>
+#include <memory>
+#include <mutex>
 #include <vector>
 #include <stdexcept>
+#include "simClock.h"
+#include "trajectoryRecorder.h"
+#include "sensorNoise.h"
+#include "runtimeStats.h"
+
+// minimum interval between two readings of the DHT22 sensor in simulated seconds
+#define DHT22_READ_INTERVAL 2.0
+
+// wall and air properties shared by every simulated room
+#define THERMAL_CONDUCTIVITY_BRICK 0.18f // Thermal conductivity of insulated brick (W/m*K)
+#define THICKNESS_BRICK 0.3f // Thickness of brick wall (m)
+#define AIR_DENSITY 1.225f // kg/m^3
+#define SPECIFIC_HEAT_AIR 700.0f // J/(kg*K)
+
+// integration methods for the room temperature
+enum class IntegrationMode {
+    EULER = 0, // forward Euler step, accurate for small time steps only
+    EXACT = 1  // closed form solution of the linear room model, exact for any time step
+};
+
+// the samples of a room recording at the moment it was requested,
+// the recorder is shared so the memory stays valid when recording is switched off
+struct RecordingView {
+    std::shared_ptr<TrajectoryRecorder> recorder;
+    const TrajectorySample* data;
+    size_t size;
+};
 
 class Room {
 private:
@@ -12,7 +40,8 @@ private:
     float temperature;
     float humidity; // unused in simulation but included for completeness as set value
     float light_level_lux;
-    double sensor_accuracy_offset;
+    SensorNoise inside_sensor;  // DHT22_1
+    SensorNoise outside_sensor; // DHT22_2
     bool heater_active;
     bool cooler_active;
     bool sunscreen_active;
@@ -22,9 +51,22 @@ private:
     float surface_area;
     float air_density;
     float specific_heat;
-    std::chrono::steady_clock::time_point last_update_time;
+    IntegrationMode integration_mode;
+    std::shared_ptr<SimClock> clock;
+    double last_update_time; // simulated time of the last integration step in seconds
+    std::shared_ptr<TrajectoryRecorder> recorder; // nullptr when not recording
+    // guards the room state so long running calls can release the GIL
+    std::mutex mutex;
+
+    // the functions below expect the caller to hold the mutex
+    void integrate(double delta_time);
+    float temperatureDelta(float delta_time);
+    float heatExchange();
+
+    // stream for the sensor noise of the next room that is created, rooms get independent noise in the order they are created
+    static uint64_t nextNoiseStream();
 public:
-    Room(float temperature = 25.0, float outside_temperature = 30.0, float humidity = 50.0, std::vector<float> room_dimensions = {10.0, 10.0, 2.0})
+    Room(float temperature = 25.0, float outside_temperature = 30.0, float humidity = 50.0, std::vector<float> room_dimensions = {10.0, 10.0, 2.0}, std::shared_ptr<SimClock> clock = nullptr)
         : temperature(temperature), humidity(humidity), outside_temperature(outside_temperature) {
 
         if (room_dimensions.size() != 3) {
@@ -33,30 +75,36 @@ public:
 
         this->room_volume = std::accumulate(room_dimensions.begin(), room_dimensions.end(), 1.0, std::multiplies<float>());
         this->surface_area = 2 * (room_dimensions[0] * room_dimensions[2] + room_dimensions[1] * room_dimensions[2]);
-        this->air_density = 1.225;
-        this->specific_heat = 700.0;
-        this->last_update_time = std::chrono::high_resolution_clock::now();
+        this->air_density = AIR_DENSITY;
+        this->specific_heat = SPECIFIC_HEAT_AIR;
+        // default to a real-time clock so the simulation follows the wall clock
+        this->clock = clock ? clock : std::make_shared<SimClock>();
+        this->last_update_time = this->clock->now();
         this->heater_active = false;
         this->cooler_active = false;
         this->sunscreen_active = false;
         this->heater_power = 1000.0;
         this->cooler_power = 2000.0;
         this->light_level_lux = 10000.0;
-        // assign random value between -0.5 and 0.5 to sensor offset
-        this->sensor_accuracy_offset = static_cast <double> (rand()) / static_cast <double> (RAND_MAX) - 0.5; // seed is 1 automatically
+        this->integration_mode = IntegrationMode::EULER;
+        // random offset between -0.5 and 0.5 for both sensors, seed is 1 unless seedSensorNoise is called
+        uint64_t stream = nextNoiseStream();
+        this->inside_sensor = SensorNoise(SENSOR_NOISE_SEED, stream, 0);
+        this->outside_sensor = SensorNoise(SENSOR_NOISE_SEED, stream, 1);
     }
     
     float getTemperature();
-    void setTemperature(float temperature) { this->temperature = temperature; }
+    void setTemperature(float temperature) { std::lock_guard<std::mutex> lock(mutex); this->temperature = temperature; }
 
     float getOutsideTemperature();
-    void setOutsideTemperature(float temperature) { this->outside_temperature = temperature; }
+    void setOutsideTemperature(float temperature) { std::lock_guard<std::mutex> lock(mutex); this->outside_temperature = temperature; }
 
-    float getHumidity() { return humidity; }
+    float getHumidity() { std::lock_guard<std::mutex> lock(mutex); return humidity; }
     void setHumidity(float humidity) {
         if (humidity < 0.0 || humidity > 100.0) {
             throw std::invalid_argument("Invalid humidity value. Expected a value between 0 and 100.");
         }
+        std::lock_guard<std::mutex> lock(mutex);
         this->humidity = humidity;
     }
 
@@ -64,34 +112,57 @@ public:
         if (light_level_lux <= 0.0 || light_level_lux > 100000.0) {
             throw std::invalid_argument("Invalid Light level value. Expected a value above 0 and below 100.000 Lux.");
         }
+        std::lock_guard<std::mutex> lock(mutex);
         this->light_level_lux = light_level_lux; 
     }
-    float getLightLevelLux() { return light_level_lux; }
+    float getLightLevelLux() { std::lock_guard<std::mutex> lock(mutex); return light_level_lux; }
 
-    bool isSunscreenActive() { return sunscreen_active; }
-    void activateSunscreen(bool isActive) { this->sunscreen_active = isActive; }
+    bool isSunscreenActive() { std::lock_guard<std::mutex> lock(mutex); return sunscreen_active; }
+    void activateSunscreen(bool isActive) { RuntimeStats::count(StatCounter::RELAY_WRITES); std::lock_guard<std::mutex> lock(mutex); this->sunscreen_active = isActive; }
 
-    bool isHeaterActive() { return heater_active; }
-    void activateHeater(bool isActive) { this->heater_active = isActive; }
+    bool isHeaterActive() { std::lock_guard<std::mutex> lock(mutex); return heater_active; }
+    void activateHeater(bool isActive) { RuntimeStats::count(StatCounter::RELAY_WRITES); std::lock_guard<std::mutex> lock(mutex); this->heater_active = isActive; }
 
-    bool isCoolerActive() { return cooler_active; }
-    void activateCooler(bool isActive) { this->cooler_active = isActive; }
+    bool isCoolerActive() { std::lock_guard<std::mutex> lock(mutex); return cooler_active; }
+    void activateCooler(bool isActive) { RuntimeStats::count(StatCounter::RELAY_WRITES); std::lock_guard<std::mutex> lock(mutex); this->cooler_active = isActive; }
 
-    float getHeaterPower() { return heater_power; }
+    float getHeaterPower() { std::lock_guard<std::mutex> lock(mutex); return heater_power; }
     void setHeaterPower(float power) {
         if (power < 0.0f) {
             throw std::invalid_argument("Invalid heater power value. Expected a non-negative value.");
         }
+        std::lock_guard<std::mutex> lock(mutex);
         this->heater_power = power;
     }
-    float getCoolerPower() { return cooler_power; }
+    float getCoolerPower() { std::lock_guard<std::mutex> lock(mutex); return cooler_power; }
     void setCoolerPower(float power) {
         if (power < 0.0f) {
             throw std::invalid_argument("Invalid cooler power value. Expected a non-negative value.");
         }
+        std::lock_guard<std::mutex> lock(mutex);
         this->cooler_power = power;
     }
     
+    std::shared_ptr<SimClock> getClock() { std::lock_guard<std::mutex> lock(mutex); return clock; }
+    void setClock(std::shared_ptr<SimClock> clock);
+    double getSimulationTime() { std::lock_guard<std::mutex> lock(mutex); return last_update_time; }
+    float advance(double seconds, int steps = 1);
+    std::vector<float> trajectory(double delta_time, int steps);
+
+    void enableRecording(size_t capacity);
+    void disableRecording() { std::lock_guard<std::mutex> lock(mutex); this->recorder = nullptr; }
+    bool isRecording() { std::lock_guard<std::mutex> lock(mutex); return recorder != nullptr; }
+    RecordingView getRecording();
+
+    void seedSensorNoise(uint64_t seed, uint64_t stream);
+    void setSensorNoise(double max_offset, double jitter = 0.0, double resolution = 0.0);
+    uint64_t getSensorNoiseSeed() { std::lock_guard<std::mutex> lock(mutex); return inside_sensor.getSeed(); }
+    uint64_t getSensorNoiseStream() { std::lock_guard<std::mutex> lock(mutex); return inside_sensor.getStream(); }
+    std::vector<double> getSensorOffsets() { std::lock_guard<std::mutex> lock(mutex); return {inside_sensor.getOffset(), outside_sensor.getOffset()}; }
+
+    IntegrationMode getIntegrationMode() { std::lock_guard<std::mutex> lock(mutex); return integration_mode; }
+    void setIntegrationMode(IntegrationMode mode) { std::lock_guard<std::mutex> lock(mutex); this->integration_mode = mode; }
+
     float calculateTempDelta(float delta_time);
     float calculateHeatExchange();
 };
\ No newline at end of file
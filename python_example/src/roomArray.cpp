@@ -0,0 +1,101 @@
+// roomArray.cpp
+#include "roomArray.h"
+#include <algorithm>
+#include <cmath>
+#include <string>
+
+// number of rooms that are stepped together, small enough to stay in the L1 cache
+#define ROOM_BLOCK_SIZE 256
+
+// Function: RoomArray constructor
+// Arguments: size (size_t) - the number of rooms
+//            temperature (float) - the starting temperature of every room
+//            outside_temperature (float) - the starting outside temperature of every room
+//            room_dimensions (std::vector<float>) - width, length and height of every room
+// Return Type: RoomArray class object
+RoomArray::RoomArray(size_t size, float temperature, float outside_temperature, std::vector<float> room_dimensions) {
+    if (room_dimensions.size() != 3) {
+        throw std::invalid_argument("Invalid room dimensions. Expected 3, width, length, and height.");
+    }
+    this->size = size;
+    this->integration_mode = IntegrationMode::EULER;
+    this->temperatures.assign(size, temperature);
+    this->outside_temperatures.assign(size, outside_temperature);
+    this->heater_powers.assign(size, 1000.0f);
+    this->cooler_powers.assign(size, 2000.0f);
+    this->volumes.assign(size, 0.0f);
+    this->surface_areas.assign(size, 0.0f);
+    this->heaters_active.assign(size, false);
+    this->coolers_active.assign(size, false);
+    this->sunscreens_active.assign(size, false);
+    for (size_t i = 0; i < size; i++) {
+        this->setRoomDimensions(i, room_dimensions);
+    }
+}
+
+// Function: setRoomDimensions
+// Arguments: index (size_t) - the index of the room
+//            room_dimensions (std::vector<float>) - width, length and height of the room
+// Return Type: void
+void RoomArray::setRoomDimensions(size_t index, std::vector<float> room_dimensions) {
+    if (index >= this->size) {
+        throw std::out_of_range("Invalid room index. Expected a value below " + std::to_string(this->size) + ".");
+    }
+    if (room_dimensions.size() != 3) {
+        throw std::invalid_argument("Invalid room dimensions. Expected 3, width, length, and height.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    // same volume and wall surface as the Room constructor
+    this->volumes[index] = room_dimensions[0] * room_dimensions[1] * room_dimensions[2];
+    this->surface_areas[index] = 2 * (room_dimensions[0] * room_dimensions[2] + room_dimensions[1] * room_dimensions[2]);
+}
+
+// Function: step
+// Arguments: delta_time (float) - the time per step in seconds
+//            steps (int) - the number of steps to simulate
+// summary: integrates every room with the same step as Room::calculateTempDelta, for the forward Euler mode
+//          T += dt * (P_heater - P_cooler - k * (T - T_outside)) / C  with  C = V * rho * c  and  k = A * lambda / d
+//          and for the exact mode T = T_eq + (T - T_eq) * e^(-k*dt/C)  with  T_eq = T_outside + P/k
+// Return Type: void
+void RoomArray::step(float delta_time, int steps) {
+    if (delta_time < 0.0f || steps < 0) {
+        throw std::invalid_argument("Invalid time step. Expected a non-negative time and number of steps.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    const float conductance_per_area = THERMAL_CONDUCTIVITY_BRICK / THICKNESS_BRICK;
+    const float heat_capacity_per_volume = AIR_DENSITY * SPECIFIC_HEAT_AIR;
+
+    // every step is T = T * alpha + beta, the coefficients are computed once per block of rooms
+    float alpha[ROOM_BLOCK_SIZE];
+    float beta[ROOM_BLOCK_SIZE];
+    float block_temperatures[ROOM_BLOCK_SIZE];
+
+    for (size_t start = 0; start < this->size; start += ROOM_BLOCK_SIZE) {
+        size_t count = std::min<size_t>(ROOM_BLOCK_SIZE, this->size - start);
+
+        for (size_t i = 0; i < count; i++) {
+            size_t room = start + i;
+            float time_per_capacity = delta_time / (this->volumes[room] * heat_capacity_per_volume);
+            float conductance = this->surface_areas[room] * conductance_per_area;
+            float power = (this->heaters_active[room] * this->heater_powers[room]) - (this->coolers_active[room] * this->cooler_powers[room]);
+            if (this->integration_mode == IntegrationMode::EXACT && conductance > 0.0f) {
+                float decay = std::exp(-time_per_capacity * conductance);
+                float equilibrium_temperature = this->outside_temperatures[room] + power / conductance;
+                alpha[i] = decay;
+                beta[i] = equilibrium_temperature * (1.0f - decay);
+            } else {
+                alpha[i] = 1.0f - time_per_capacity * conductance;
+                beta[i] = time_per_capacity * (power + conductance * this->outside_temperatures[room]);
+            }
+            block_temperatures[i] = this->temperatures[room];
+        }
+
+        for (int s = 0; s < steps; s++) {
+            for (size_t i = 0; i < count; i++) {
+                block_temperatures[i] = block_temperatures[i] * alpha[i] + beta[i];
+            }
+        }
+
+        std::copy(block_temperatures, block_temperatures + count, this->temperatures.begin() + start);
+    }
+}
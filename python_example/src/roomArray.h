@@ -0,0 +1,53 @@
+// roomArray.h
+#pragma once
+
+#include <cstdint>
+#include <cstddef>
+#include <mutex>
+#include <vector>
+#include <stdexcept>
+#include "room.h"
+
+// Many rooms with the same physics as Room, stored as a structure of arrays
+// so all rooms can be stepped in a single call
+class RoomArray {
+private:
+    size_t size;
+    IntegrationMode integration_mode;
+    // guards step() and the room geometry so step() can run without the GIL, Building::step holds it
+    // while it integrates its zones, the NumPy views are not guarded and should not be written to during a step
+    std::mutex mutex;
+    std::vector<float> temperatures;
+    std::vector<float> outside_temperatures;
+    std::vector<float> heater_powers;
+    std::vector<float> cooler_powers;
+    std::vector<float> volumes;
+    std::vector<float> surface_areas;
+    // actuator flags are stored as bytes so they can be shared with NumPy as bool arrays
+    std::vector<uint8_t> heaters_active;
+    std::vector<uint8_t> coolers_active;
+    std::vector<uint8_t> sunscreens_active;
+
+public:
+    RoomArray(size_t size, float temperature = 25.0, float outside_temperature = 30.0, std::vector<float> room_dimensions = {10.0, 10.0, 2.0});
+
+    size_t getSize() { return size; }
+    std::mutex& getMutex() { return mutex; }
+
+    float* temperatureData() { return temperatures.data(); }
+    float* outsideTemperatureData() { return outside_temperatures.data(); }
+    float* heaterPowerData() { return heater_powers.data(); }
+    float* coolerPowerData() { return cooler_powers.data(); }
+    float* volumeData() { return volumes.data(); }
+    float* surfaceAreaData() { return surface_areas.data(); }
+    uint8_t* heaterActiveData() { return heaters_active.data(); }
+    uint8_t* coolerActiveData() { return coolers_active.data(); }
+    uint8_t* sunscreenActiveData() { return sunscreens_active.data(); }
+
+    IntegrationMode getIntegrationMode() { std::lock_guard<std::mutex> lock(mutex); return integration_mode; }
+    void setIntegrationMode(IntegrationMode mode) { std::lock_guard<std::mutex> lock(mutex); this->integration_mode = mode; }
+
+    void setRoomDimensions(size_t index, std::vector<float> room_dimensions);
+
+    void step(float delta_time, int steps = 1);
+};
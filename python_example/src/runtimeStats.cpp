@@ -0,0 +1,71 @@
+// runtimeStats.cpp
+#include "runtimeStats.h"
+#include <stdexcept>
+
+MethodStats RuntimeStats::methods[static_cast<int>(StatMethod::COUNT)];
+std::atomic<uint64_t> RuntimeStats::counters[static_cast<int>(StatCounter::COUNT)];
+std::atomic<bool> RuntimeStats::timing{false};
+
+// Function: record
+// Arguments: method (StatMethod) - the method that was called
+//            elapsed_ns (uint64_t) - the duration of the call in nanoseconds
+// summary: the minimum and maximum are updated with a compare and swap loop that only retries
+//          when another thread changed them at the same time
+// Return Type: void
+void RuntimeStats::record(StatMethod method, uint64_t elapsed_ns) {
+    MethodStats& stats = methods[static_cast<int>(method)];
+    stats.calls.fetch_add(1, std::memory_order_relaxed);
+    stats.timed_calls.fetch_add(1, std::memory_order_relaxed);
+    stats.total_ns.fetch_add(elapsed_ns, std::memory_order_relaxed);
+    uint64_t minimum = stats.min_ns.load(std::memory_order_relaxed);
+    while (elapsed_ns < minimum && !stats.min_ns.compare_exchange_weak(minimum, elapsed_ns, std::memory_order_relaxed)) {}
+    uint64_t maximum = stats.max_ns.load(std::memory_order_relaxed);
+    while (elapsed_ns > maximum && !stats.max_ns.compare_exchange_weak(maximum, elapsed_ns, std::memory_order_relaxed)) {}
+}
+
+// Function: reset
+// Arguments: None
+// Return Type: void
+void RuntimeStats::reset() {
+    for (MethodStats& stats : methods) {
+        stats.calls.store(0, std::memory_order_relaxed);
+        stats.timed_calls.store(0, std::memory_order_relaxed);
+        stats.total_ns.store(0, std::memory_order_relaxed);
+        stats.min_ns.store(UINT64_MAX, std::memory_order_relaxed);
+        stats.max_ns.store(0, std::memory_order_relaxed);
+    }
+    for (std::atomic<uint64_t>& counter : counters) {
+        counter.store(0, std::memory_order_relaxed);
+    }
+}
+
+// Function: methodName
+// Arguments: method (StatMethod) - the timed method
+// Return Type: const char* - the name of the method as it is called from python
+const char* RuntimeStats::methodName(StatMethod method) {
+    switch (method) {
+        case StatMethod::ROOM_GET_TEMPERATURE: return "Room.getTemperature";
+        case StatMethod::ROOM_GET_OUTSIDE_TEMPERATURE: return "Room.getOutsideTemperature";
+        case StatMethod::ROOM_ADVANCE: return "Room.advance";
+        case StatMethod::ROOM_TRAJECTORY: return "Room.trajectory";
+        case StatMethod::ARDUINO_READ_DHT22_1: return "mockArduino.read_DHT22_1";
+        case StatMethod::ARDUINO_READ_DHT22_2: return "mockArduino.read_DHT22_2";
+        case StatMethod::ARDUINO_READ_LDR: return "mockArduino.read_LDR";
+        case StatMethod::ARDUINO_READ_ALL: return "mockArduino.read_all";
+        case StatMethod::ARDUINO_SET_DIGITAL_PIN: return "mockArduino.set_digital_pin";
+        case StatMethod::ARDUINO_GET_PIN_DATA: return "mockArduino.get_pin_data";
+        default: throw std::out_of_range("Invalid method. Expected a timed method of Room or mockArduino.");
+    }
+}
+
+// Function: counterName
+// Arguments: counter (StatCounter) - the counted event
+// Return Type: const char* - the name of the counter in room_simulator.stats()
+const char* RuntimeStats::counterName(StatCounter counter) {
+    switch (counter) {
+        case StatCounter::INTEGRATION_STEPS: return "integration_steps";
+        case StatCounter::DHT_REJECTED_READS: return "dht_rejected_reads";
+        case StatCounter::RELAY_WRITES: return "relay_writes";
+        default: throw std::out_of_range("Invalid counter. Expected a counter of the room simulator.");
+    }
+}
@@ -0,0 +1,92 @@
+// runtimeStats.h
+#pragma once
+
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+
+// methods of Room and mockArduino that are timed, the index of their statistics
+enum class StatMethod {
+    ROOM_GET_TEMPERATURE = 0,
+    ROOM_GET_OUTSIDE_TEMPERATURE,
+    ROOM_ADVANCE,
+    ROOM_TRAJECTORY,
+    ARDUINO_READ_DHT22_1,
+    ARDUINO_READ_DHT22_2,
+    ARDUINO_READ_LDR,
+    ARDUINO_READ_ALL,
+    ARDUINO_SET_DIGITAL_PIN,
+    ARDUINO_GET_PIN_DATA,
+    COUNT
+};
+
+// events that are only counted
+enum class StatCounter {
+    INTEGRATION_STEPS = 0, // integration steps of every Room
+    DHT_REJECTED_READS,    // DHT22 readings within 2 simulated seconds of the previous one, the old value is returned
+    RELAY_WRITES,          // heater, cooler and sunscreen writes from any board, pin or controller
+    COUNT
+};
+
+struct MethodStats {
+    std::atomic<uint64_t> calls{0};       // every call
+    std::atomic<uint64_t> timed_calls{0}; // calls made while timing was on, the durations below only cover these
+    std::atomic<uint64_t> total_ns{0};
+    std::atomic<uint64_t> min_ns{UINT64_MAX};
+    std::atomic<uint64_t> max_ns{0};
+};
+
+// Process wide counters and call timings of the extension. The counters are relaxed atomics,
+// so threads that simulate different rooms never wait for each other to update them; a
+// snapshot taken while other threads run can be a few calls behind. Calls and events are
+// always counted, the durations are only measured while timing is switched on because the
+// clock reads cost more than the short methods they time.
+class RuntimeStats {
+private:
+    static MethodStats methods[static_cast<int>(StatMethod::COUNT)];
+    static std::atomic<uint64_t> counters[static_cast<int>(StatCounter::COUNT)];
+    static std::atomic<bool> timing;
+
+public:
+    static void record(StatMethod method, uint64_t elapsed_ns);
+    static void recordCall(StatMethod method) {
+        methods[static_cast<int>(method)].calls.fetch_add(1, std::memory_order_relaxed);
+    }
+    static void count(StatCounter counter, uint64_t amount = 1) {
+        counters[static_cast<int>(counter)].fetch_add(amount, std::memory_order_relaxed);
+    }
+    static void reset();
+
+    static bool isTiming() { return timing.load(std::memory_order_relaxed); }
+    static void setTiming(bool enabled) { timing.store(enabled, std::memory_order_relaxed); }
+
+    static const MethodStats& getMethod(StatMethod method) { return methods[static_cast<int>(method)]; }
+    static uint64_t getCounter(StatCounter counter) { return counters[static_cast<int>(counter)].load(std::memory_order_relaxed); }
+    static const char* methodName(StatMethod method);
+    static const char* counterName(StatCounter counter);
+};
+
+// counts a call of a method and times the scope it is created in while timing is switched on
+class ScopedTimer {
+private:
+    StatMethod method;
+    bool timed;
+    std::chrono::steady_clock::time_point start;
+
+public:
+    explicit ScopedTimer(StatMethod method) : method(method), timed(RuntimeStats::isTiming()) {
+        if (timed) {
+            start = std::chrono::steady_clock::now();
+        }
+    }
+    ~ScopedTimer() {
+        if (!timed) {
+            RuntimeStats::recordCall(method);
+            return;
+        }
+        auto elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - start);
+        RuntimeStats::record(method, static_cast<uint64_t>(elapsed.count()));
+    }
+    ScopedTimer(const ScopedTimer&) = delete;
+    ScopedTimer& operator=(const ScopedTimer&) = delete;
+};
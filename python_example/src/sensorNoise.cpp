@@ -0,0 +1,117 @@
+// sensorNoise.cpp
+#include "sensorNoise.h"
+#include <cmath>
+
+// constants of the Philox4x32-10 generator by Salmon et al., "Parallel random numbers: as easy as 1, 2, 3"
+#define PHILOX_M0 0xD2511F53u
+#define PHILOX_M1 0xCD9E8D57u
+#define PHILOX_W0 0x9E3779B9u
+#define PHILOX_W1 0xBB67AE85u
+#define PHILOX_ROUNDS 10
+
+// reserved reading number for the fixed offset of a sensor
+#define OFFSET_SAMPLE 0xFFFFFFFFu
+
+#define TWO_PI 6.283185307179586
+
+// Function: philox4x32
+// Arguments: counter (uint32_t[4]) - the block to encrypt, replaced by the random output
+//            key (uint32_t[2]) - the key, the seed of the generator
+// Return Type: void
+void philox4x32(uint32_t counter[4], const uint32_t key[2]) {
+    uint32_t k0 = key[0];
+    uint32_t k1 = key[1];
+    for (int round = 0; round < PHILOX_ROUNDS; round++) {
+        uint64_t product0 = static_cast<uint64_t>(PHILOX_M0) * counter[0];
+        uint64_t product1 = static_cast<uint64_t>(PHILOX_M1) * counter[2];
+        uint32_t c0 = static_cast<uint32_t>(product1 >> 32) ^ counter[1] ^ k0;
+        uint32_t c1 = static_cast<uint32_t>(product1);
+        uint32_t c2 = static_cast<uint32_t>(product0 >> 32) ^ counter[3] ^ k1;
+        uint32_t c3 = static_cast<uint32_t>(product0);
+        counter[0] = c0;
+        counter[1] = c1;
+        counter[2] = c2;
+        counter[3] = c3;
+        k0 += PHILOX_W0;
+        k1 += PHILOX_W1;
+    }
+}
+
+// Function: SensorNoise constructor
+// Arguments: seed (uint64_t) - the seed shared by all rooms of a run
+//            stream (uint64_t) - the stream of the room, rooms with different streams get independent noise
+//            sensor (uint32_t) - the sensor of the room, e.g. 0 for inside and 1 for outside
+// summary: the noise starts as a fixed offset between -0.5 and 0.5 without jitter or rounding
+// Return Type: SensorNoise class object
+SensorNoise::SensorNoise(uint64_t seed, uint64_t stream, uint32_t sensor) {
+    this->sensor = sensor;
+    this->max_offset = 0.5;
+    this->jitter = 0.0;
+    this->resolution = 0.0;
+    this->reseed(seed, stream);
+}
+
+// Function: uniform
+// Arguments: index (uint32_t) - the reading number
+//            pair (int) - 0 or 1, selects one of the two numbers per reading
+// Return Type: double - random number in [0, 1) with 53 random bits
+double SensorNoise::uniform(uint32_t index, int pair) {
+    uint32_t counter[4] = {index, this->sensor, static_cast<uint32_t>(this->stream), static_cast<uint32_t>(this->stream >> 32)};
+    const uint32_t key[2] = {static_cast<uint32_t>(this->seed), static_cast<uint32_t>(this->seed >> 32)};
+    philox4x32(counter, key);
+    uint64_t bits = (static_cast<uint64_t>(counter[2 * pair]) << 32) | counter[2 * pair + 1];
+    return (bits >> 11) * (1.0 / 9007199254740992.0); // 2^-53
+}
+
+// Function: reseed
+// Arguments: seed (uint64_t) - the seed shared by all rooms of a run
+//            stream (uint64_t) - the stream of the room
+// summary: draws the offset of the new stream and restarts the readings
+// Return Type: void
+void SensorNoise::reseed(uint64_t seed, uint64_t stream) {
+    this->seed = seed;
+    this->stream = stream;
+    this->sample = 0;
+    this->last_jitter = 0.0;
+    this->offset = (2.0 * this->uniform(OFFSET_SAMPLE, 0) - 1.0) * this->max_offset;
+}
+
+// Function: configure
+// Arguments: max_offset (double) - the offset is uniform between -max_offset and max_offset
+//            jitter (double) - standard deviation of the Gaussian noise per reading, 0 disables the jitter
+//            resolution (double) - readings are rounded to a multiple of this value, 0 disables rounding
+// Return Type: void
+void SensorNoise::configure(double max_offset, double jitter, double resolution) {
+    if (max_offset < 0.0 || jitter < 0.0 || resolution < 0.0) {
+        throw std::invalid_argument("Invalid sensor noise. Expected a non-negative offset, jitter and resolution.");
+    }
+    this->max_offset = max_offset;
+    this->jitter = jitter;
+    this->resolution = resolution;
+    this->reseed(this->seed, this->stream);
+}
+
+// Function: nextReading
+// Arguments: None
+// summary: draws the Gaussian jitter of the next reading with the Box-Muller transform
+// Return Type: void
+void SensorNoise::nextReading() {
+    uint32_t index = this->sample++;
+    if (this->jitter == 0.0) {
+        return;
+    }
+    double u1 = 1.0 - this->uniform(index, 0); // (0, 1] so the logarithm is finite
+    double u2 = this->uniform(index, 1);
+    this->last_jitter = this->jitter * std::sqrt(-2.0 * std::log(u1)) * std::cos(TWO_PI * u2);
+}
+
+// Function: apply
+// Arguments: value (float) - the real value at the sensor
+// Return Type: float - the value the sensor reads
+float SensorNoise::apply(float value) {
+    double reading = value + this->offset + this->last_jitter;
+    if (this->resolution > 0.0) {
+        reading = std::round(reading / this->resolution) * this->resolution;
+    }
+    return static_cast<float>(reading);
+}
@@ -0,0 +1,52 @@
+// sensorNoise.h
+#pragma once
+
+#include <cstdint>
+#include <stdexcept>
+
+// seed used for the sensor noise of rooms that are not seeded explicitly
+#define SENSOR_NOISE_SEED 1
+// resolution of the DHT22 temperature reading in degrees Celsius
+#define DHT22_RESOLUTION 0.1
+
+// Noise of one temperature sensor: a fixed calibration offset, Gaussian jitter per reading
+// and quantization to the resolution of the sensor. The random numbers come from the
+// counter-based Philox4x32-10 generator, so reading n of a sensor only depends on the
+// seed, the stream, the sensor and n, and not on the order or thread the rooms run on.
+class SensorNoise {
+private:
+    uint64_t seed;
+    uint64_t stream;   // independent stream per room
+    uint32_t sensor;   // independent stream per sensor of a room
+    uint32_t sample;   // number of readings drawn so far
+    double max_offset; // offset is uniform between -max_offset and max_offset
+    double jitter;     // standard deviation of the noise per reading
+    double resolution; // readings are rounded to a multiple of this value, 0 disables rounding
+    double offset;
+    double last_jitter;
+
+    double uniform(uint32_t index, int pair);
+
+public:
+    SensorNoise(uint64_t seed = SENSOR_NOISE_SEED, uint64_t stream = 0, uint32_t sensor = 0);
+
+    void reseed(uint64_t seed, uint64_t stream);
+    void configure(double max_offset, double jitter, double resolution);
+
+    // draws the noise of the next reading, a sensor that is read again before it has a new value keeps the old noise
+    void nextReading();
+    float apply(float value);
+
+    uint64_t getSeed() { return seed; }
+    uint64_t getStream() { return stream; }
+    double getOffset() { return offset; }
+    double getMaxOffset() { return max_offset; }
+    double getJitter() { return jitter; }
+    double getResolution() { return resolution; }
+};
+
+// Function: philox4x32
+// Arguments: counter (uint32_t[4]) - the block to encrypt, replaced by the random output
+//            key (uint32_t[2]) - the key, the seed of the generator
+// Return Type: void
+void philox4x32(uint32_t counter[4], const uint32_t key[2]);
@@ -0,0 +1,84 @@
+// simClock.cpp
+#include "simClock.h"
+
+// Function: SimClock constructor
+// Arguments: mode (ClockMode) - REALTIME, SCALED or VIRTUAL
+//            time_scale (double) - simulated seconds per wall clock second, only used in SCALED mode
+// Return Type: SimClock class object
+SimClock::SimClock(ClockMode mode, double time_scale) {
+    if (time_scale <= 0.0) {
+        throw std::invalid_argument("Invalid time scale. Expected a value above 0.");
+    }
+    this->mode = mode;
+    this->time_scale = time_scale;
+    this->base_time = 0.0;
+    this->reference_time = std::chrono::steady_clock::now();
+}
+
+// Function: elapsedWallTime
+// Arguments: None
+// Return Type: double - wall clock seconds since the reference point
+double SimClock::elapsedWallTime() {
+    auto current_time = std::chrono::steady_clock::now();
+    return std::chrono::duration_cast<std::chrono::microseconds>(current_time - this->reference_time).count() / 1000000.0;
+}
+
+// Function: now
+// Arguments: None
+// Return Type: double - the simulated time in seconds since the clock was created
+double SimClock::now() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return this->currentTime();
+}
+
+// Function: currentTime
+// Arguments: None
+// Return Type: double - the simulated time in seconds since the clock was created
+double SimClock::currentTime() {
+    switch (this->mode) {
+        case ClockMode::REALTIME:
+            return this->base_time + this->elapsedWallTime();
+        case ClockMode::SCALED:
+            return this->base_time + this->elapsedWallTime() * this->time_scale;
+        case ClockMode::VIRTUAL:
+        default:
+            return this->base_time;
+    }
+}
+
+// Function: advance
+// Arguments: seconds (double) - the amount of simulated time to skip forward
+// summary: moves the simulated time forward, in REALTIME and SCALED mode this is added on top of the wall clock time
+// Return Type: void
+void SimClock::advance(double seconds) {
+    if (seconds < 0.0) {
+        throw std::invalid_argument("Invalid time step. Expected a non-negative value.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->base_time += seconds;
+}
+
+// Function: setMode
+// Arguments: mode (ClockMode) - the new clock mode
+// summary: the simulated time continues from its current value in the new mode
+// Return Type: void
+void SimClock::setMode(ClockMode mode) {
+    std::lock_guard<std::mutex> lock(mutex);
+    this->base_time = this->currentTime();
+    this->reference_time = std::chrono::steady_clock::now();
+    this->mode = mode;
+}
+
+// Function: setTimeScale
+// Arguments: time_scale (double) - simulated seconds per wall clock second
+// summary: the simulated time continues from its current value at the new rate
+// Return Type: void
+void SimClock::setTimeScale(double time_scale) {
+    if (time_scale <= 0.0) {
+        throw std::invalid_argument("Invalid time scale. Expected a value above 0.");
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    this->base_time = this->currentTime();
+    this->reference_time = std::chrono::steady_clock::now();
+    this->time_scale = time_scale;
+}
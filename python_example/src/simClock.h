@@ -0,0 +1,41 @@
+// simClock.h
+#pragma once
+
+#include <chrono>
+#include <mutex>
+#include <stdexcept>
+
+// clock modes for the simulation
+enum class ClockMode {
+    REALTIME = 0, // simulated time follows the wall clock
+    SCALED = 1,   // simulated time follows the wall clock multiplied by a time scale
+    VIRTUAL = 2   // simulated time only moves when advance() is called
+};
+
+class SimClock {
+private:
+    ClockMode mode;
+    double time_scale;
+    // simulated seconds that were accumulated before the current wall clock reference point
+    double base_time;
+    // wall clock reference point for the REALTIME and SCALED modes
+    std::chrono::steady_clock::time_point reference_time;
+    // a clock can be shared by rooms that are simulated on different threads
+    std::mutex mutex;
+
+    // the functions below expect the caller to hold the mutex
+    double elapsedWallTime();
+    double currentTime();
+
+public:
+    SimClock(ClockMode mode = ClockMode::REALTIME, double time_scale = 1.0);
+
+    double now();
+    void advance(double seconds);
+
+    ClockMode getMode() { std::lock_guard<std::mutex> lock(mutex); return mode; }
+    void setMode(ClockMode mode);
+
+    double getTimeScale() { std::lock_guard<std::mutex> lock(mutex); return time_scale; }
+    void setTimeScale(double time_scale);
+};
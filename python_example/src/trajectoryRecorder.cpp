@@ -0,0 +1,39 @@
+// trajectoryRecorder.cpp
+#include "trajectoryRecorder.h"
+
+// Function: TrajectoryRecorder constructor
+// Arguments: capacity (size_t) - the number of samples that are kept, older samples are overwritten
+// Return Type: TrajectoryRecorder class object
+TrajectoryRecorder::TrajectoryRecorder(size_t capacity) {
+    if (capacity == 0) {
+        throw std::invalid_argument("Invalid recorder capacity. Expected a value above 0.");
+    }
+    this->capacity = capacity;
+    this->head = 0;
+    this->count = 0;
+    this->recorded = 0;
+    this->buffer.resize(2 * capacity);
+}
+
+// Function: record
+// Arguments: sample (TrajectorySample) - the sample to add, replaces the oldest sample when the buffer is full
+// Return Type: void
+void TrajectoryRecorder::record(const TrajectorySample& sample) {
+    size_t position = (this->head + this->count) % this->capacity;
+    this->buffer[position] = sample;
+    this->buffer[position + this->capacity] = sample;
+    if (this->count < this->capacity) {
+        this->count++;
+    } else {
+        this->head = (this->head + 1) % this->capacity;
+    }
+    this->recorded++;
+}
+
+// Function: clear
+// Arguments: None
+// Return Type: void
+void TrajectoryRecorder::clear() {
+    this->head = 0;
+    this->count = 0;
+}
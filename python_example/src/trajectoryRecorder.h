@@ -0,0 +1,43 @@
+// trajectoryRecorder.h
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+#include <stdexcept>
+
+// one integration step of a room
+struct TrajectorySample {
+    double time;               // simulated time in seconds
+    float temperature;         // inside temperature in degrees Celsius
+    float outside_temperature; // outside temperature in degrees Celsius
+    float light_level_lux;     // outside light level in lux
+    float power;               // electrical power of the active heater and cooler in watts
+    uint8_t heater_active;
+    uint8_t cooler_active;
+    uint8_t sunscreen_active;
+};
+
+// Preallocated ring buffer of trajectory samples. Every sample is written twice,
+// at its position and one capacity further, so the samples from oldest to newest
+// are always available as one contiguous block that NumPy can view without copying.
+class TrajectoryRecorder {
+private:
+    size_t capacity;
+    size_t head;  // position of the oldest sample
+    size_t count; // number of valid samples
+    uint64_t recorded; // number of samples recorded since the recorder was created
+    std::vector<TrajectorySample> buffer;
+
+public:
+    TrajectoryRecorder(size_t capacity);
+
+    void record(const TrajectorySample& sample);
+    void clear();
+
+    size_t getCapacity() { return capacity; }
+    size_t size() { return count; }
+    uint64_t getRecordedCount() { return recorded; }
+    // oldest sample of the contiguous block of size() samples
+    const TrajectorySample* data() { return buffer.data() + head; }
+};
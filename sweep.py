@@ -0,0 +1,163 @@
+# Runs the headless control loop for every combination of a parameter grid on all cores.
+# Usage: python sweep.py --grid=grid.json --output=sweep.npz [--workers=N]
+import hashlib
+import json
+import os
+import sys
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import headless
+
+
+# metrics of a run that are stored in the result file, the wall time is left out so the results are deterministic
+METRICS = ["time_in_band", "switch_count", "energy_kwh", "max_overshoot", "final_temperature"]
+
+
+def noiseStream(parameters: dict) -> int:
+    """The sensor noise stream of a run, a hash of its grid values.
+
+    The stream doesn't depend on the position of the run in the grid, so a run keeps its noise
+    when values are added to the grid and the results of different sweeps can be compared.
+
+    Args:
+        parameters (dict): The grid values of the run, e.g. {"heater_power": 500.0, "room_dimensions": [5, 5, 2]}.
+
+    Returns:
+        int: A 64 bit stream for `Room.seedSensorNoise`.
+    """
+    key = json.dumps(parameters, sort_keys=True).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+
+def expandGrid(grid: dict, base: dict = None) -> list:
+    """Builds the scenario of every run of a parameter grid.
+
+    Args:
+        grid (dict): Scenario settings with a list of values to try, e.g. {"heater_power": [500, 1000], "room_dimensions": [[5, 5, 2], [10, 10, 2]]}
+        base (dict): Scenario settings that are the same for every run.
+
+    Returns:
+        list: The scenario of every run, every run has its own sensor noise stream, see `noiseStream`, unless the grid sets the stream.
+    """
+    names = list(grid)
+    scenarios = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        parameters = dict(zip(names, values))
+        # a stream in the base would give every run the same noise, only the grid can set the stream
+        scenario = dict(base or {})
+        scenario["stream"] = noiseStream(parameters)
+        scenario.update(parameters)
+        scenarios.append(scenario)
+    return scenarios
+
+
+def readCheckpoint(checkpoint: str, scenarios: list) -> dict:
+    """Reads the finished runs of an earlier sweep.
+
+    Args:
+        checkpoint (str): The checkpoint file, one JSON line per finished run.
+        scenarios (list): The scenarios of the sweep, used to check that the checkpoint belongs to the same grid.
+
+    Returns:
+        dict: The metrics of every finished run by run number. A line that was only partly written is ignored.
+    """
+    finished = {}
+    if not os.path.exists(checkpoint):
+        return finished
+    with open(checkpoint) as checkpoint_file:
+        for line in checkpoint_file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue # the sweep was stopped while writing this run
+            run = result["run"]
+            if run >= len(scenarios) or result["scenario"] != json.loads(json.dumps(scenarios[run])):
+                raise ValueError(f"Checkpoint {checkpoint} belongs to a different parameter grid")
+            finished[run] = result
+    return finished
+
+
+def runSweep(grid: dict, output: str, base: dict = None, workers: int = None, checkpoint: str = None) -> dict:
+    """Runs every combination of the grid through `headless.runScenario` and writes the results as columns to an .npz file.
+
+    Every finished run is appended to the checkpoint file right away, running the same sweep again
+    after a crash only runs the missing combinations.
+
+    Args:
+        grid (dict): Scenario settings with a list of values to try.
+        output (str): The .npz result file.
+        base (dict): Scenario settings that are the same for every run.
+        workers (int): Number of processes, all cores when None.
+        checkpoint (str): The checkpoint file, the output file with a .jsonl extension when None.
+
+    Returns:
+        dict: The columns of the result file, one value per run in the order of `expandGrid`.
+    """
+    scenarios = expandGrid(grid, base)
+    if checkpoint is None:
+        checkpoint = os.path.splitext(output)[0] + ".jsonl"
+    finished = readCheckpoint(checkpoint, scenarios)
+    pending = [run for run in range(len(scenarios)) if run not in finished]
+    print(f"Sweep of {len(scenarios)} runs, {len(finished)} finished in an earlier sweep")
+
+    # rewrite the checkpoint so a partly written line doesn't end up in the middle of the file, the finished runs
+    # are written to a new file that replaces the checkpoint at once, so a crash never loses the earlier runs
+    with open(checkpoint + ".tmp", "w") as checkpoint_file:
+        for run in sorted(finished):
+            checkpoint_file.write(json.dumps(finished[run]) + "\n")
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(checkpoint + ".tmp", checkpoint)
+
+    with open(checkpoint, "a") as checkpoint_file:
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(headless.runScenario, scenarios[run]): run for run in pending}
+                for future in as_completed(futures):
+                    run = futures[future]
+                    summary = future.result()
+                    finished[run] = {"run": run, "scenario": scenarios[run], **{metric: summary[metric] for metric in METRICS}}
+                    checkpoint_file.write(json.dumps(finished[run]) + "\n")
+                    checkpoint_file.flush()
+                    os.fsync(checkpoint_file.fileno())
+
+    columns = {"run": np.arange(len(scenarios))}
+    for name in grid:
+        columns[name] = np.asarray([scenario[name] for scenario in scenarios])
+    for metric in METRICS:
+        columns[metric] = np.asarray([finished[run][metric] for run in range(len(scenarios))])
+    np.savez(output, **columns)
+    return columns
+
+
+def parse_arguments(argv: list) -> dict:
+    """Reads the `--grid=file.json`, `--output=file.npz` and `--workers=N` command-line arguments
+    Args:
+        argv (list): The command-line arguments
+    Returns:
+        dict: grid (dict), base (dict), output (str) and workers (int or None),
+              the grid file contains the grid and optionally the base scenario as {"grid": {...}, "base": {...}}
+    """
+    arguments = {"grid": None, "base": None, "output": "sweep.npz", "workers": None}
+    for arg in argv:
+        if arg.startswith("--grid="):
+            with open(arg.split("=", 1)[1]) as grid_file:
+                grid = json.load(grid_file)
+            arguments["grid"] = grid["grid"]
+            arguments["base"] = grid.get("base")
+        elif arg.startswith("--output="):
+            arguments["output"] = arg.split("=", 1)[1]
+        elif arg.startswith("--workers="):
+            arguments["workers"] = int(arg.split("=", 1)[1])
+    if arguments["grid"] is None:
+        raise ValueError("--grid=file.json is required")
+    return arguments
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments(sys.argv[1:])
+    runSweep(arguments["grid"], arguments["output"], base=arguments["base"], workers=arguments["workers"])
+    print(f"Results written to {arguments['output']}")
@@ -0,0 +1,81 @@
+# Loads Qt Designer files through a python module that pyuic generated from them, so the .ui file is only parsed
+# again after it changed. The generated modules are cached in __pycache__ next to the .ui file.
+import hashlib
+import importlib.util
+import io
+import os
+import py_compile
+
+
+HEADER = "# generated by uicache from {name}, sha1 {digest}\n"
+
+
+def cachePath(ui_path: str) -> str:
+    """The generated module of a .ui file, e.g. __pycache__/gui_ui.py for gui.ui"""
+    directory, name = os.path.split(os.path.abspath(ui_path))
+    return os.path.join(directory, "__pycache__", os.path.splitext(name)[0] + "_ui.py")
+
+
+def loadUiClass(ui_path: str) -> type:
+    """Returns the Ui_ class that pyuic generates for a .ui file.
+
+    The class is generated again when the content of the .ui file differs from the file the cache was made from.
+    When the cache can't be written, e.g. in a read-only install, the class is generated in memory every time.
+
+    Args:
+        ui_path (str): The Qt Designer file.
+
+    Returns:
+        type: The generated class, `Ui_X().setupUi(widget)` builds the widgets of the file on the widget.
+    """
+    with open(ui_path, "rb") as ui_file:
+        content = ui_file.read()
+    header = HEADER.format(name=os.path.basename(ui_path), digest=hashlib.sha1(content).hexdigest())
+    path = cachePath(ui_path)
+
+    try:
+        with open(path, encoding="utf-8") as cache_file:
+            fresh = cache_file.readline() == header
+    except OSError:
+        fresh = False
+
+    if not fresh:
+        from PyQt5 import uic # only needed to generate the module
+        source = io.StringIO()
+        uic.compileUi(io.StringIO(content.decode("utf-8")), source)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as cache_file:
+                cache_file.write(header + source.getvalue())
+            os.replace(path + ".tmp", path) # other processes never read a half written module
+            # the bytecode is written even when python doesn't write it on import, e.g. with PYTHONDONTWRITEBYTECODE,
+            # and checked against the source hash because a new module can have the same size and time as the old one
+            py_compile.compile(path, doraise=True, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+        except (OSError, py_compile.PyCompileError):
+            namespace = {}
+            exec(compile(source.getvalue(), path, "exec"), namespace)
+            return _uiClass(namespace)
+
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return _uiClass(vars(module))
+
+
+def _uiClass(namespace: dict) -> type:
+    return next(value for name, value in namespace.items() if name.startswith("Ui_") and isinstance(value, type))
+
+
+def setupUi(widget, ui_path: str) -> None:
+    """Builds the widgets of a .ui file on a widget, like `uic.loadUi(ui_path, widget)`.
+
+    Every widget of the file becomes an attribute of the widget under its object name.
+
+    Args:
+        widget (QWidget): The top level widget, e.g. a QMainWindow for a MainWindow form.
+        ui_path (str): The Qt Designer file.
+    """
+    ui = loadUiClass(ui_path)()
+    ui.setupUi(widget)
+    for name, value in vars(ui).items():
+        setattr(widget, name, value)